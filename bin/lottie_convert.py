@@ -10,7 +10,9 @@ sys.path.insert(0, os.path.join(
 ))
 from lottie.exporters import exporters
 from lottie.importers import importers
-from lottie.utils.stripper import float_strip, heavy_strip
+from lottie.utils import json_backend
+from lottie.utils import convert
+from lottie.utils import render_cache
 from lottie import __version__
 
 
@@ -87,6 +89,59 @@ group.add_argument(
     type=int,
     help="If present, changes the output fps to match this value"
 )
+parser.add_argument(
+    "--json-backend",
+    default=None,
+    choices=json_backend.available_backends(),
+    help="Library used to read and write JSON (default: the fastest installed)",
+)
+parser.add_argument(
+    "--render-cache",
+    default=None,
+    metavar="DIR",
+    help="Directory to cache rendered PNG, GIF, WebP and video files in, to reuse them for identical conversions",
+)
+parser.add_argument(
+    "--render-cache-size",
+    default=256,
+    type=int,
+    help="Maximum size of the render cache in MiB",
+)
+
+group = parser.add_argument_group("Batch options")
+group.add_argument(
+    "--batch",
+    nargs="+",
+    default=[],
+    metavar="INPUT",
+    help="Convert many files: file names, directories (searched recursively) or glob patterns",
+)
+group.add_argument(
+    "--batch-list",
+    default=None,
+    metavar="FILE",
+    help="File with the names of the input files to convert, one per line (- for stdin)",
+)
+group.add_argument(
+    "--output-pattern",
+    default="{dir}/{name}.{ext}",
+    help="Output file names for batch conversions (default: %(default)s), using:\n" +
+         " * {dir} input directory\n" +
+         " * {name} input file name without extension\n" +
+         " * {path} input path relative to the batch directory or pattern, without extension\n" +
+         " * {ext} extension of the output format",
+)
+group.add_argument(
+    "--overwrite",
+    action="store_true",
+    help="Allow batch conversions to replace their input files",
+)
+group.add_argument(
+    "--batch-workers",
+    default=1,
+    type=int,
+    help="Number of processes converting files in parallel (0 for one per CPU)",
+)
 
 
 def print_dep_message(loader):
@@ -99,8 +154,94 @@ def print_dep_message(loader):
         sys.stderr.write("For %s install %s\n" % (failed, dep))
 
 
+def importer_options(importer, ns):
+    return {
+        opt.name: getattr(ns, opt.nsvar(importer.slug))
+        for opt in importer.extra_options
+    }
+
+
+def batch_inputs(ns, importer):
+    inputs = list(ns.batch)
+    if ns.batch_list:
+        listfile = sys.stdin if ns.batch_list == "-" else open(ns.batch_list)
+        with listfile:
+            inputs += filter(None, (line.strip() for line in listfile))
+
+    if importer:
+        extensions = set(importer.extensions)
+    else:
+        extensions = set(ext for p in importers for ext in p.extensions)
+
+    return convert.expand_inputs(inputs, extensions)
+
+
+def batch_main(ns):
+    importer = importers.get(ns.input_format) if ns.input_format else None
+
+    if ns.output_format:
+        exporter = exporters.get(ns.output_format)
+    else:
+        exporter = exporters.get_from_filename(ns.output_pattern.replace("{ext}", ""))
+    if not exporter:
+        sys.stderr.write("Unknown exporter, use --output-format or an extension in --output-pattern\n")
+        print_dep_message(exporters)
+        sys.exit(1)
+
+    o_options = exporter.argparse_options(ns)
+    ext = exporter.extensions[0]
+    failed = []
+    unknown = []
+    jobs = []
+
+    for infile, relpath in batch_inputs(ns, importer):
+        file_importer = importer or importers.get_from_filename(infile)
+        if not file_importer:
+            unknown.append(infile)
+            failed.append(convert.ConversionResult(infile, None, "Unknown importer", 0))
+            continue
+        outfile = convert.output_path(ns.output_pattern, infile, relpath, ext)
+        jobs.append(convert.ConversionJob(
+            infile, outfile, file_importer.slug, exporter.slug,
+            importer_options(file_importer, ns), o_options, ns.optimize, ns.fps
+        ))
+
+    if not jobs and not unknown:
+        sys.stderr.write("No input files found\n")
+        sys.exit(1)
+
+    # Checked before running anything, so no job writes a file another one reads
+    jobs, refused = convert.check_outputs(jobs, ns.overwrite, unknown)
+    failed += refused
+
+    converted = 0
+    for result in convert.batch_convert(jobs, ns.batch_workers, ns.json_backend, render_cache.get_cache()):
+        if result.error:
+            failed.append(result)
+        else:
+            converted += 1
+            sys.stderr.write("%s -> %s (%.2fs)\n" % (result.infile, result.outfile, result.seconds))
+
+    for result in failed:
+        sys.stderr.write("%s: %s\n" % (result.infile, result.error))
+
+    sys.stderr.write("%s converted, %s failed\n" % (converted, len(failed)))
+    if failed:
+        print_dep_message(importers)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     ns = parser.parse_args()
+    if ns.json_backend:
+        json_backend.set_backend(ns.json_backend)
+    if ns.render_cache:
+        render_cache.set_cache(render_cache.RenderCache(ns.render_cache, ns.render_cache_size * 1024 * 1024))
+
+    if ns.batch or ns.batch_list:
+        batch_main(ns)
+        sys.exit(0)
+
     if ns.infile == "-" and not ns.input_format:
         parser.print_help()
 
@@ -139,20 +280,7 @@ if __name__ == "__main__":
         print_dep_message(exporters)
         sys.exit(1)
 
-    i_options = {}
-    for opt in importer.extra_options:
-        i_options[opt.name] = getattr(ns, opt.nsvar(importer.slug))
-
+    i_options = importer_options(importer, ns)
     o_options = exporter.argparse_options(ns)
 
-    an = importer.process(infile, **i_options)
-
-    if ns.fps:
-        an.frame_rate = ns.fps
-
-    if ns.optimize == 1:
-        float_strip(an)
-    elif ns.optimize >= 2:
-        heavy_strip(an)
-
-    exporter.process(an, outfile, **o_options)
+    convert.convert(infile, outfile, importer, exporter, i_options, o_options, ns.optimize, ns.fps)
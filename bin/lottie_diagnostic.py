@@ -27,3 +27,9 @@ print("* Python version: %s" % sys.version.replace("\n", " "))
 print("* Python Lottie version: %s" % __version__)
 print_loader(importers, "Importers")
 print_loader(exporters, "Exporters")
+
+from lottie.utils import json_backend
+print("* JSON backend: %s (available: %s)" % (
+    json_backend.get_backend().name,
+    ", ".join(json_backend.available_backends())
+))
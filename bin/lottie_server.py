@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import argparse
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "lib"
+))
+from lottie.utils import json_backend
+from lottie.utils.render_cache import RenderCache
+from lottie.utils.server import ConversionServer, default_importers, unsafe_importers
+from lottie import __version__
+
+
+parser = argparse.ArgumentParser(
+    description="Runs a server converting files over HTTP, without starting a process for each conversion\n\n"
+    "POST /convert/<output format>?from=<input format>&<options> converts the request body,\n"
+    "  which needs a Content-Type like application/octet-stream\n"
+    "GET /formats lists the available formats\n"
+    "GET /metrics shows request statistics",
+    formatter_class=argparse.RawTextHelpFormatter
+)
+parser.add_argument("--version", "-v", action="version", version="%(prog)s - python-lottie " + __version__)
+parser.add_argument(
+    "--host",
+    default="127.0.0.1",
+    help="Address to listen on",
+)
+parser.add_argument(
+    "--port",
+    default=8080,
+    type=int,
+    help="Port to listen on",
+)
+parser.add_argument(
+    "--socket",
+    default=None,
+    help="Path of a Unix socket to listen on instead of --host and --port",
+)
+parser.add_argument(
+    "--workers",
+    default=0,
+    type=int,
+    help="Number of processes running conversions (0 for one per CPU)",
+)
+parser.add_argument(
+    "--importers",
+    default=",".join(default_importers),
+    help="Comma separated list of the input formats to accept (default: %(default)s)\n"
+    "The Python script importer is never available",
+)
+parser.add_argument(
+    "--queue-size",
+    default=16,
+    type=int,
+    help="Conversions waiting for a worker before refusing new requests",
+)
+parser.add_argument(
+    "--max-size",
+    default=64,
+    type=int,
+    help="Maximum size of uploaded files in MiB",
+)
+parser.add_argument(
+    "--json-backend",
+    default=None,
+    choices=json_backend.available_backends(),
+    help="Library used to read and write JSON (default: the fastest installed)",
+)
+parser.add_argument(
+    "--render-cache",
+    default=None,
+    metavar="DIR",
+    help="Directory to cache rendered PNG, GIF, WebP and video files in, to reuse them for identical conversions",
+)
+parser.add_argument(
+    "--render-cache-size",
+    default=256,
+    type=int,
+    help="Maximum size of the render cache in MiB",
+)
+
+
+if __name__ == "__main__":
+    ns = parser.parse_args()
+    cache = RenderCache(ns.render_cache, ns.render_cache_size * 1024 * 1024) if ns.render_cache else None
+    allowed = set(filter(None, ns.importers.split(",")))
+    if allowed & unsafe_importers:
+        sys.stderr.write("Ignoring unsafe importers: %s\n" % ", ".join(sorted(allowed & unsafe_importers)))
+    server = ConversionServer(ns.workers, ns.queue_size, ns.max_size * 1024 * 1024, ns.json_backend, cache, allowed)
+    if ns.socket:
+        sys.stderr.write("Listening on %s\n" % ns.socket)
+    else:
+        sys.stderr.write("Listening on http://%s:%s/\n" % (ns.host, ns.port))
+    try:
+        asyncio.run(server.serve_forever(ns.host, ns.port, ns.socket))
+    except KeyboardInterrupt:
+        pass
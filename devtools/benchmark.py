@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Micro benchmarks for the performance sensitive parts of the library
+"""
+import sys
+import os
+import timeit
+import argparse
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "lib"
+))
+from lottie.nvector import NVector
+
+
+benchmarks = {}
+
+
+def benchmark(func):
+    benchmarks[func.__name__] = func
+    return func
+
+
+def report(name, seconds, number):
+    print("%-20s %10.0f ns" % (name, seconds / number * 1e9))
+
+
+def time_statements(statements, globals, number, repeat=3):
+    for name, stmt in statements:
+        report(name, min(timeit.repeat(stmt, globals=globals, number=number, repeat=repeat)), number)
+
+
+@benchmark
+def nvector(ns):
+    """
+    NVector arithmetic
+    """
+    env = {
+        "a": NVector(1.5, 2.5),
+        "b": NVector(3.0, -1.0),
+        "c": NVector(0.1, 0.2, 0.3, 1.0),
+        "d": NVector(0.5, 0.5, 0.5, 0.5),
+        "e": NVector(1, 2, 3),
+        "f": NVector(4, 5, 6),
+    }
+    time_statements([
+        ("2D +", "a + b"),
+        ("2D *", "a * 2.0"),
+        ("2D lerp", "a.lerp(b, 0.3)"),
+        ("2D length", "a.length"),
+        ("3D +", "e + f"),
+        ("3D lerp", "e.lerp(f, 0.3)"),
+        ("4D +", "c + d"),
+        ("4D lerp", "c.lerp(d, 0.3)"),
+    ], env, ns.number)
+
+
+@benchmark
+def keyframes(ns):
+    """
+    Property evaluation with many keyframes
+    """
+    from lottie.objects.properties import MultiDimensional
+    prop = MultiDimensional()
+    for i in range(500):
+        prop.add_keyframe(i, NVector(i, -i))
+    time_statements([
+        ("get_value start", "prop.get_value(1.5)"),
+        ("get_value middle", "prop.get_value(250.5)"),
+        ("get_value end", "prop.get_value(498.5)"),
+    ], {"prop": prop}, ns.number // 10)
+
+
+@benchmark
+def sample(ns):
+    """
+    Evaluating a property on 300 frames, one at a time and vectorized
+    """
+    from lottie.objects.properties import MultiDimensional
+    from lottie.objects import easing
+    prop = MultiDimensional()
+    for i in range(0, 300, 10):
+        prop.add_keyframe(i, NVector(i, -i), easing.Sigmoid())
+    time_statements([
+        ("get_value x 300", "[prop.get_value(t) for t in range(300)]"),
+        ("sample(300)", "prop.sample(range(300))"),
+    ], {"prop": prop}, max(1, ns.number // 1000))
+
+
+def _render_animation():
+    from lottie import objects
+    from lottie.objects import easing
+    from lottie.utils.color import Color
+
+    animation = objects.Animation(60)
+    for i in range(10):
+        layer = animation.add_layer(objects.ShapeLayer())
+        group = layer.add_shape(objects.Group())
+        star = group.add_shape(objects.Star())
+        star.position.value = NVector(256, 256)
+        star.inner_radius.value = 40 + i * 5
+        star.outer_radius.value = 100 + i * 10
+        star.points.value = 5 + i
+        group.add_shape(objects.Ellipse(NVector(100 + i * 30, 100), NVector(50, 50)))
+        group.add_shape(objects.Stroke(Color(0, 0, 0), 4))
+        group.add_shape(objects.Fill(Color(i / 10, 0.5, 1 - i / 10)))
+        group.transform.rotation.add_keyframe(0, 0, easing.Sigmoid())
+        group.transform.rotation.add_keyframe(60, 360)
+        group.transform.opacity.value = 80
+    return animation
+
+
+@benchmark
+def render(ns):
+    """
+    Rendering a frame to PNG through SVG and directly with pycairo
+    """
+    from lottie.parsers.svg.builder import to_svg
+    env = {"animation": _render_animation(), "to_svg": to_svg, "io": __import__("io")}
+    statements = [
+        ("to_svg", "to_svg(animation, 30).write(io.BytesIO())"),
+    ]
+    try:
+        import cairosvg
+        from lottie.exporters.cairo import export_png
+        env["export_png"] = export_png
+        statements.append(("png via svg", "export_png(animation, io.BytesIO(), 30, renderer='svg')"))
+    except (ImportError, OSError):
+        print("cairosvg not available")
+    try:
+        from lottie.utils import cairo_renderer
+        env["cairo_renderer"] = cairo_renderer
+        statements += [
+            ("direct draw", "cairo_renderer.render_surface(animation, 30)"),
+            ("png direct", "cairo_renderer.render_surface(animation, 30).write_to_png(io.BytesIO())"),
+        ]
+    except ImportError:
+        print("pycairo not available")
+    time_statements(statements, env, max(1, ns.number // 1000))
+
+
+def _json_corpus(ns):
+    from lottie.parsers.tgs import open_maybe_gzipped
+    files = []
+    if ns.corpus:
+        for name in sorted(os.listdir(ns.corpus)):
+            if os.path.splitext(name)[1] in (".json", ".tgs"):
+                files.append(os.path.join(ns.corpus, name))
+    data = [open_maybe_gzipped(file, lambda fp: fp.read()) for file in files]
+    data = [d.encode("utf-8") if isinstance(d, str) else d for d in data]
+    if not data:
+        print("No corpus given, using a generated animation")
+        from lottie.utils.json_backend import JsonBackend
+        data = [JsonBackend().dumps_bytes(_render_animation().to_dict())]
+    return data
+
+
+@benchmark
+def json(ns):
+    """
+    Loading and dumping lottie JSON with each available backend (use --corpus for real files)
+    """
+    from lottie.utils import json_backend
+    data = _json_corpus(ns)
+    total = sum(map(len, data))
+    number = max(1, ns.number // 10000)
+    print("%s files, %.1f kB" % (len(data), total / 1024))
+    for name in json_backend.available_backends():
+        backend = json_backend.backend_types[name]()
+        parsed = [backend.loads(d) for d in data]
+        load = min(timeit.repeat(lambda: [backend.loads(d) for d in data], number=number, repeat=3)) / number
+        dump = min(timeit.repeat(lambda: [backend.dumps_bytes(p) for p in parsed], number=number, repeat=3)) / number
+        print("%-10s load %8.1f MB/s  dump %8.1f MB/s" % (name, total / load / 1e6, total / dump / 1e6))
+
+
+@benchmark
+def json_export(ns):
+    """
+    Exporting lottie objects through to_dict() compared to the streaming writer, with peak memory usage
+    """
+    import tracemalloc
+    from lottie.objects import Animation
+    from lottie.utils import json_backend, json_stream
+    backend = json_backend.get_backend()
+    animations = [Animation.load(backend.loads(d)) for d in _json_corpus(ns)]
+    number = max(1, ns.number // 10000)
+    # Output is discarded so only the memory used while serializing is measured
+    null = open(os.devnull, "w")
+    exporters = [
+        ("to_dict + %s" % backend.name, lambda a: backend.dump(a.to_dict(), null)),
+        ("stream", lambda a: json_stream.dump(a, null)),
+    ]
+    for name, func in exporters:
+        time = min(timeit.repeat(lambda: [func(a) for a in animations], number=number, repeat=3)) / number
+        peak = 0
+        for animation in animations:
+            tracemalloc.start()
+            func(animation)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        print("%-16s %8.2f ms  peak %8.1f kB" % (name, time * 1000, peak / 1024))
+    null.close()
+
+
+@benchmark
+def lazy_load(ns):
+    """
+    Loading animations to read their metadata, converting everything up front or lazily
+    """
+    from lottie.objects import Animation
+    from lottie.utils import json_backend
+    backend = json_backend.get_backend()
+    parsed = [backend.loads(d) for d in _json_corpus(ns)]
+    number = max(1, ns.number // 10000)
+
+    def summary(lazy):
+        for data in parsed:
+            animation = Animation.load(data, lazy)
+            animation.width, animation.height, animation.frame_rate, len(animation.layers)
+
+    for lazy in (False, True):
+        time = min(timeit.repeat(lambda: summary(lazy), number=number, repeat=3)) / number
+        print("%-6s %8.2f ms" % ("lazy" if lazy else "eager", time * 1000))
+
+
+@benchmark
+def cold_start(ns):
+    """
+    Running lottie_convert.py in a new process to convert a lottie file to tgs
+    """
+    import subprocess
+    import tempfile
+    from lottie.objects import Animation
+    from lottie.utils.json_backend import JsonBackend
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bin", "lottie_convert.py")
+    number = max(1, ns.number // 10000)
+    with tempfile.TemporaryDirectory() as tmp:
+        infile = os.path.join(tmp, "in.json")
+        with open(infile, "w") as fp:
+            fp.write(JsonBackend().dumps(Animation(60).to_dict()))
+        commands = [
+            ("help", [sys.executable, script, "--help"]),
+            ("json to tgs", [sys.executable, script, infile, os.path.join(tmp, "out.tgs")]),
+        ]
+        for name, command in commands:
+            def run():
+                subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            time = min(timeit.repeat(run, number=number, repeat=3)) / number
+            print("%-12s %8.1f ms" % (name, time * 1000))
+
+
+parser = argparse.ArgumentParser(description="Runs micro benchmarks")
+parser.add_argument(
+    "benchmarks",
+    nargs="*",
+    metavar="benchmark",
+    help="Benchmarks to run (default: all), one of: %s" % ", ".join(benchmarks),
+)
+parser.add_argument(
+    "--number", "-n",
+    type=int,
+    default=100000,
+    help="Number of iterations for timed statements",
+)
+parser.add_argument(
+    "--corpus",
+    default=None,
+    help="Directory with lottie / tgs files for the json benchmarks",
+)
+
+
+if __name__ == "__main__":
+    ns = parser.parse_args()
+    for name in ns.benchmarks:
+        if name not in benchmarks:
+            parser.error("Unknown benchmark %r" % name)
+    for name in ns.benchmarks or benchmarks:
+        print("# %s: %s" % (name, benchmarks[name].__doc__.strip()))
+        benchmarks[name](ns)
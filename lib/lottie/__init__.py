@@ -1,29 +1,71 @@
 import os
-import subprocess
-from . import objects, parsers, utils, exporters, nvector, importers
+import importlib
+from . import nvector
 from .nvector import *
-from .utils.color import Color
+
+
+def _source_version():
+    """!
+    Version for a source checkout without version.py, computed like the Makefile does
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    vfn = os.path.join(root, "version")
+    if not os.path.exists(vfn):
+        return "unknown"
+
+    with open(vfn) as vf:
+        base = vf.read().strip()
+
+    commit = _git_head(os.path.join(root, ".git"))
+    if commit:
+        return base + "+dev" + commit[:7]
+    return base + "+src"
+
+
+def _git_head(gitdir):
+    """!
+    Reads the commit hash checked out in @p gitdir, without running git
+    @returns The hash or @c None if it can't be found
+    """
+    try:
+        if os.path.isfile(gitdir):
+            # Worktrees and submodules have a file pointing to the actual directory
+            with open(gitdir) as gf:
+                gitdir = os.path.join(os.path.dirname(gitdir), gf.read().split(":", 1)[1].strip())
+
+        with open(os.path.join(gitdir, "HEAD")) as hf:
+            head = hf.read().strip()
+        if not head.startswith("ref:"):
+            return head
+
+        ref = head[4:].strip()
+        # Worktrees keep their refs in the main repository
+        commondir = os.path.join(gitdir, "commondir")
+        if os.path.isfile(commondir):
+            with open(commondir) as cf:
+                gitdir = os.path.join(gitdir, cf.read().strip())
+
+        ref_file = os.path.join(gitdir, *ref.split("/"))
+        if os.path.isfile(ref_file):
+            with open(ref_file) as rf:
+                return rf.read().strip()
+
+        packed = os.path.join(gitdir, "packed-refs")
+        if os.path.isfile(packed):
+            with open(packed) as pf:
+                for line in pf:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+    except (OSError, IndexError):
+        pass
+    return None
+
 
 try:
     from .version import __version__
 except ImportError:
-    here = os.path.dirname(os.path.abspath(__file__))
-    pipe = subprocess.Popen(
-        ['git', 'describe', '--abbrev=0', '--tags'],
-        cwd=here,
-        stderr=subprocess.DEVNULL,
-        stdout=subprocess.PIPE
-    )
-    out, err = pipe.communicate()
-    if pipe.returncode == 0:
-        __version__ = out.strip()[1:].decode("ascii") + "+git"
-    else:
-        vfn = os.path.join(os.path.dirname(os.path.dirname(here)), "version")
-        if os.path.exists(vfn):
-            with open(vfn) as vf:
-                __version__ = vf.read().strip() + "+src"
-        else:
-            __version__ = "unknown"
+    __version__ = _source_version()
 
 try:
     version_tuple = tuple(map(int, __version__.split("+")[0].split("."))) if __version__ != "unknown" else (0, 0, 0)
@@ -33,3 +75,13 @@ except ValueError:
 
 
 __all__ = ["objects", "parsers", "utils", "exporters", "nvector", "NVector", "Point", "Color", "importers"]
+
+
+def __getattr__(name):
+    # Subpackages are imported on first access, so importing lottie (eg: for __version__) is cheap
+    if name in ("objects", "parsers", "utils", "exporters", "importers"):
+        return importlib.import_module("." + name, __name__)
+    if name == "Color":
+        from .utils.color import Color
+        return Color
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
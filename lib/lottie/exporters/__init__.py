@@ -1,19 +1,36 @@
-from . import base, core, sif, svg, pretty_print
+import importlib
 
+from . import base
 from .base import exporters
-from .core import export_lottie, export_tgs, export_embedded_html
-from .pretty_print import prettyprint, prettyprint_summary
-from .sif import export_sif
-from .svg import export_svg
+
+## Functions available from this package, by the module defining them
+_functions = {
+    "export_lottie": "core",
+    "export_tgs": "core",
+    "export_embedded_html": "core",
+    "prettyprint": "pretty_print",
+    "prettyprint_summary": "pretty_print",
+    "export_sif": "sif",
+    "export_svg": "svg",
+    "export_animated_svg": "svg",
+}
+
+## Modules that are only available with optional dependencies installed
+_optional = ["cairo", "gif"]
 
 __all__ = [
     "base", "core", "sif", "svg", "pretty_print",
     "exporters", "export_lottie", "export_tgs", "export_embedded_html",
-    "prettyprint", "prettyprint_summary", "export_sif", "export_svg",
+    "prettyprint", "prettyprint_summary", "export_sif", "export_svg", "export_animated_svg",
 ]
 
-try:
-    from . import cairo, gif
-    __all__ += ["cairo", "gif"]
-except ImportError:
-    pass
+
+def __getattr__(name):
+    # Modules are imported on first access, so using one exporter doesn't load the dependencies of all of them
+    if name in _functions:
+        value = getattr(importlib.import_module("." + _functions[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in __all__ or name in _optional:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,27 +1,115 @@
-import cairosvg
 import io
+import sys
+from xml.etree import ElementTree
 
-from .base import exporter
-from .svg import export_svg
+from ..parsers.svg.builder import IncrementalSvgBuilder, to_svg
+from ..utils.render_cache import cached
 
+try:
+    import cairosvg
+except (ImportError, OSError):
+    cairosvg = None
 
-def _export_cairo(func, animation, fp, frame, dpi):
-    intermediate = io.StringIO()
-    export_svg(animation, intermediate, frame)
-    intermediate.seek(0)
-    func(file_obj=intermediate, write_to=fp, dpi=dpi)
+try:
+    import cairo
+    from ..utils import cairo_renderer
+except ImportError:
+    cairo_renderer = None
 
+if cairosvg is None and cairo_renderer is None:
+    raise ImportError("Rendering requires pycairo or cairosvg", name="cairosvg")
 
-@exporter("PNG", ["png"], [], {"frame"})
-def export_png(animation, fp, frame=0, dpi=96):
-    _export_cairo(cairosvg.svg2png, animation, fp, frame, dpi)
 
+## Available renderers, in order of preference
+renderers = [
+    name
+    for name, module in [("svg", cairosvg), ("cairo", cairo_renderer)]
+    if module is not None
+]
 
-@exporter("PDF", ["pdf"], [], {"frame"})
-def export_pdf(animation, fp, frame=0, dpi=96):
-    _export_cairo(cairosvg.svg2pdf, animation, fp, frame, dpi)
 
+def _export_cairosvg(func, animation, fp, frame, dpi, **kwargs):
+    # The intermediate document is only read by cairosvg, so it doesn't need to be pretty
+    svg = ElementTree.tostring(to_svg(animation, frame).getroot())
+    func(bytestring=svg, write_to=fp, dpi=dpi, **kwargs)
 
-@exporter("PostScript", ["ps"], [], {"frame"})
-def export_ps(animation, fp, frame=0, dpi=96):
-    _export_cairo(cairosvg.svg2ps, animation, fp, frame, dpi)
+
+def _direct(renderer):
+    # The direct renderer is only used by default when cairosvg isn't installed
+    if renderer is None:
+        return cairosvg is None
+    if renderer not in renderers:
+        raise Exception("Renderer %r not available, install %s" % (
+            renderer, "pycairo" if renderer == "cairo" else "cairosvg"
+        ))
+    return renderer == "cairo"
+
+
+@cached()
+def export_png(animation, fp, frame=0, dpi=96, renderer=None):
+    """!
+    Renders a frame to PNG
+    @param dpi Resolution, the image has the size of the animation at 96 DPI
+    """
+    if _direct(renderer):
+        cairo_renderer.render_surface(animation, frame, dpi / 96).write_to_png(fp)
+    else:
+        _export_cairosvg(cairosvg.svg2png, animation, fp, frame, dpi, scale=dpi / 96)
+
+
+def export_pdf(animation, fp, frame=0, dpi=96, renderer=None):
+    if _direct(renderer):
+        cairo_renderer.render_vector(cairo.PDFSurface, animation, fp, frame, dpi)
+    else:
+        _export_cairosvg(cairosvg.svg2pdf, animation, fp, frame, dpi)
+
+
+def export_ps(animation, fp, frame=0, dpi=96, renderer=None):
+    if _direct(renderer):
+        cairo_renderer.render_vector(cairo.PSSurface, animation, fp, frame, dpi)
+    else:
+        _export_cairosvg(cairosvg.svg2ps, animation, fp, frame, dpi)
+
+
+def export_bgra(animation, frame=0, dpi=96, renderer=None, restructured=None):
+    """!
+    Renders a frame to raw pixels, without encoding it into an image format when possible
+    @param restructured Result of cairo_renderer.restructure() for @p animation, used by the direct renderer
+    @returns bytes with the premultiplied BGRA pixels, rows have no padding
+    """
+    if _direct(renderer) and sys.byteorder == "little":
+        surface = cairo_renderer.render_surface(animation, frame, restructured=restructured)
+        # Native endian ARGB32, rows of 32 bit pixels are always aligned so stride == width * 4
+        return bytes(surface.get_data())
+
+    file = io.BytesIO()
+    # Bypasses the render cache, frames are cached (if at all) as part of the whole output
+    # Frames always have the size of the animation
+    export_png.__wrapped__(animation, file, frame, 96, renderer)
+    file.seek(0)
+    return _png_to_bgra(file)
+
+
+def _png_to_bgra(file):
+    from PIL import Image
+    return Image.open(file).convert("RGBA").tobytes("raw", "BGRa")
+
+
+def bgra_renderer(animation, dpi=96, renderer=None):
+    """!
+    Returns a function rendering frames of @p animation like export_bgra()
+
+    The layer structure is computed once, so @p animation must not be modified while rendering.
+    When rendering through cairosvg the SVG document is built once
+    and only its animated attributes are updated for each frame.
+    """
+    if _direct(renderer):
+        restructured = cairo_renderer.restructure(animation) if sys.byteorder == "little" else None
+        return lambda frame: export_bgra(animation, frame, dpi, renderer, restructured)
+
+    builder = IncrementalSvgBuilder(animation)
+
+    def render(frame):
+        svg = ElementTree.tostring(builder.frame(frame).getroot())
+        return _png_to_bgra(io.BytesIO(cairosvg.svg2png(bytestring=svg, dpi=dpi)))
+    return render
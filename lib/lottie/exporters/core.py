@@ -1,35 +1,30 @@
 import sys
-import json
 import gzip
-import codecs
 
-from .base import exporter
 from ..utils.file import open_file
-from ..parsers.baseporter import ExtraOption
+from ..utils import json_backend, json_stream
 from .tgs_validator import TgsValidator
 
 
-@exporter("Lottie JSON", ["json"], [], {"pretty"}, "lottie")
-def export_lottie(animation, file, pretty=False):
+def export_lottie(animation, file, pretty=False, stream=False):
     with open_file(file) as fp:
-        kw = {}
-        if pretty:
-            kw = dict(indent=4)
-        json.dump(animation.to_dict(), fp, **kw)
+        if stream:
+            json_stream.dump(animation, fp, 4 if pretty else None)
+        else:
+            json_backend.get_backend().dump(animation.to_dict(), fp, 4 if pretty else None)
 
 
-@exporter("Telegram Animated Sticker", ["tgs"], [
-    ExtraOption("no_sanitize", help="Disable Sticker fit", action="store_false", dest="sanitize"),
-    ExtraOption("no_validate", help="Disable feature validation", action="store_false", dest="validate"),
-])
-def export_tgs(animation, file, sanitize=False, validate=False):
+def export_tgs(animation, file, sanitize=False, validate=False, stream=False):
     if sanitize:
         animation.tgs_sanitize()
 
     with gzip.open(file, "wb") as gzfile:
-        lottie_dict = animation.to_dict()
-        lottie_dict["tgs"] = 1
-        json.dump(lottie_dict, codecs.getwriter('utf-8')(gzfile))
+        if stream:
+            json_stream.dump(animation, gzfile, tgs=1)
+        else:
+            lottie_dict = animation.to_dict()
+            lottie_dict["tgs"] = 1
+            gzfile.write(json_backend.get_backend().dumps_bytes(lottie_dict))
 
     if validate:
         validator = TgsValidator()
@@ -98,7 +93,6 @@ class HtmlOutput:
         self.file.write("</body></html>")
 
 
-@exporter("Lottie HTML", ["html", "htm"])
 def export_embedded_html(animation, file):
     with open_file(file) as fp:
         out = HtmlOutput(animation, fp)
@@ -1,33 +1,22 @@
-import json
 import string
 import zipfile
 
-from .base import exporter
-from ..parsers.baseporter import ExtraOption
 from ..parsers.tgs import parse_tgs
 from lottie import __version__
 from ..objects import assets
+from ..utils import json_backend
 
 
-@exporter("dotLottie Archive", ["lottie"], [
-    ExtraOption("id", help="ID of the animation", default=None),
-    ExtraOption("append", help="Append animation to existing archive", action="store_true"),
-    ExtraOption("revision", help="File revision", type=int, default=None),
-    ExtraOption("author", help="File author", default=None),
-    ExtraOption("speed", help="Playback speed", type=float, default=1),
-    ExtraOption("theme_color", help="Theme color", type=str, default="#ffffff"),
-    ExtraOption("no_loop", help="Disable Looping", action="store_false", dest="loop"),
-    ExtraOption("no_pack", help="Don't auto-pack images", action="store_false", dest="pack_images"),
-], slug="dotlottie")
 def export_dotlottie(animation, file, id=None, append=False, revision=None, author=None,
                      speed=1.0, theme_color="#ffffff", loop=True, pack_images=True):
 
     files = {}
+    backend = json_backend.get_backend()
 
     if append:
         with zipfile.ZipFile(file, "r") as zf:
             with zf.open("manifest.json") as manifest:
-                meta = json.load(manifest)
+                meta = backend.load(manifest)
 
             for name in zf.namelist():
                 if name != "manifest.json":
@@ -81,8 +70,8 @@ def export_dotlottie(animation, file, id=None, append=False, revision=None, auth
                 asset.image = basename
                 asset.is_embedded = False
 
-    files["manifest.json"] = json.dumps(meta)
-    files["animations/%s.json" % id] = json.dumps(animation.to_dict())
+    files["manifest.json"] = backend.dumps_bytes(meta)
+    files["animations/%s.json" % id] = backend.dumps_bytes(animation.to_dict())
 
     with zipfile.ZipFile(file, "w") as zf:
         for name, data in files.items():
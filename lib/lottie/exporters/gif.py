@@ -1,10 +1,22 @@
 import io
+import os
+import struct
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy
+except ImportError:
+    numpy = None
 from PIL import Image
 from PIL import features
 
-from .cairo import export_png
-from .base import exporter, io_progress
-from ..parsers.baseporter import ExtraOption
+from .cairo import bgra_renderer
+from .base import io_progress
+from ..objects.animation import Animation
+from ..utils.file import open_file
+from ..utils.render_cache import cached
+from ..utils.scene_state import SceneState
 
 
 def _png_gif_prepare(image):
@@ -24,28 +36,468 @@ def _log_frame(fmt, frame_no=None, end=None):
         io_progress().report_progress("%s rendering frame" % fmt, frame_no, end)
 
 
-@exporter("GIF", ["gif"], [
-    ExtraOption("skip_frames", type=int, default=1, help="Only renderer 1 out of these many frames"),
-])
-def export_gif(animation, fp, dpi=96, skip_frames=1):
+_worker_render = None
+
+
+def _render_worker_init(lottie, dpi):
+    global _worker_render
+    _worker_render = bgra_renderer(Animation.load(lottie), dpi)
+
+
+def _render_worker_chunk(frames):
+    return [_worker_render(frame) for frame in frames]
+
+
+def _render_distinct(animation, frames, dpi, workers):
+    workers = min(workers or os.cpu_count() or 1, len(frames))
+
+    if workers <= 1:
+        render = bgra_renderer(animation, dpi)
+        for i in frames:
+            yield render(i)
+    else:
+        # Workers load the animation once and render contiguous chunks of frames
+        chunksize = max(1, min(4, len(frames) // (workers * 4)))
+        chunks = iter([frames[i:i+chunksize] for i in range(0, len(frames), chunksize)])
+        initargs = (animation.to_dict(), dpi)
+        with ProcessPoolExecutor(workers, initializer=_render_worker_init, initargs=initargs) as pool:
+            pending = collections.deque(
+                pool.submit(_render_worker_chunk, chunk)
+                for chunk in itertools.islice(chunks, workers * 2)
+            )
+            while pending:
+                rendered = pending.popleft().result()
+                for next_chunk in itertools.islice(chunks, 1):
+                    pending.append(pool.submit(_render_worker_chunk, next_chunk))
+                yield from rendered
+
+
+def _render_frames(fmt, animation, frames, dpi=96, workers=1, dedupe=True):
+    """!
+    Renders frames to raw pixels
+    @param fmt          Format name for progress reports
+    @param animation    Animation to render
+    @param frames       Frame numbers to render
+    @param dpi          Resolution
+    @param workers      Number of processes rendering frames in parallel, 0 for one per CPU
+    @param dedupe       Whether to skip rendering frames that look the same as the previous one
+    @returns Generator yielding premultiplied BGRA buffers (see export_bgra())
+        in the same order as @p frames
+
+    Only a few frames per worker are rendered ahead of the consumer, so memory usage
+    doesn't depend on the number of frames.
+
+    With @p dedupe, frames whose SceneState matches the previous frame aren't rendered,
+    the buffer of the previous frame is yielded again instead (as the same object).
+    Computing the states is wasted work for animations where every frame changes.
+    """
+    end = int(animation.out_point)
+
+    # Runs of consecutive frames rendering the same image
+    if dedupe:
+        state = SceneState(animation)
+        runs = []
+        previous = None
+        for frame in frames:
+            current = state(frame)
+            if runs and current == previous:
+                runs[-1].append(frame)
+            else:
+                runs.append([frame])
+                previous = current
+    else:
+        runs = [[frame] for frame in frames]
+
+    rendered = _render_distinct(animation, [run[0] for run in runs], dpi, workers)
+    for run, data in zip(runs, rendered):
+        for i in run:
+            _log_frame(fmt, i, end)
+            yield data
+
+    _log_frame(fmt)
+
+
+def _convert_frames(frames, convert):
+    """!
+    Applies @p convert to the frames yielded by _render_frames(),
+    repeated frames reuse the converted object
+    """
+    previous = converted = None
+    for data in frames:
+        if data is not previous:
+            previous = data
+            converted = convert(data)
+        yield converted
+
+
+def _bgra_to_image(animation, data):
+    return Image.frombuffer("RGBA", (animation.width, animation.height), data, "raw", "BGRa", 0, 1)
+
+
+class GifStreamWriter:
+    """!
+    Writes GIF animations one frame at a time
+
+    All frames share the global palette, index 255 is transparent
+    """
+    def __init__(self, fp, width, height, palette, duration, loop=0):
+        """!
+        @param fp       Writable binary file
+        @param width    Image width
+        @param height   Image height
+        @param palette  List of 768 RGB values
+        @param duration Frame duration in milliseconds
+        @param loop     Number of loops, 0 for infinite
+        """
+        self.fp = fp
+        self.delay = int(round(duration / 10))
+        self.palette = bytes(palette[:768]).ljust(768, b"\0")
+        fp.write(b"GIF89a")
+        fp.write(struct.pack("<HHBBB", width, height, 0xf7, 255, 0))
+        fp.write(self.palette)
+        fp.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\0")
+
+    def write(self, image, position=(0, 0), disposal=2, delay=None):
+        """!
+        Encodes a frame
+        @param image    P mode image using the palette of the writer
+        @param position Offset of the image within the animation
+        @param disposal GIF disposal method: 1 leaves the frame in place, 2 clears its area after it's shown
+        @param delay    Frame duration in 1/100 s, defaults to the writer duration
+        """
+        encoded = io.BytesIO()
+        image.save(encoded, "GIF", optimize=False)
+        if delay is None:
+            delay = self.delay
+        # Graphic control extension with transparent index 255
+        self.fp.write(b"\x21\xf9\x04" + struct.pack("<BHBB", (disposal << 2) | 1, delay, 255, 0))
+        blocks = bytearray(self._image_blocks(encoded.getvalue()))
+        blocks[1:5] = struct.pack("<HH", *position)
+        self.fp.write(blocks)
+
+    def close(self):
+        self.fp.write(b";")
+
+    @staticmethod
+    def _skip_sub_blocks(data, pos):
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    @classmethod
+    def _image_blocks(cls, data):
+        """!
+        Extracts the image descriptor and LZW data from a single frame GIF
+        """
+        pos = 13
+        if data[10] & 0x80:
+            pos += 3 << ((data[10] & 7) + 1)
+        while data[pos] == 0x21:
+            pos = cls._skip_sub_blocks(data, pos + 2)
+        start = pos
+        pos += 10
+        if data[start + 9] & 0x80:
+            pos += 3 << ((data[start + 9] & 7) + 1)
+        pos = cls._skip_sub_blocks(data, pos + 1)
+        return data[start:pos]
+
+
+class WebPStreamWriter:
+    """!
+    Writes animated WebP files one frame at a time
+
+    Each frame is compressed on its own and wrapped in the animation container,
+    so frames are always full size, without blending with the previous one
+    """
+    def __init__(self, fp, width, height, duration, loop=0, background=(0, 0, 0, 0), **options):
+        """!
+        @param fp           Writable binary file
+        @param width        Image width
+        @param height       Image height
+        @param duration     Frame duration in milliseconds
+        @param loop         Number of loops, 0 for infinite
+        @param background   RGBA background color
+        @param options      WebP encoder options for PIL (lossless, quality, method)
+        """
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.duration = int(round(duration))
+        self.options = options
+        self.size = 0
+        self.seekable = fp.seekable()
+        self.chunks = []
+        self.start = fp.tell() if self.seekable else 0
+
+        vp8x = struct.pack("<B3x", 0x12) + self._uint24(width - 1) + self._uint24(height - 1)
+        r, g, b, a = background
+        self._write(b"RIFF\0\0\0\0WEBP")
+        self._write_chunk(b"VP8X", vp8x)
+        self._write_chunk(b"ANIM", bytes((b, g, r, a)) + struct.pack("<H", loop))
+
+    @staticmethod
+    def _uint24(value):
+        return struct.pack("<I", value)[:3]
+
+    def _write(self, data):
+        self.size += len(data)
+        if self.seekable:
+            self.fp.write(data)
+        else:
+            self.chunks.append(data)
+
+    def _write_chunk(self, fourcc, payload):
+        self._write(fourcc + struct.pack("<I", len(payload)) + payload + b"\0" * (len(payload) % 2))
+
+    def write(self, image):
+        """!
+        Encodes a frame
+        @param image Image of the same size as the animation
+        """
+        encoded = io.BytesIO()
+        image.save(encoded, "WEBP", **self.options)
+        data = encoded.getvalue()
+
+        frame_data = b""
+        pos = 12
+        while pos < len(data):
+            fourcc = data[pos:pos+4]
+            size = struct.unpack("<I", data[pos+4:pos+8])[0]
+            end = pos + 8 + size + size % 2
+            if fourcc in (b"ALPH", b"VP8 ", b"VP8L"):
+                frame_data += data[pos:end]
+            pos = end
+
+        header = (
+            self._uint24(0) + self._uint24(0) +
+            self._uint24(self.width - 1) + self._uint24(self.height - 1) +
+            self._uint24(self.duration) +
+            # Don't blend, don't dispose
+            b"\x02"
+        )
+        self._write_chunk(b"ANMF", header + frame_data)
+
+    def close(self):
+        riff_size = struct.pack("<I", self.size - 8)
+        if self.seekable:
+            end = self.fp.tell()
+            self.fp.seek(self.start + 4)
+            self.fp.write(riff_size)
+            self.fp.seek(end)
+        else:
+            self.chunks[0] = self.chunks[0][:4] + riff_size + self.chunks[0][8:]
+            for chunk in self.chunks:
+                self.fp.write(chunk)
+            self.chunks = []
+
+
+class GifPalette:
+    """!
+    Palette shared by all the frames of a GIF, with a lookup table mapping colors to palette indices
+
+    Index 255 is reserved for transparency
+    """
+    ## Bits per channel in the lookup table
+    lut_bits = 6
+
+    def __init__(self, colors):
+        """!
+        @param colors Array of up to 255 RGB colors
+        """
+        colors = numpy.asarray(colors, dtype=numpy.int32).reshape(-1, 3)[:255]
+        ## List of 768 RGB values, unused entries repeat the first color
+        self.palette = colors.reshape(-1).tolist() + colors[0].tolist() * (256 - len(colors))
+
+        # Nearest color to the center of each cell of the lookup table
+        size = 1 << self.lut_bits
+        shift = 8 - self.lut_bits
+        levels = (numpy.arange(size, dtype=numpy.int32) << shift) + (1 << shift >> 1)
+        grid = numpy.stack(numpy.meshgrid(levels, levels, levels, indexing="ij"), -1).reshape(-1, 3)
+        self.lut = numpy.empty(len(grid), dtype=numpy.uint8)
+        chunk = 4096
+        for i in range(0, len(grid), chunk):
+            distance = ((grid[i:i+chunk, None, :] - colors[None, :, :]) ** 2).sum(-1)
+            self.lut[i:i+chunk] = distance.argmin(1)
+
+    @classmethod
+    def from_frames(cls, frames, max_pixels=1 << 18):
+        """!
+        Builds a palette of 255 colors covering the opaque pixels in @p frames
+        @param frames       Sequence of (rgb, alpha) tuples as returned by _bgra_to_arrays()
+        @param max_pixels   Maximum number of pixels to sample
+        """
+        pixels = numpy.concatenate([rgb[alpha > 128] for rgb, alpha in frames])
+        if len(pixels) == 0:
+            return cls([[0, 0, 0]])
+        pixels = pixels[::max(1, len(pixels) // max_pixels)]
+        strip = Image.frombytes("RGB", (len(pixels), 1), numpy.ascontiguousarray(pixels).tobytes())
+        colors = strip.quantize(255).getpalette()
+        return cls(colors[:len(colors) // 3 * 3])
+
+    def quantize(self, rgb, alpha):
+        """!
+        Maps pixels to palette indices
+        @param rgb      Array of shape (height, width, 3)
+        @param alpha    Array of shape (height, width)
+        @returns Array of shape (height, width) with the palette indices
+        """
+        shift = 8 - self.lut_bits
+        channels = (rgb >> shift).astype(numpy.int32)
+        index = (channels[..., 0] << (2 * self.lut_bits)) | (channels[..., 1] << self.lut_bits) | channels[..., 2]
+        indices = self.lut[index]
+        indices[alpha <= 128] = 255
+        return indices
+
+
+def _bgra_to_arrays(animation, data):
+    """!
+    Converts premultiplied BGRA data into straight RGB and alpha arrays
+    """
+    pixels = numpy.frombuffer(data, numpy.uint8).reshape(animation.height, animation.width, 4)
+    alpha = pixels[..., 3]
+    rgb = pixels[..., 2::-1].astype(numpy.uint16)
+    partial = (alpha > 0) & (alpha < 255)
+    rgb[partial] = rgb[partial] * 255 // alpha[partial, None]
+    return numpy.minimum(rgb, 255).astype(numpy.uint8), alpha
+
+
+def _bounding_box(mask):
+    rows = numpy.flatnonzero(mask.any(1))
+    if len(rows) == 0:
+        return None
+    cols = numpy.flatnonzero(mask.any(0))
+    return [cols[0], rows[0], cols[-1] + 1, rows[-1] + 1]
+
+
+def _box_union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+
+
+class GifDeltaEncoder:
+    """!
+    Writes only the rectangle that changed between GIF frames
+
+    Frames are kept on the canvas, unchanged pixels within the rectangle use the transparent
+    index. When pixels become transparent the previous frame clears its area instead,
+    so each frame is written only once the following one is known.
+    Frames identical to the previous one extend its duration.
+    """
+    def __init__(self, writer: GifStreamWriter, width, height):
+        self.writer = writer
+        ## Canvas contents before the pending frame is drawn
+        self.canvas = numpy.full((height, width), 255, dtype=numpy.uint8)
+        self.pending = None
+        self.pending_delay = 0
+        self.pending_box = None
+
+    def add(self, indices, delay):
+        """!
+        Adds a frame
+        @param indices  Palette indices for the whole frame
+        @param delay    Duration in 1/100 s
+        """
+        if self.pending is None:
+            self._set_pending(indices, delay)
+            return
+
+        if indices is self.pending:
+            self.pending_delay += delay
+            return
+
+        changed = indices != self.pending
+        if not changed.any():
+            self.pending_delay += delay
+            return
+
+        cleared_box = _bounding_box(changed & (indices == 255))
+        self._flush(cleared_box)
+        self._set_pending(indices, delay)
+
+    def _set_pending(self, indices, delay):
+        self.pending = indices
+        self.pending_delay = delay
+        self.pending_box = _bounding_box(indices != self.canvas)
+
+    def _flush(self, cleared_box=None):
+        frame = self.pending
+        box = _box_union(self.pending_box, cleared_box)
+        if box is None:
+            # Nothing to draw, a single transparent pixel keeps the timing
+            box = [0, 0, 1, 1]
+
+        left, top, right, bottom = box
+        area = frame[top:bottom, left:right]
+        data = numpy.where(area != self.canvas[top:bottom, left:right], area, 255).astype(numpy.uint8)
+        image = Image.frombytes("P", (right - left, bottom - top), data.tobytes())
+        image.putpalette(self.writer.palette)
+        disposal = 1 if cleared_box is None else 2
+        self.writer.write(image, (int(left), int(top)), disposal, self.pending_delay)
+
+        self.canvas = frame.copy()
+        if cleared_box is not None:
+            self.canvas[top:bottom, left:right] = 255
+
+    def close(self):
+        if self.pending is not None:
+            self._flush()
+            self.pending = None
+        self.writer.close()
+
+
+def _export_gif_streaming(animation, fp, frames, dpi, duration, workers, dedupe):
+    if numpy is None:
+        raise Exception("Streaming GIF export requires numpy")
+
+    sample = frames[::max(1, len(frames) // 8)][:8]
+    palette = GifPalette.from_frames([
+        _bgra_to_arrays(animation, data)
+        for data in _render_frames("GIF palette", animation, sample, dpi, workers, dedupe)
+    ])
+
+    delay = int(round(duration / 10))
+    with open_file(fp, "wb") as file:
+        writer = GifStreamWriter(file, animation.width, animation.height, palette.palette, duration)
+        encoder = GifDeltaEncoder(writer, animation.width, animation.height)
+        for indices in _convert_frames(
+            _render_frames("GIF", animation, frames, dpi, workers, dedupe),
+            lambda data: palette.quantize(*_bgra_to_arrays(animation, data))
+        ):
+            encoder.add(indices, delay)
+        encoder.close()
+
+
+@cached(ignore={"workers", "dedupe"})
+def export_gif(animation, fp, dpi=96, skip_frames=1, workers=1, streaming=False, dedupe=True):
     """
     Gif export
 
     Note that it's a bit slow.
+
+    In streaming mode all frames use a single palette, computed from a sample of the frames,
+    and only the area that changed from the previous frame is encoded (requires numpy).
+
+    Pass dedupe=False for animations where every frame changes,
+    to skip looking for frames that can be reused.
     """
     start = int(animation.in_point)
     end = int(animation.out_point)
-    frames = []
-    for i in range(start, end+1, skip_frames):
-        _log_frame("GIF", i, end)
-        file = io.BytesIO()
-        export_png(animation, file, i, dpi)
-        file.seek(0)
-        frames.append(_png_gif_prepare(Image.open(file)))
-    _log_frame("GIF")
+    duration = int(round(1000 / animation.frame_rate * skip_frames / 10)) * 10
+    if streaming:
+        _export_gif_streaming(
+            animation, fp, list(range(start, end+1, skip_frames)), dpi, duration, workers, dedupe
+        )
+        return
+
+    frames = list(_convert_frames(
+        _render_frames("GIF", animation, range(start, end+1, skip_frames), dpi, workers, dedupe),
+        lambda data: _png_gif_prepare(_bgra_to_image(animation, data))
+    ))
 
     io_progress().report_message("GIF Writing to file...")
-    duration = int(round(1000 / animation.frame_rate * skip_frames / 10)) * 10
     frames[0].save(
         fp,
         format='GIF',
@@ -58,38 +510,49 @@ def export_gif(animation, fp, dpi=96, skip_frames=1):
     )
 
 
-@exporter("WebP", ["webp"], [
-    ExtraOption("lossless", action="store_true", help="If present, use lossless compression"),
-    ExtraOption("quality", type=int, default=80,
-                help="Compression effort between 0 and 100\n" +
-                     "for lossy 0 gives the smallest size\n" +
-                     "for lossless 0 gives the largest file"),
-    ExtraOption("method", type=int, default=0, help="Quality/speed trade-off (0=fast, 6=slower-better)"),
-    ExtraOption("skip_frames", type=int, default=1, help="Only renderer 1 out of these many frames"),
-])
-def export_webp(animation, fp, dpi=96, lossless=False, quality=80, method=0, skip_frames=1):
+@cached(ignore={"workers", "dedupe"})
+def export_webp(
+    animation, fp, dpi=96, lossless=False, quality=80, method=0, skip_frames=1, workers=1, streaming=False,
+    dedupe=True
+):
     """
     Export WebP
 
     See https://pillow.readthedocs.io/en/stable/handbook/image-file-formats.html#webp
-    """
-    if not features.check("webp_anim"):
-        raise Exception("WebP animations not supported in this system")
 
+    In streaming mode frames are compressed independently, which is faster but produces larger files.
+    @see export_gif() for @p dedupe
+    """
     start = int(animation.in_point)
     end = int(animation.out_point)
-    frames = []
-    for i in range(start, end+1, skip_frames):
-        _log_frame("WebP", i, end)
-        file = io.BytesIO()
-        export_png(animation, file, i, dpi)
-        file.seek(0)
-        frames.append(Image.open(file))
+    duration = int(round(1000 / animation.frame_rate * skip_frames))
+    frames = range(start, end+1, skip_frames)
 
-    _log_frame("WebP")
+    if streaming:
+        if not features.check("webp"):
+            raise Exception("WebP not supported in this system")
+        with open_file(fp, "wb") as file:
+            writer = WebPStreamWriter(
+                file, animation.width, animation.height, duration,
+                lossless=lossless, quality=quality, method=method
+            )
+            for image in _convert_frames(
+                _render_frames("WebP", animation, frames, dpi, workers, dedupe),
+                lambda data: _bgra_to_image(animation, data)
+            ):
+                writer.write(image)
+            writer.close()
+        return
+
+    if not features.check("webp_anim"):
+        raise Exception("WebP animations not supported in this system")
+
+    frames = list(_convert_frames(
+        _render_frames("WebP", animation, frames, dpi, workers, dedupe),
+        lambda data: _bgra_to_image(animation, data)
+    ))
 
     io_progress().report_message("WebP Writing to file...")
-    duration = int(round(1000 / animation.frame_rate * skip_frames))
     frames[0].save(
         fp,
         format='WebP',
@@ -104,21 +567,18 @@ def export_webp(animation, fp, dpi=96, lossless=False, quality=80, method=0, ski
     )
 
 
-@exporter("TIFF", ["tiff"])
-def export_tiff(animation, fp, dpi=96):
+def export_tiff(animation, fp, dpi=96, workers=1, dedupe=True):
     """
     Export TIFF
+
+    @see export_gif() for @p dedupe
     """
     start = int(animation.in_point)
     end = int(animation.out_point)
-    frames = []
-    for i in range(start, end+1):
-        _log_frame("TIFF", i, end)
-        file = io.BytesIO()
-        export_png(animation, file, i, dpi)
-        file.seek(0)
-        frames.append(Image.open(file))
-    _log_frame("TIFF")
+    frames = list(_convert_frames(
+        _render_frames("TIFF", animation, range(start, end+1), dpi, workers, dedupe),
+        lambda data: _bgra_to_image(animation, data)
+    ))
 
     io_progress().report_message("TIFF Writing to file...")
     duration = int(round(1000 / animation.frame_rate))
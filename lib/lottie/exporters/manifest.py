@@ -0,0 +1,98 @@
+"""!
+Exporters available in this package
+
+They are declared here so they can be listed (eg: for command line options)
+without importing their modules and the libraries those depend on.
+"""
+from ..parsers.baseporter import LazyBaseporter, ExtraOption
+
+
+_cairo = ("cairosvg", "cairo")
+
+_stream_option = ExtraOption(
+    "stream",
+    help="Write the JSON while walking the animation instead of building it all in memory first",
+    action="store_true"
+)
+
+_renderer_option = ExtraOption(
+    "renderer", default=None, choices=["cairo", "svg"],
+    help="Renderer:\n" +
+         " * svg   : goes through cairosvg (default)\n" +
+         " * cairo : draws directly with pycairo, experimental (default if cairosvg isn't installed)"
+)
+
+_workers_option = ExtraOption(
+    "workers", type=int, default=1,
+    help="Number of processes rendering frames in parallel (0 for one per CPU)"
+)
+
+_streaming_option = ExtraOption(
+    "streaming", action="store_true",
+    help="Encode frames as they are rendered, memory usage doesn't depend on the number of frames"
+)
+
+_skip_frames_option = ExtraOption("skip_frames", type=int, default=1, help="Only renderer 1 out of these many frames")
+
+## Video formats supported by the video exporter
+video_formats = ["avi", "mp4", "webm"]
+
+
+## Exporters in order of preference when picking one from a file extension
+manifest = [
+    LazyBaseporter("core", "export_lottie", "Lottie JSON", ["json"], [_stream_option], {"pretty"}, "lottie"),
+    LazyBaseporter("core", "export_tgs", "Telegram Animated Sticker", ["tgs"], [
+        ExtraOption("no_sanitize", help="Disable Sticker fit", action="store_false", dest="sanitize"),
+        ExtraOption("no_validate", help="Disable feature validation", action="store_false", dest="validate"),
+        _stream_option,
+    ]),
+    LazyBaseporter("core", "export_embedded_html", "Lottie HTML", ["html", "htm"]),
+
+    LazyBaseporter("sif", "export_sif", "Synfig", ["sif"], [], {"pretty"}),
+
+    LazyBaseporter("svg", "export_svg", "SVG", ["svg"], [], {"pretty", "frame"}),
+    LazyBaseporter("svg", "export_animated_svg", "Animated SVG", ["svg"], [], {"pretty"}, "animated_svg"),
+
+    LazyBaseporter("cairo", "export_png", "PNG", ["png"], [_renderer_option], {"frame"}, requires=[_cairo]),
+    LazyBaseporter("cairo", "export_pdf", "PDF", ["pdf"], [_renderer_option], {"frame"}, requires=[_cairo]),
+    LazyBaseporter("cairo", "export_ps", "PostScript", ["ps"], [_renderer_option], {"frame"}, requires=[_cairo]),
+
+    LazyBaseporter("gif", "export_gif", "GIF", ["gif"], [
+        _skip_frames_option,
+        _workers_option,
+        _streaming_option,
+    ], requires=["PIL", _cairo]),
+    LazyBaseporter("gif", "export_webp", "WebP", ["webp"], [
+        ExtraOption("lossless", action="store_true", help="If present, use lossless compression"),
+        ExtraOption("quality", type=int, default=80,
+                    help="Compression effort between 0 and 100\n" +
+                         "for lossy 0 gives the smallest size\n" +
+                         "for lossless 0 gives the largest file"),
+        ExtraOption("method", type=int, default=0, help="Quality/speed trade-off (0=fast, 6=slower-better)"),
+        _skip_frames_option,
+        _workers_option,
+        _streaming_option,
+    ], requires=["PIL", _cairo]),
+    LazyBaseporter("gif", "export_tiff", "TIFF", ["tiff"], [
+        _workers_option,
+    ], requires=["PIL", _cairo]),
+
+    LazyBaseporter("dot_lottie", "export_dotlottie", "dotLottie Archive", ["lottie"], [
+        ExtraOption("id", help="ID of the animation", default=None),
+        ExtraOption("append", help="Append animation to existing archive", action="store_true"),
+        ExtraOption("revision", help="File revision", type=int, default=None),
+        ExtraOption("author", help="File author", default=None),
+        ExtraOption("speed", help="Playback speed", type=float, default=1),
+        ExtraOption("theme_color", help="Theme color", type=str, default="#ffffff"),
+        ExtraOption("no_loop", help="Disable Looping", action="store_false", dest="loop"),
+        ExtraOption("no_pack", help="Don't auto-pack images", action="store_false", dest="pack_images"),
+    ], slug="dotlottie"),
+
+    LazyBaseporter("video", "export_video", "Video", video_formats, [
+        ExtraOption("format", default=None, help="Specific video format", choices=video_formats),
+        _workers_option,
+    ], [], "video", requires=["cv2", "numpy", "PIL", _cairo]),
+]
+
+## Modules without exporters
+other_modules = ["pretty_print", "tgs_validator"]
@@ -1,8 +1,6 @@
-from xml.dom import minidom
-from xml.etree import ElementTree
-
-from .base import exporter
 from ..parsers.svg.builder import to_svg
+from ..parsers.svg.handler import SvgHandler
+from ..parsers.svg.smil import to_animated_svg
 from ..utils.file import open_file
 
 
@@ -10,13 +8,84 @@ def _print_ugly_xml(dom, file):
     return dom.write(file, "utf-8", True)
 
 
-def _print_pretty_xml(dom, file):
+def _escape_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_attrib(value):
+    return _escape_text(value).replace("\"", "&quot;").replace("\n", "&#10;")
+
+
+def _qnames(root):
+    """!
+    Returns a tuple of (dict mapping the qualified names used in @p root to prefixed ones,
+    namespace declarations for the root element)
+    """
+    prefixes = {uri: prefix for prefix, uri in SvgHandler.ns_map.items()}
+    used = {}
+
+    def qname(name):
+        if name[:1] != "{":
+            return name
+        uri, local = name[1:].split("}", 1)
+        prefix = used.get(uri)
+        if prefix is None:
+            prefix = used[uri] = prefixes.get(uri, "ns%s" % len(used))
+        return "%s:%s" % (prefix, local)
+
+    names = {}
+    for element in root.iter():
+        for name in (element.tag, *element.attrib):
+            if name not in names:
+                names[name] = qname(name)
+
+    declarations = "".join(
+        " xmlns:%s=\"%s\"" % (prefix, _escape_attrib(uri))
+        for uri, prefix in sorted(used.items(), key=lambda item: item[1])
+    )
+    return names, declarations
+
+
+def _write_pretty_element(write, element, names, indent, depth, extra=""):
+    prefix = indent * depth
+    tag = names[element.tag]
+    write("%s<%s%s" % (prefix, tag, extra))
+    for name, value in element.attrib.items():
+        write(" %s=\"%s\"" % (names[name], _escape_attrib(value)))
+
+    children = len(element)
+    if not children:
+        if element.text:
+            write(">%s</%s>\n" % (_escape_text(element.text), tag))
+        else:
+            write("/>\n")
+    else:
+        write(">\n")
+        if element.text:
+            write("%s%s%s\n" % (prefix, indent, _escape_text(element.text)))
+        for child in element:
+            _write_pretty_element(write, child, names, indent, depth + 1)
+            if child.tail:
+                write("%s%s%s\n" % (prefix, indent, _escape_text(child.tail)))
+        write("%s</%s>\n" % (prefix, tag))
+
+
+def _print_pretty_xml(dom, file, indent="   "):
+    """!
+    Writes an indented XML document straight from the ElementTree @p dom
+    """
+    root = dom.getroot()
+    names, declarations = _qnames(root)
     with open_file(file) as fp:
-        xmlstr = minidom.parseString(ElementTree.tostring(dom.getroot())).toprettyxml(indent="   ")
-        fp.write(xmlstr)
+        fp.write("<?xml version=\"1.0\" ?>\n")
+        _write_pretty_element(fp.write, root, names, indent, 0, declarations)
 
 
-@exporter("SVG", ["svg"], [], {"pretty", "frame"})
 def export_svg(animation, file, frame=0, pretty=True):
     _print_xml = _print_pretty_xml if pretty else _print_ugly_xml
     _print_xml(to_svg(animation, frame), file)
+
+
+def export_animated_svg(animation, file, pretty=True):
+    _print_xml = _print_pretty_xml if pretty else _print_ugly_xml
+    _print_xml(to_animated_svg(animation), file)
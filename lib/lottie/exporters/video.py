@@ -1,14 +1,10 @@
-import io
 import os
 
 import cv2
 import numpy
-from PIL import Image
 
-from .cairo import export_png
-from .gif import _log_frame
-from .base import exporter
-from ..parsers.baseporter import ExtraOption
+from .gif import _render_frames, _convert_frames
+from ..utils.render_cache import cached
 
 
 ## @see http://www.fourcc.org/codecs.php
@@ -20,10 +16,8 @@ formats4cc = {
 }
 
 
-@exporter("Video", list(formats4cc.keys()), [
-    ExtraOption("format", default=None, help="Specific video format", choices=list(formats4cc.keys())),
-], [], "video")
-def export_video(animation, fp, format=None):
+@cached(ignore={"workers", "dedupe"}, by_extension=True)
+def export_video(animation, fp, format=None, workers=1, dedupe=True):
     start = int(animation.in_point)
     end = int(animation.out_point)
     if format is None:
@@ -32,12 +26,12 @@ def export_video(animation, fp, format=None):
     fmt = formats4cc[format]
     video = cv2.VideoWriter(fp, fmt, animation.frame_rate, (animation.width, animation.height))
 
-    for i in range(start, end+1):
-        _log_frame(format, i, end)
-        file = io.BytesIO()
-        export_png(animation, file, i)
-        file.seek(0)
-        video.write(cv2.cvtColor(numpy.array(Image.open(file)), cv2.COLOR_RGB2BGR))
+    shape = (animation.height, animation.width, 4)
+    # Dropping alpha from premultiplied pixels composites them on black
+    for frame in _convert_frames(
+        _render_frames(format, animation, range(start, end+1), workers=workers, dedupe=dedupe),
+        lambda data: numpy.ascontiguousarray(numpy.frombuffer(data, numpy.uint8).reshape(shape)[:, :, :3])
+    ):
+        video.write(frame)
 
-    _log_frame(format)
     video.release()
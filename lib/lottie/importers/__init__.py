@@ -1,13 +1,19 @@
-from . import base, core, sif, svg
+import importlib
+
+from . import base
 from .base import importers
 
+## Modules that are only available with optional dependencies installed
+_optional = ["raster"]
+
 __all__ = [
     "base", "core", "sif", "svg",
     "importers",
 ]
 
-try:
-    from . import raster
-    __all__ += ["raster"]
-except ImportError:
-    pass
+
+def __getattr__(name):
+    # Modules are imported on first access, so using one importer doesn't load the dependencies of all of them
+    if name in __all__ or name in _optional:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,19 +1,15 @@
-import json
 import zipfile
 
-from .base import importer
-from ..parsers.baseporter import ExtraOption
 from ..parsers.tgs import parse_tgs
 from ..objects import Animation, assets
+from ..utils import json_backend
 
 
-@importer("dotLottie Archive", ["lottie"], [
-    ExtraOption("id", help="ID of the animation to extract", default=None)
-], slug="dotlottie")
 def import_dotlottie(file, id=None):
+    backend = json_backend.get_backend()
     with zipfile.ZipFile(file) as zf:
         with zf.open("manifest.json") as manifest:
-            meta = json.load(manifest)
+            meta = backend.load(manifest)
 
         if id is None:
             id = meta["animations"][0]["id"]
@@ -21,7 +17,7 @@ def import_dotlottie(file, id=None):
         info = zf.getinfo("animations/%s.json" % id)
 
         with zf.open(info) as animfile:
-            an = Animation.load(json.load(animfile))
+            an = Animation.load(backend.load(animfile))
             if an.assets:
                 for asset in an.assets:
                     if isinstance(asset, assets.Image) and not asset.is_embedded:
@@ -2,7 +2,6 @@ import zipfile
 import warnings
 from xml.etree import ElementTree
 
-from .base import importer
 from ..parsers.svg.importer import SvgParser
 from .. import objects
 
@@ -34,7 +33,6 @@ def _import_layers(zf, animation, xml_parent, svg_parser, parent):
         layer.parent = parent
 
 
-@importer("Krita", ["kra"])
 def import_krita(file):
     with zipfile.ZipFile(file) as zf:
         with zf.open("maindoc.xml") as main:
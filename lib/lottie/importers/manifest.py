@@ -0,0 +1,73 @@
+"""!
+Importers available in this package
+
+They are declared here so they can be listed (eg: for command line options)
+without importing their modules and the libraries those depend on.
+"""
+from ..parsers.baseporter import LazyBaseporter, ExtraOption, module_available
+
+
+def parse_color(color):
+    from ..parsers.svg.importer import parse_color
+    return parse_color(color)
+
+
+_trace = all(map(module_available, ["potrace", "numpy", "scipy"]))
+
+
+## Importers in order of preference when picking one from a file extension
+manifest = [
+    LazyBaseporter("core", "import_tgs", "Lottie JSON / Telegram Sticker", ["json", "tgs"], slug="lottie"),
+
+    LazyBaseporter("sif", "import_sif", "Synfig", ["sif", "sifz"]),
+
+    LazyBaseporter("svg", "import_svg", "SVG", ["svg", "svgz"], [
+        ExtraOption(
+            "layer_frames", type=int, default=0,
+            help="If greater than 0, treats every layer in the SVG as a different animation frame,\n"
+            "greater values increase the time each frames lasts for."),
+        ExtraOption("n_frames", type=int, default=60),
+        ExtraOption("framerate", type=int, default=60),
+    ]),
+
+    LazyBaseporter("dot_lottie", "import_dotlottie", "dotLottie Archive", ["lottie"], [
+        ExtraOption("id", help="ID of the animation to extract", default=None)
+    ], slug="dotlottie"),
+
+    LazyBaseporter("krita", "import_krita", "Krita", ["kra"]),
+
+    LazyBaseporter("raster", "import_raster", "Raster image", ["bmp", "png", "gif", "webp", "tiff"], [
+        ExtraOption("n_colors", type=int, default=1, help="Number of colors to quantize"),
+        ExtraOption("palette", type=parse_color, default=[], nargs="+", help="Custom palette"),
+        ExtraOption(
+            "mode",
+            default="embed",
+            choices=["external", "embed", "pixel", "polygon"] + (["trace"] if _trace else []),
+            help="Vectorization mode:\n" +
+            " * external : load images as linked assets\n" +
+            " * embed    : load images as embedded assets\n" +
+            " * pixel    : Vectorize the image into rectangles\n" +
+            " * polygon  : Vectorize the image into polygonal shapes\n" +
+            "              Looks the same as pixel, but a single shape per color\n" +
+            " * trace    : (if available) Use potrace to vectorize\n"
+        ),
+        ExtraOption("frame_delay", type=int, default=4, help="Number of frames to skip between images"),
+        ExtraOption("framerate", type=int, default=60, help="Frames per second"),
+        ExtraOption("frame_files", nargs="+", default=[], help="Additional frames to import"),
+        ExtraOption(
+            "color_mode",
+            default="nearest",
+            choices=["nearest", "exact"],
+            help="How to quantize colors.\n" +
+                 " * nearest    will map each color to the most similar in the palette\n" +
+                 " * exact      will only match exact colors"
+        ),
+        ExtraOption(
+            "embed_format",
+            default=None,
+            help="Format to store images internally when using `embed` mode"
+        ),
+    ], requires=["PIL"]),
+
+    LazyBaseporter("script", "import_python_script", "Python script", ["py"]),
+]
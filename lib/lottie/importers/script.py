@@ -1,11 +1,9 @@
-import json
 import tempfile
 import subprocess
-from .base import importer
 from ..objects import Animation
+from ..utils import json_backend
 
 
-@importer("Python script", ["py"])
 def import_python_script(file, *a, **kw):
 
     out = subprocess.check_output(["python", file, "--version"])
@@ -13,4 +11,4 @@ def import_python_script(file, *a, **kw):
         raise Exception("Not a valid script")
 
     data = subprocess.check_output(["python", file, "--path", "", "--name", "-", "--format", "json"])
-    return Animation.load(json.loads(data))
+    return Animation.load(json_backend.get_backend().loads(data))
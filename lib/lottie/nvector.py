@@ -6,10 +6,27 @@ def vop(op, a, b):
     return list(map(op, a, b))
 
 
+_new_nvector = object.__new__
+
+
 class NVector():
+    __slots__ = ("components",)
+
     def __init__(self, *components):
         self.components = list(components)
 
+    def _new(self, components):
+        """!
+        Returns a vector of the same type as `self` holding the list @p components
+
+        Plain NVector instances skip the constructor as it'd copy the list again
+        """
+        if type(self) is NVector:
+            vec = _new_nvector(NVector)
+            vec.components = components
+            return vec
+        return type(self)(*components)
+
     def __str__(self):
         return str(self.components)
 
@@ -19,22 +36,43 @@ class NVector():
     def __len__(self):
         return len(self.components)
 
+    def __iter__(self):
+        return iter(self.components)
+
     def to_list(self):
         return list(self.components)
 
     def __add__(self, other):
-        return type(self)(*vop(operator.add, self.components, other.components))
+        a = self.components
+        b = other.components
+        if len(a) == 2 and len(b) == 2:
+            return self._new([a[0] + b[0], a[1] + b[1]])
+        elif len(a) == 4 and len(b) == 4:
+            return self._new([a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3]])
+        return self._new(vop(operator.add, a, b))
 
     def __sub__(self, other):
-        return type(self)(*vop(operator.sub, self.components, other.components))
+        a = self.components
+        b = other.components
+        if len(a) == 2 and len(b) == 2:
+            return self._new([a[0] - b[0], a[1] - b[1]])
+        elif len(a) == 4 and len(b) == 4:
+            return self._new([a[0] - b[0], a[1] - b[1], a[2] - b[2], a[3] - b[3]])
+        return self._new(vop(operator.sub, a, b))
 
     def __mul__(self, scalar):
         if isinstance(scalar, NVector):
-            return type(self)(*vop(operator.mul, self.components, scalar.components))
-        return type(self)(*(c * scalar for c in self.components))
+            return self._new(vop(operator.mul, self.components, scalar.components))
+        a = self.components
+        if len(a) == 2:
+            return self._new([a[0] * scalar, a[1] * scalar])
+        return self._new([c * scalar for c in a])
 
     def __truediv__(self, scalar):
-        return type(self)(*(c / scalar for c in self.components))
+        a = self.components
+        if len(a) == 2:
+            return self._new([a[0] / scalar, a[1] / scalar])
+        return self._new([c / scalar for c in a])
 
     def __iadd__(self, other):
         self.components = vop(operator.add, self.components, other.components)
@@ -56,7 +94,7 @@ class NVector():
         return self
 
     def __neg__(self):
-        return type(self)(*(-c for c in self.components))
+        return self._new([-c for c in self.components])
 
     def __getitem__(self, key):
         if isinstance(key, slice):
@@ -70,11 +108,14 @@ class NVector():
         return self.components == other.components
 
     def __abs__(self):
-        return type(self)(*(abs(c) for c in self.components))
+        return self._new([abs(c) for c in self.components])
 
     @property
     def length(self):
-        return math.sqrt(sum(map(lambda x: x**2, self.components)))
+        a = self.components
+        if len(a) == 2:
+            return math.sqrt(a[0] ** 2 + a[1] ** 2)
+        return math.sqrt(sum(map(lambda x: x**2, a)))
 
     def dot(self, other):
         return sum(map(operator.mul, self.components, other.components))
@@ -83,7 +124,14 @@ class NVector():
         return NVector(*self.components)
 
     def lerp(self, other, t):
-        return self * (1-t) + other * t
+        a = self.components
+        b = other.components
+        u = 1 - t
+        if len(a) == 2 and len(b) == 2:
+            return self._new([a[0] * u + b[0] * t, a[1] * u + b[1] * t])
+        elif len(a) == 4 and len(b) == 4:
+            return self._new([a[0] * u + b[0] * t, a[1] * u + b[1] * t, a[2] * u + b[2] * t, a[3] * u + b[3] * t])
+        return self._new([x * u + y * t for x, y in zip(a, b)])
 
     @property
     def x(self):
@@ -110,7 +158,7 @@ class NVector():
         self.components[2] = v
 
     def element_scaled(self, other):
-        return type(self)(*vop(operator.mul, self.components, other.components))
+        return self._new(vop(operator.mul, self.components, other.components))
 
     def cross(self, other):
         """
@@ -1,5 +1,6 @@
 import enum
 import inspect
+import operator
 import importlib
 from ..nvector import NVector
 from ..utils.color import Color
@@ -152,6 +153,74 @@ class LottieProp:
             )))
         return self._load_scalar(lottieval)
 
+    def is_object(self):
+        """!
+        Whether the values of this property are LottieObject instances (or lists of them)
+        """
+        return inspect.isclass(self.type) and issubclass(self.type, LottieObject)
+
+    def compile_loader(self, lazy=False):
+        """!
+        Builds a function equivalent to load() with the type dispatch resolved in advance
+        @param lazy Whether child objects are loaded lazily, see LottieObject.load()
+        @returns A callable taking a JSON value and returning its Python equivalent
+        """
+        load_scalar = self._compile_scalar_loader(lazy)
+        if self.list is PseudoList:
+            def load(lottieval):
+                if isinstance(lottieval, list):
+                    return load_scalar(lottieval[0])
+                return load_scalar(lottieval)
+            return load
+        elif self.list is True:
+            def load(lottieval):
+                if lottieval is None:
+                    return None
+                return [v for v in map(load_scalar, lottieval) if v is not None]
+            return load
+        return load_scalar
+
+    def _compile_scalar_loader(self, lazy):
+        ptype = self.type
+
+        if lazy and self.is_object():
+            type_load = ptype.load
+
+            def load_scalar(lottieval):
+                if lottieval is None:
+                    return None
+                return type_load(lottieval, True)
+        elif inspect.isclass(ptype) and issubclass(ptype, LottieBase):
+            type_load = ptype.load
+
+            def load_scalar(lottieval):
+                if lottieval is None:
+                    return None
+                return type_load(lottieval)
+        elif ptype is NVector or ptype is Color:
+            def load_scalar(lottieval):
+                if lottieval is None or isinstance(lottieval, ptype):
+                    return lottieval
+                return ptype(*lottieval)
+        elif isinstance(ptype, type):
+            def load_scalar(lottieval):
+                if lottieval is None or isinstance(lottieval, ptype):
+                    return lottieval
+                if isinstance(lottieval, list) and lottieval:
+                    lottieval = lottieval[0]
+                return ptype(lottieval)
+        elif isinstance(ptype, LottieValueConverter):
+            lottie_to_py = ptype.lottie_to_py
+
+            def load_scalar(lottieval):
+                if lottieval is None:
+                    return None
+                return lottie_to_py(lottieval)
+        else:
+            load_scalar = self._load_scalar
+
+        return load_scalar
+
     def _load_scalar(self, lottieval):
         if lottieval is None:
             return None
@@ -182,21 +251,25 @@ class LottieProp:
             val = self._basic_to_dict(self.type.py_to_lottie(val))
         return val
 
+    def compile_to_dict(self):
+        """!
+        Builds a function equivalent to to_dict() that takes the property value rather than the object
+        @returns A callable taking the (non-None) Python value and returning its JSON equivalent
+        """
+        if self.list is PseudoList:
+            def to_dict(val):
+                return [_value_to_dict(val)]
+            return to_dict
+        elif isinstance(self.type, LottieValueConverter):
+            py_to_lottie = self.type.py_to_lottie
+
+            def to_dict(val):
+                return _value_to_dict(py_to_lottie(_value_to_dict(val)))
+            return to_dict
+        return _value_to_dict
+
     def _basic_to_dict(self, v):
-        if isinstance(v, LottieBase):
-            return v.to_dict()
-        elif isinstance(v, NVector):
-            return list(map(self._basic_to_dict, v.components))
-        elif isinstance(v, list):
-            return list(map(self._basic_to_dict, v))
-        elif isinstance(v, (int, str, bool)):
-            return v
-        elif isinstance(v, float):
-            if v % 1 == 0:
-                return int(v)
-            return v #round(v, 3)
-        else:
-            raise Exception("Unknown value %r" % v)
+        return _value_to_dict(v)
 
     def __repr__(self):
         return "<LottieProp %s:%s>" % (self.name, self.lottie)
@@ -211,6 +284,61 @@ class LottieProp:
         raise Exception("Could not convert %r" % value)
 
 
+def _float_to_dict(v):
+    if v % 1 == 0:
+        return int(v)
+    return v #round(v, 3)
+
+
+def _nvector_to_dict(v):
+    return [
+        (int(c) if c % 1 == 0 else c) if c.__class__ is float else _value_to_dict(c)
+        for c in v.components
+    ]
+
+
+def _list_to_dict(v):
+    return [_value_to_dict(c) for c in v]
+
+
+def _plain_to_dict(v):
+    return v
+
+
+## Maps value classes to the function converting them to JSON, filled on demand by _value_to_dict
+_value_to_dict_dispatch = {
+    float: _float_to_dict,
+    int: _plain_to_dict,
+    str: _plain_to_dict,
+    bool: _plain_to_dict,
+    list: _list_to_dict,
+    NVector: _nvector_to_dict,
+}
+
+
+def _value_to_dict(v):
+    """!
+    Converts a property value into a JSON value, resolving the conversion once per value class
+    """
+    func = _value_to_dict_dispatch.get(v.__class__)
+    if func is None:
+        cls = v.__class__
+        if isinstance(v, LottieBase):
+            func = operator.methodcaller("to_dict")
+        elif isinstance(v, NVector):
+            func = _nvector_to_dict
+        elif isinstance(v, list):
+            func = _list_to_dict
+        elif isinstance(v, (int, str, bool)):
+            func = _plain_to_dict
+        elif isinstance(v, float):
+            func = _float_to_dict
+        else:
+            raise Exception("Unknown value %r" % v)
+        _value_to_dict_dispatch[cls] = func
+    return func(v)
+
+
 class LottieObjectMeta(type):
     def __new__(cls, name, bases, attr):
         props = []
@@ -218,32 +346,121 @@ class LottieObjectMeta(type):
             if type(base) == cls:
                 props += base._props
         attr["_props"] = props + attr.get("_props", [])
+        attr["_loader"] = None
+        attr["_lazy_loader"] = None
+        attr["_serializer"] = None
         return super().__new__(cls, name, bases, attr)
 
+    def _prop_loader(cls, lazy=False):
+        """!
+        Returns a function that loads all properties from a Lottie dict into an instance of this class
+
+        It's built on first use, so @p _props must not change after objects have been loaded
+        @param lazy Whether properties holding objects are kept as JSON until they are accessed
+        """
+        if lazy:
+            if cls._lazy_loader is None:
+                cls._lazy_loader = cls._compile_prop_loader(True)
+            return cls._lazy_loader
+
+        if cls._loader is None:
+            cls._loader = cls._compile_prop_loader()
+        return cls._loader
+
+    def _compile_prop_loader(cls, lazy=False):
+        steps = []
+        for prop in cls._props:
+            if type(prop) is not LottieProp:
+                steps.append((None, None, None, prop.load_into, False))
+            elif not isinstance(getattr(cls, prop.name, None), property):
+                deferred = lazy and prop.is_object()
+                steps.append((prop.lottie, prop.cond, prop.name, prop.compile_loader(lazy), deferred))
+
+        def load_props(lottiedict, obj):
+            for lottie, cond, name, load, deferred in steps:
+                if lottie is None:
+                    load(lottiedict, obj)
+                elif cond is not None and not cond(lottiedict):
+                    continue
+                elif lottie not in lottiedict:
+                    setattr(obj, name, None)
+                elif deferred:
+                    # Loaded by LottieObject.__getattr__ on first access
+                    obj.__dict__.pop(name, None)
+                    obj.__dict__.setdefault("_lazy_props", {})[name] = (load, lottiedict[lottie])
+                else:
+                    setattr(obj, name, load(lottiedict[lottie]))
+
+        return load_props
+
+    def _prop_serializer(cls):
+        """!
+        Returns a function that serializes the properties of an instance of this class into a Lottie dict
+
+        Like _prop_loader(), it's built on first use
+        """
+        if cls._serializer is None:
+            cls._serializer = cls._compile_prop_serializer()
+        return cls._serializer
+
+    def _compile_prop_serializer(cls):
+        steps = []
+        for prop in cls._props:
+            if type(prop) is not LottieProp:
+                # Custom properties might need the whole object so the "value" passed along is the object itself
+                def get(obj, prop=prop):
+                    return None if prop.get(obj) is None else obj
+                steps.append((get, prop.lottie, prop.to_dict))
+            else:
+                steps.append((operator.attrgetter(prop.name), prop.lottie, prop.compile_to_dict()))
+
+        def to_dict(obj):
+            lottiedict = {}
+            for get, lottie, val_to_dict in steps:
+                val = get(obj)
+                if val is not None:
+                    lottiedict[lottie] = val_to_dict(val)
+            return lottiedict
+
+        return to_dict
+
 
 class LottieObject(LottieBase, metaclass=LottieObjectMeta):
     """!
     @brief Base class for mapping Python classes into Lottie JSON objects
     """
     def to_dict(self):
-        return {
-            prop.lottie: prop.to_dict(self)
-            for prop in self._props
-            if prop.get(self) is not None
-        }
+        return type(self)._prop_serializer()(self)
 
     @classmethod
-    def load(cls, lottiedict):
+    def load(cls, lottiedict, lazy=False):
+        """!
+        Loads from a JSON object
+        @param lottiedict JSON object
+        @param lazy       If @c True, properties holding child objects (layers, shapes, keyframes, assets...)
+                          are kept as JSON and only converted the first time they are accessed.
+                          Useful when only a few values are needed from a large file.
+        @returns An instance of the class
+        """
         if "__pyclass" in lottiedict:
             return CustomObject.load(lottiedict)
         if not lottiedict:
             return None
         cls = cls._load_get_class(lottiedict)
         obj = cls()
-        for prop in cls._props:
-            prop.load_into(lottiedict, obj)
+        cls._prop_loader(lazy)(lottiedict, obj)
         return obj
 
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, ie: for properties not loaded yet
+        lazy_props = self.__dict__.get("_lazy_props")
+        if lazy_props and name in lazy_props:
+            load, lottieval = lazy_props.pop(name)
+            value = load(lottieval)
+            setattr(self, name, value)
+            return value
+        raise AttributeError("%r object has no attribute %r" % (type(self).__name__, name))
+
     @classmethod
     def _load_get_class(cls, lottiedict):
         return cls
@@ -325,14 +542,13 @@ class CustomObject(LottieObject):
         self.wrapped = self.wrapped_lottie()
 
     @classmethod
-    def load(cls, lottiedict):
+    def load(cls, lottiedict, lazy=False):
         ld = lottiedict.copy()
         classname = ld.pop("__pyclass")
         modn, clsn = classname.rsplit(".", 1)
         subcls = getattr(importlib.import_module(modn), clsn)
         obj = subcls()
-        for prop in subcls._props:
-            prop.load_into(lottiedict, obj)
+        subcls._prop_loader()(lottiedict, obj)
         obj.wrapped = subcls.wrapped_lottie.load(ld)
         return obj
 
@@ -31,8 +31,8 @@ class Composition(LottieObject):
         return self.insert_layer(len(self.layers), layer)
 
     @classmethod
-    def load(cls, lottiedict):
-        obj = super().load(lottiedict)
+    def load(cls, lottiedict, lazy=False):
+        obj = super().load(lottiedict, lazy)
         obj._fixup()
         return obj
 
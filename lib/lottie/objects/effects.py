@@ -102,9 +102,10 @@ class Effect(LottieObject):
         return values
 
     def __getattr__(self, key):
-        for i, (name, type) in enumerate(self._effects):
-            if name == key:
-                return self.effects[i].value
+        if key != "effects":
+            for i, (name, type) in enumerate(self._effects):
+                if name == key:
+                    return self.effects[i].value
         return super().__getattr__(key)
 
     def __str__(self):
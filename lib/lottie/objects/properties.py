@@ -1,4 +1,6 @@
 import math
+import bisect
+import functools
 from functools import reduce
 from .base import LottieObject, LottieProp, PseudoList, PseudoBool
 from . import easing
@@ -19,11 +21,21 @@ class KeyframeBezier:
         self.h1 = h1
         self.h2 = h2
         self._sample_values = None
+        self._x_coefficients = None
 
     @classmethod
     def from_keyframe(cls, keyframe):
         return cls(keyframe.out_value, keyframe.in_value)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def shared(h1x, h1y, h2x, h2y):
+        """!
+        Returns a solver for the given handle coordinates, shared with all the other callers using the same values
+        @note The returned object must not be modified
+        """
+        return KeyframeBezier(NVector(h1x, h1y), NVector(h2x, h2y))
+
     def bezier(self):
         bez = Bezier()
         bez.add_point(NVector(0, 0), outp=NVector(self.h1.x, self.h1.y))
@@ -73,14 +85,25 @@ class KeyframeBezier:
         return t
 
     def _newton_raphson(self, x, t_guess):
+        a, b, c = self._get_x_coefficients()
         for i in range(self.NEWTON_ITERATIONS):
-            slope = self._slope_component(t_guess, self.h1.x, self.h2.x)
+            slope = 3 * a * t_guess * t_guess + 2 * b * t_guess + c
             if slope == 0:
                 return t_guess
-            current_x = self._bezier_component(t_guess, self.h1.x, self.h2.x) - x
+            current_x = ((a * t_guess + b) * t_guess + c) * t_guess - x
             t_guess -= current_x / slope
         return t_guess
 
+    def _get_x_coefficients(self):
+        """!
+        Polynomial coefficients for the x component, cached like the sample values
+        """
+        if self._x_coefficients is None:
+            c1 = self.h1.x
+            c2 = self.h2.x
+            self._x_coefficients = (self._a(c1, c2), self._b(c1, c2), self._c(c1))
+        return self._x_coefficients
+
     def _get_sample_values(self):
         if self._sample_values is None:
             self._sample_values = [
@@ -101,7 +124,8 @@ class KeyframeBezier:
 
         dist = (x - sample_values[current_sample]) / (sample_values[current_sample+1] - sample_values[current_sample])
         t_guess = interval_start + dist * self.SAMPLE_STEP_SIZE
-        initial_slope = self._slope_component(t_guess, self.h1.x, self.h2.x)
+        a, b, c = self._get_x_coefficients()
+        initial_slope = 3 * a * t_guess * t_guess + 2 * b * t_guess + c
         if initial_slope >= self.NEWTON_MIN_SLOPE:
             return self._newton_raphson(x, t_guess)
         if initial_slope == 0:
@@ -135,6 +159,7 @@ class Keyframe(LottieObject):
         self.out_value = None
         ## Jump to the end value
         self.jump = None
+        self._bezier_cache = None
 
         if easing_function:
             easing_function(self)
@@ -149,8 +174,25 @@ class Keyframe(LottieObject):
         else:
             return KeyframeBezier.from_keyframe(self).bezier()
 
+    def easing_bezier(self):
+        """!
+        Returns the KeyframeBezier solving the easing curve for this keyframe
+
+        The solver is kept until the handle values change and shared between keyframes with the same handles
+        """
+        key = (self.out_value.x, self.out_value.y, self.in_value.x, self.in_value.y)
+        cache = self._bezier_cache
+        if cache is None or cache[0] != key:
+            try:
+                solver = KeyframeBezier.shared(*key)
+            except TypeError:
+                # Unhashable handle values
+                solver = KeyframeBezier.from_keyframe(self)
+            cache = self._bezier_cache = (key, solver)
+        return cache[1]
+
     def lerp_factor(self, ratio):
-        return KeyframeBezier.from_keyframe(self).y_at_x(ratio)
+        return self.easing_bezier().y_at_x(ratio)
 
     def __str__(self):
         return "%s %s" % (self.time, self.start)
@@ -240,6 +282,9 @@ class AnimatableMixin:
         self.animated = False
         ## Keyframe list
         self.keyframes = None
+        self._keyframe_index_cache = None
+        ## Per-frame values from lottie.utils.bake
+        self._baked = None
 
     def clear_animation(self, value):
         """!
@@ -248,6 +293,8 @@ class AnimatableMixin:
         self.value = value
         self.animated = False
         self.keyframes = None
+        self._keyframe_index_cache = None
+        self._baked = None
 
     def add_keyframe(self, time, value, interp=easing.Linear(), *args, **kwargs):
         """!
@@ -258,6 +305,8 @@ class AnimatableMixin:
         @param kwargs   Extra arguments to pass the keyframe constructor
         @note Always call add_keyframe with increasing @p time value
         """
+        self._keyframe_index_cache = None
+        self._baked = None
         if not self.animated:
             self.value = None
             self.keyframes = []
@@ -289,28 +338,92 @@ class AnimatableMixin:
         if not self.keyframes:
             return None
 
+        if self._baked is not None:
+            value = self._baked.get(time)
+            if value is not None:
+                return value
+
         return self._get_value_helper(time)[0]
 
+    def sample(self, times):
+        """!
+        @brief Returns the values of the property at all the given frames/times
+
+        This is equivalent to calling get_value() for each time but it's vectorized with numpy
+        @see lottie.utils.sampling.sample() for the layout of the returned array
+        @note requires numpy
+        """
+        from ..utils import sampling
+        return sampling.sample(self, times)
+
+    def _keyframe_index(self, time):
+        """!
+        Returns the index of the first keyframe whose time is not before @p time (or the number of keyframes)
+
+        Keyframe times are cached and looked up with a binary search, the cache is refreshed
+        when the keyframe list is replaced or changes size.
+        If you change the time of existing keyframes, call invalidate_keyframe_cache()
+        """
+        keyframes = self.keyframes
+        cache = self._keyframe_index_cache
+        if cache is None or cache[0] is not keyframes or cache[1] != len(keyframes):
+            times = [kf.time for kf in keyframes]
+            try:
+                if any(b < a for a, b in zip(times, times[1:])):
+                    times = None
+            except TypeError:
+                times = None
+            cache = self._keyframe_index_cache = (keyframes, len(keyframes), times)
+
+        times = cache[2]
+        if times is not None:
+            return bisect.bisect_left(times, time)
+
+        # Unsorted keyframes, keep the original linear behaviour
+        for i, kf in enumerate(keyframes):
+            if time - kf.time <= 0:
+                return i
+        return len(keyframes)
+
+    def invalidate_keyframe_cache(self):
+        """!
+        Discards cached keyframe data, needed after changing keyframes in place
+        """
+        self._keyframe_index_cache = None
+        self._baked = None
+
+    def _value_before(self, index):
+        """!
+        Returns the value held at the end of the keyframes preceding @p index
+
+        Walks back from @p index without copying the list, usually stopping at the previous keyframe
+        """
+        keyframes = self.keyframes
+        for i in range(index - 1, -1, -1):
+            if keyframes[i].end is not None:
+                return keyframes[i].end
+        return keyframes[0].start
+
     def _get_value_helper(self, time):
-        val = self.keyframes[0].start
-        for i in range(len(self.keyframes)):
-            k = self.keyframes[i]
-            if time - k.time <= 0:
-                if k.start is not None:
-                    val = k.start
-
-                kp = self.keyframes[i-1] if i > 0 else None
-                if kp:
-                    t = (time - kp.time) / (k.time - kp.time)
-                    end = kp.end
-                    if end is None:
-                        end = val
-                    if end is not None:
-                        val = kp.interpolated_value(t, end)
-                    return val, end, kp, t
-                return val, None, None, None
-            if k.end is not None:
-                val = k.end
+        keyframes = self.keyframes
+        i = self._keyframe_index(time)
+        if i == len(keyframes):
+            return self._value_before(i), None, None, None
+
+        k = keyframes[i]
+        val = k.start
+        if val is None:
+            val = self._value_before(i)
+
+        if i > 0:
+            kp = keyframes[i-1]
+            t = (time - kp.time) / (k.time - kp.time)
+            end = kp.end
+            if end is None:
+                end = val
+            if end is not None:
+                val = kp.interpolated_value(t, end)
+            return val, end, kp, t
         return val, None, None, None
 
     def to_dict(self):
@@ -360,8 +473,8 @@ class AnimatableMixin:
         return new_kframes
 
     @classmethod
-    def load(cls, lottiedict):
-        obj = super().load(lottiedict)
+    def load(cls, lottiedict, lazy=False):
+        obj = super().load(lottiedict, lazy)
         if "a" not in lottiedict:
             obj.animated = prop_animated(lottiedict)
         return obj
@@ -421,8 +534,8 @@ class PositionValue(MultiDimensional):
     ]
 
     @classmethod
-    def load(cls, lottiedict):
-        obj = super().load(lottiedict)
+    def load(cls, lottiedict, lazy=False):
+        obj = super().load(lottiedict, lazy)
         if lottiedict.get("s", False):
             cls._load_split(lottiedict, obj)
 
@@ -477,8 +477,8 @@ class Group(ShapeElement):
         return shape
 
     @classmethod
-    def load(cls, lottiedict):
-        object = ShapeElement.load(lottiedict)
+    def load(cls, lottiedict, lazy=False):
+        object = ShapeElement.load(lottiedict, lazy)
 
         shapes = []
         transform = None
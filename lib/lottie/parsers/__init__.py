@@ -1,2 +1,10 @@
-from . import svg, tgs, sif
+import importlib
+
 __all__ = ["svg", "tgs", "sif"]
+
+
+def __getattr__(name):
+    # Parsers are imported on first access, as some of them are rather heavy
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
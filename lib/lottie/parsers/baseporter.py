@@ -3,6 +3,7 @@ import os
 import pkgutil
 import argparse
 import importlib
+import importlib.util
 
 
 class Baseporter:
@@ -29,6 +30,54 @@ class Baseporter:
         return o_options
 
 
+def module_available(name):
+    """!
+    Whether the top level module @p name can be imported, without importing it
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyBaseporter(Baseporter):
+    """!
+    Baseporter declared in a manifest, the module implementing it is only imported when it's used
+    """
+    def __init__(self, module, function, name, extensions, extra_options=[], generic_options=set(), slug=None,
+                 requires=[]):
+        super().__init__(name, extensions, None, extra_options, generic_options, slug)
+        ## Name of the module with the implementation, relative to the package of the loader
+        self.module = module
+        ## Name of the function in @p module
+        self.function = function
+        ## Top level modules needed by @p module, a tuple means any of them will do
+        self.requires = requires
+        ## Package @p module is relative to, set by the loader
+        self.package = None
+
+    @property
+    def callback(self):
+        if self._callback is None:
+            module = importlib.import_module("." + self.module, self.package)
+            self._callback = getattr(module, self.function)
+        return self._callback
+
+    @callback.setter
+    def callback(self, value):
+        self._callback = value
+
+    def missing_requirement(self):
+        """!
+        Returns the name of a required module that isn't installed, or None if they are all available
+        """
+        for requirement in self.requires:
+            alternatives = requirement if isinstance(requirement, tuple) else (requirement,)
+            if not any(map(module_available, alternatives)):
+                return alternatives[0]
+        return None
+
+
 class ExtraOption:
     def __init__(self, name, **kwargs):
         self.name = name
@@ -56,19 +105,48 @@ def _add_options(parser, ie, object):
 
 
 class Loader:
-    def __init__(self, module_path, module_name, ie):
+    """!
+    Registry of importers or exporters
+
+    Those listed in the manifest module of the package are available without importing
+    their implementation, other modules in the package are imported to find the ones
+    registered with decorator().
+    """
+    def __init__(self, module_path, module_name, ie, manifest="manifest"):
         self._loaded = False
         self._registry = {}
         self._module_path = os.path.dirname(module_path)
         self._module_name = module_name.replace(".base", "")
         self._ie = ie
         self._failed = {}
+        self._manifest = manifest
+
+    def load_manifest(self):
+        """!
+        Registers the entries in the manifest
+        @returns The names of the modules covered by the manifest
+        """
+        if not self._manifest:
+            return set()
+
+        manifest = importlib.import_module("." + self._manifest, self._module_name)
+        modules = {self._manifest, *getattr(manifest, "other_modules", [])}
+        for porter in manifest.manifest:
+            porter.package = self._module_name
+            modules.add(porter.module)
+            missing = porter.missing_requirement()
+            if missing:
+                self._failed[porter.module] = missing
+            else:
+                self._registry.setdefault(porter.slug, porter)
+        return modules
 
     def load_modules(self):
         self._loaded = True
+        declared = self.load_manifest()
 
         for _, modname, _ in pkgutil.iter_modules([self._module_path]):
-            if modname == "base":
+            if modname == "base" or modname in declared:
                 continue
 
             full_modname = "." + modname
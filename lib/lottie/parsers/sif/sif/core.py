@@ -30,6 +30,13 @@ class ObjectRegistry:
         return self.registry[guid]
 
 
+class GuidVector(NVector):
+    """!
+    Vector referenced by guid from other nodes of the sif document
+    """
+    __slots__ = ("guid",)
+
+
 def noop(x):
     return x
 
@@ -88,13 +95,14 @@ class TypeDescriptor:
         if guid and guid in registry.registry:
             value = registry.registry[guid]
         elif self.typename == "vector":
-            value = NVector(
-                float(xml_text(xml.getElementsByTagName("x")[0])),
-                float(xml_text(xml.getElementsByTagName("y")[0]))
-            )
-            if xml.getAttribute("guid"):
-                value.guid = xml.getAttribute("guid")
+            x = float(xml_text(xml.getElementsByTagName("x")[0]))
+            y = float(xml_text(xml.getElementsByTagName("y")[0]))
+            if guid:
+                value = GuidVector(x, y)
+                value.guid = guid
                 registry.register(value)
+            else:
+                value = NVector(x, y)
         elif self.typename == "color":
             value = NVector(
                 float(xml_text(xml.getElementsByTagName("r")[0])),
@@ -1,3 +1,3 @@
 from .importer import parse_svg_etree, parse_svg_file
-from . import builder, importer
-__all__ = ["builder", "importer", "parse_svg_etree", "parse_svg_file"]
+from . import builder, importer, smil
+__all__ = ["builder", "importer", "smil", "parse_svg_etree", "parse_svg_file"]
@@ -6,6 +6,7 @@ from .handler import SvgHandler, NameMode
 from ... import objects
 from ...nvector import NVector
 from ...utils import restructure
+from ...utils.restructure import PrecompTime
 from ...utils.transform import TransformMatrix
 try:
     from ...utils import font
@@ -14,20 +15,7 @@ except ImportError:
     has_font = False
 
 
-class PrecompTime:
-    def __init__(self, pcl: objects.PreCompLayer):
-        self.pcl = pcl
-
-    def get_time_offset(self, time, lot):
-        remap = time
-        if self.pcl.time_remapping:
-            remapf = self.pcl.time_remapping.get_value(time)
-            remap = lot.in_point * (1-remapf) + lot.out_point * remapf
-
-        return remap - self.pcl.start_time
-
-
-class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
+class SvgBuilder(SvgHandler, restructure.FrameBuilder):
     merge_paths = True
     namestart = (
         r":_A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\u02FF\u0370-\u037D\u037F-\u1FFF" +
@@ -49,16 +37,9 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         self.precomp_times = []
         self._precomps = {}
         self._assets = {}
+        self._matte_ids = {}
         self._current_layer = []
 
-    @property
-    def time(self):
-        time = self.actual_time
-        if self.precomp_times:
-            for pct in self.precomp_times:
-                time = pct.get_time_offset(time, self._current_layer[-1])
-        return time
-
     def gen_id(self, prefix="id"):
         while True:
             self.idc += 1
@@ -120,16 +101,24 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         svgmask.attrib["id"] = mask_id
         svgmask.attrib["mask-type"] = "alpha"
         path = ElementTree.SubElement(svgmask, "path")
+        self._update_mask_path(path, mask)
+        return mask_id
+
+    def _update_mask_path(self, path, mask):
         path.attrib["d"] = self._bezier_to_d(mask.shape.get_value(self.time))
         path.attrib["fill"] = "#fff"
         path.attrib["fill-opacity"] = str(mask.opacity.get_value(self.time) / 100)
-        return mask_id
+
+    def _matte_id(self, layer_builder):
+        # The restructured layers are shared between builders, so ids are stored here
+        matte_id = self._matte_ids.get(id(layer_builder))
+        if not matte_id:
+            matte_id = self._matte_ids[id(layer_builder)] = self.gen_id()
+        return matte_id
 
     def _matte_source_to_def(self, layer_builder):
         svgmask = ElementTree.SubElement(self.defs, "mask")
-        if not layer_builder.matte_id:
-            layer_builder.matte_id = self.gen_id()
-        svgmask.attrib["id"] = layer_builder.matte_id
+        svgmask.attrib["id"] = self._matte_id(layer_builder)
         matte_mode = layer_builder.matte_target.lottie.matte_mode
 
         mask_type = "alpha"
@@ -161,7 +150,7 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         lot = layer_builder.lottie
         self._current_layer.append(lot)
 
-        if not self.precomp_times and (lot.in_point > self.time or lot.out_point < self.time):
+        if not self._layer_visible(lot):
             self._current_layer.pop()
             return None
 
@@ -173,10 +162,7 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         if lot.masks:
             g.attrib["mask"] = "url(#%s)" % self._on_masks(lot.masks)
         elif layer_builder.matte_source:
-            matte_id = layer_builder.matte_source.matte_id
-            if not matte_id:
-                matte_id = layer_builder.matte_source.matte_id = self.gen_id()
-            g.attrib["mask"] = "url(#%s)" % matte_id
+            g.attrib["mask"] = "url(#%s)" % self._matte_id(layer_builder.matte_source)
 
         if isinstance(lot, objects.PreCompLayer):
             self.precomp_times.append(PrecompTime(lot))
@@ -209,8 +195,17 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
 
         return g
 
+    def _layer_visible(self, lot):
+        if self.precomp_times:
+            return True
+        return lot.in_point <= self.time <= lot.out_point
+
     def _on_text_layer(self, g, lot):
         text = ElementTree.SubElement(g, "text")
+        self._update_text_layer(text, lot)
+        return text
+
+    def _update_text_layer(self, text, lot):
         doc = lot.data.get_value(self.time)
         if doc:
             text.attrib["font-family"] = doc.font_family
@@ -320,7 +315,7 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
             return
 
         style = self._get_group_stroke(group)
-        if style.get("stroke-width", 0) <= 0 or style["stroke-opacity"] <= 0:
+        if not self._stroke_visible(group, style):
             return
 
         if group.stroke_above:
@@ -349,6 +344,9 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         use.attrib["style"] = self._style_to_css(style)
         return g
 
+    def _stroke_visible(self, group, style):
+        return style.get("stroke-width", 0) > 0 and style["stroke-opacity"] > 0
+
     def group_to_style(self, group):
         style = {}
         if group.fill:
@@ -369,17 +367,27 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         return self._style_to_css(style)
 
     def process_gradient(self, gradient):
+        if gradient.gradient_type == objects.GradientType.Linear:
+            dom = ElementTree.SubElement(self.defs, "linearGradient")
+        elif gradient.gradient_type == objects.GradientType.Radial:
+            dom = ElementTree.SubElement(self.defs, "radialGradient")
+        self._update_gradient_points(dom, gradient)
+
+        id = self.set_id(dom, gradient, force=True)
+        dom.attrib["gradientUnits"] = "userSpaceOnUse"
+        self._add_gradient_stops(dom, gradient)
+        return id
+
+    def _update_gradient_points(self, dom, gradient):
         spos = gradient.start_point.get_value(self.time)
         epos = gradient.end_point.get_value(self.time)
 
         if gradient.gradient_type == objects.GradientType.Linear:
-            dom = ElementTree.SubElement(self.defs, "linearGradient")
             dom.attrib["x1"] = str(spos[0])
             dom.attrib["y1"] = str(spos[1])
             dom.attrib["x2"] = str(epos[0])
             dom.attrib["y2"] = str(epos[1])
         elif gradient.gradient_type == objects.GradientType.Radial:
-            dom = ElementTree.SubElement(self.defs, "radialGradient")
             dom.attrib["cx"] = str(spos[0])
             dom.attrib["cy"] = str(spos[1])
             dom.attrib["r"] = str((epos-spos).length)
@@ -388,17 +396,15 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
             dom.attrib["fx"] = str(spos[0] + math.cos(a) * l)
             dom.attrib["fy"] = str(spos[1] + math.sin(a) * l)
 
-        id = self.set_id(dom, gradient, force=True)
-        dom.attrib["gradientUnits"] = "userSpaceOnUse"
-
+    def _add_gradient_stops(self, dom, gradient):
         for off, color in gradient.colors.stops_at(self.time):
-            stop = ElementTree.SubElement(dom, "stop")
-            stop.attrib["offset"] = "%s%%" % (off * 100)
-            stop.attrib["stop-color"] = color_to_css(color[:3])
-            if len(color) > 3:
-                stop.attrib["stop-opacity"] = str(color[3])
+            self._update_gradient_stop(ElementTree.SubElement(dom, "stop"), off, color)
 
-        return id
+    def _update_gradient_stop(self, stop, off, color):
+        stop.attrib["offset"] = "%s%%" % (off * 100)
+        stop.attrib["stop-color"] = color_to_css(color[:3])
+        if len(color) > 3:
+            stop.attrib["stop-opacity"] = str(color[3])
 
     def group_from_lottie(self, lottie, dom_parent, layer):
         g = ElementTree.SubElement(dom_parent, "g")
@@ -456,6 +462,10 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
 
     def build_rect(self, shape, parent):
         rect = ElementTree.SubElement(parent, "rect")
+        self._update_rect(rect, shape)
+        return rect
+
+    def _update_rect(self, rect, shape):
         size = shape.size.get_value(self.time)
         pos = shape.position.get_value(self.time)
         rect.attrib["width"] = str(size[0])
@@ -463,20 +473,26 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
         rect.attrib["x"] = str(pos[0] - size[0] / 2)
         rect.attrib["y"] = str(pos[1] - size[1] / 2)
         rect.attrib["rx"] = str(shape.rounded.get_value(self.time))
-        return rect
 
     def build_ellipse(self, shape, parent):
         ellipse = ElementTree.SubElement(parent, "ellipse")
+        self._update_ellipse(ellipse, shape)
+        return ellipse
+
+    def _update_ellipse(self, ellipse, shape):
         size = shape.size.get_value(self.time)
         pos = shape.position.get_value(self.time)
         ellipse.attrib["rx"] = str(size[0] / 2)
         ellipse.attrib["ry"] = str(size[1] / 2)
         ellipse.attrib["cx"] = str(pos[0])
         ellipse.attrib["cy"] = str(pos[1])
-        return ellipse
 
     def build_path(self, shapes, parent):
         path = ElementTree.SubElement(parent, "path")
+        path.attrib["d"] = self._shapes_to_d(shapes)
+        return path
+
+    def _shapes_to_d(self, shapes):
         d = ""
         for shape in shapes:
             bez = shape.shape.get_value(self.time)
@@ -487,9 +503,7 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
             if d:
                 d += "\n"
             d += self._bezier_to_d(bez)
-
-        path.attrib["d"] = d
-        return path
+        return d
 
     def _bezier_tangent(self, tangent):
         _tangent_threshold = 0.5
@@ -571,113 +585,6 @@ class SvgBuilder(SvgHandler, restructure.AbstractBuilder):
 
         return g
 
-    def build_rouded_corners(self, shape, child, shapegroup, out_parent):
-        round_amount = shape.radius.get_value(self.time)
-        return self._modifier_process(child, shapegroup, out_parent, self._build_rouded_corners_shape, round_amount)
-
-    def _build_rouded_corners_shape(self, shape, round_amount):
-        if not isinstance(shape, objects.Shape):
-            return [shape]
-        path = shape.to_bezier()
-        bezier = path.shape.get_value(self.time).rounded(round_amount)
-        path.shape.clear_animation(bezier)
-        return [path]
-
-    def build_trim_path(self, shape, child, shapegroup, out_parent):
-        start = max(0, min(1, shape.start.get_value(self.time) / 100))
-        end = max(0, min(1, shape.end.get_value(self.time) / 100))
-        offset = shape.offset.get_value(self.time) / 360 % 1
-
-        multidata = {}
-        length = 0
-
-        if shape.multiple == objects.TrimMultipleShapes.Individually:
-            for visishape in reversed(list(self._modifier_foreach_shape(child))):
-                bez = visishape.to_bezier().shape.get_value(self.time)
-                local_length = bez.rough_length()
-                multidata[visishape] = (bez, length, local_length)
-                length += local_length
-
-        return self._modifier_process(
-            child, shapegroup, out_parent, self._build_trim_path_shape,
-            start+offset, end+offset, multidata, length
-        )
-
-    def _modifier_foreach_shape(self, shape):
-        if isinstance(shape, restructure.RestructuredShapeGroup):
-            for child in shape.children:
-                for chsh in self._modifier_foreach_shape(child):
-                    yield chsh
-        elif isinstance(shape, restructure.RestructuredPathMerger):
-            for p in shape.paths:
-                yield p
-        elif isinstance(shape, objects.Shape):
-            yield shape
-
-    def _modifier_process(self, child, shapegroup, out_parent, callback, *args):
-        children = self._modifier_process_child(child, shapegroup, out_parent, callback, *args)
-        return [self.shapegroup_process_child(ch, shapegroup, out_parent) for ch in children]
-
-    def _trim_offlocal(self, t, local_start, local_length, total_length):
-        gt = (t * total_length - local_start) / local_length
-        return max(0, min(1, gt))
-
-    def _build_trim_path_shape(self, shape, start, end, multidata, total_length):
-        if not isinstance(shape, objects.Shape):
-            return [shape]
-
-        if multidata:
-            bezier, local_start, local_length = multidata[shape]
-            if end > 1:
-                lstart = self._trim_offlocal(start, local_start, local_length, total_length)
-                lend = self._trim_offlocal(end-1, local_start, local_length, total_length)
-                out = []
-                if lstart < 1:
-                    out.append(objects.Path(bezier.segment(lstart, 1)))
-                if lend > 0:
-                    out.append(objects.Path(bezier.segment(0, lend)))
-                return out
-
-            lstart = self._trim_offlocal(start, local_start, local_length, total_length)
-            lend = self._trim_offlocal(end, local_start, local_length, total_length)
-            if lend <= 0 or lstart >= 1:
-                return []
-            if lstart <= 0 and lend >= 1:
-                return [objects.Path(bezier)]
-            seg = bezier.segment(lstart, lend)
-            return [objects.Path(seg)]
-
-        path = shape.to_bezier()
-        bezier = path.shape.get_value(self.time)
-        if end > 1:
-            bez1 = bezier.segment(start, 1)
-            bez2 = bezier.segment(0, end-1)
-            return [objects.Path(bez1), objects.Path(bez2)]
-        else:
-            seg = bezier.segment(start, end)
-            return [objects.Path(seg)]
-
-    def _modifier_process_children(self, shapegroup, out_parent, callback, *args):
-        children = []
-        for shape in shapegroup.children:
-            children.extend(self._modifier_process_child(shape, shapegroup, out_parent, callback, *args))
-        shapegroup.children = children
-
-    def _modifier_process_child(self, shape, shapegroup, out_parent, callback, *args):
-        if isinstance(shape, restructure.RestructuredShapeGroup):
-            self._modifier_process_children(shape, out_parent, callback, *args)
-            return [shape]
-        elif isinstance(shape, restructure.RestructuredPathMerger):
-            paths = []
-            for p in shape.paths:
-                paths.extend(callback(p, *args))
-            shape.paths = paths
-            if paths:
-                return [shape]
-            return []
-        else:
-            return callback(shape, *args)
-
     def _custom_object_supported(self, shape):
         if has_font and isinstance(shape, font.FontShape):
             return True
@@ -713,7 +620,248 @@ def color_to_css(color):
     return "rgb(%s, %s, %s)" % tuple(map(lambda c: int(round(c*255)), color[:3]))
 
 
-def to_svg(animation, time):
+def to_svg(animation, time, restructured=None):
     builder = SvgBuilder(time)
-    builder.process(animation)
+    builder.process(animation, restructured)
     return builder.dom
+
+
+class _RecordingSvgBuilder(SvgBuilder):
+    """!
+    SvgBuilder that remembers how to update the attributes depending on animated properties
+    """
+    _url_re = re.compile(r"url\(#([^)]+)\)")
+
+    def __init__(self, time=0):
+        super().__init__(time)
+        ## Callbacks updating the document, with the time context they need
+        self._patches = []
+        ## Conditions affecting the structure of the document, with their value when it was built
+        self._checks = []
+        ## Whether the document can be updated to a different time
+        self.patchable = True
+        self._animated_cache = {}
+        self._gradient_doms = {}
+        self._replay_gradients = None
+
+    def _context(self):
+        return list(self.precomp_times), self._current_layer[-1]
+
+    def _restore(self, time, context):
+        self.actual_time = time
+        self.precomp_times, layer = context
+        self._current_layer = [layer]
+
+    def _patch(self, callback):
+        self._patches.append((self._context(), callback))
+
+    def _patch_attrib(self, element, name, callback):
+        def patch():
+            # Gradients referenced by the attribute are updated rather than added
+            self._replay_gradients = iter(self._url_re.findall(element.attrib.get(name, "")))
+            element.attrib[name] = callback()
+            self._replay_gradients = None
+        self._patch(patch)
+
+    def _check(self, callback):
+        self._checks.append((self._context(), callback, callback()))
+
+    def _animated(self, lottie):
+        if lottie is None:
+            return False
+
+        key = id(lottie)
+        if key not in self._animated_cache:
+            if isinstance(lottie, restructure.RestructuredShapeGroup):
+                animated = self._animated(lottie.lottie)
+            elif isinstance(lottie, restructure.RestructuredPathMerger):
+                animated = any(map(self._animated, lottie.paths))
+            elif isinstance(lottie, restructure.RestructuredModifier):
+                animated = self._animated(lottie.lottie) or self._animated(lottie.child)
+            else:
+                found = []
+
+                class Visitor(objects.base.ObjectVisitor):
+                    def visit(self, object):
+                        if isinstance(object, objects.properties.AnimatableMixin):
+                            if object.animated:
+                                found.append(object)
+                        elif isinstance(object, objects.text.TextData):
+                            if len(object.keyframes) > 1:
+                                found.append(object)
+
+                Visitor()(lottie)
+                animated = bool(found)
+            # Keeps a reference so ids of temporary objects aren't reused
+            self._animated_cache[key] = (lottie, animated)
+        return self._animated_cache[key][1]
+
+    def update(self, time):
+        """!
+        Updates the document to show @p time
+        @returns @c False if the document structure changes at @p time and it needs to be rebuilt
+        """
+        if not self.patchable:
+            return False
+
+        for context, callback, value in self._checks:
+            self._restore(time, context)
+            if callback() != value:
+                return False
+
+        for context, callback in self._patches:
+            self._restore(time, context)
+            callback()
+        return True
+
+    def _on_layer(self, layer_builder, dom_parent):
+        lot = layer_builder.lottie
+        if not self.precomp_times:
+            self._current_layer.append(lot)
+            self._check(lambda: self._layer_visible(lot))
+            self._current_layer.pop()
+
+        g = super()._on_layer(layer_builder, dom_parent)
+        if g is not None and isinstance(lot, objects.NullLayer) and self._animated(lot.transform):
+            self._patch(lambda: g.attrib.__setitem__("opacity", "1"))
+        return g
+
+    def set_transform(self, dom, transform, auto_orient=False):
+        super().set_transform(dom, transform, auto_orient)
+        if self._animated(transform):
+            self._patch(lambda: super(_RecordingSvgBuilder, self).set_transform(dom, transform, auto_orient))
+            if transform.opacity is not None:
+                self._check(lambda: transform.opacity.get_value(self.time) != 100)
+
+    def _mask_to_def(self, mask):
+        mask_id = super()._mask_to_def(mask)
+        if self._animated(mask):
+            path = self.defs[-1][0]
+            self._patch(lambda: self._update_mask_path(path, mask))
+        return mask_id
+
+    def _on_text_layer(self, g, lot):
+        text = super()._on_text_layer(g, lot)
+        if self._animated(lot.data):
+            def patch():
+                text.attrib.clear()
+                text.text = None
+                self._update_text_layer(text, lot)
+            self._patch(patch)
+        return text
+
+    def process_gradient(self, gradient):
+        if self._replay_gradients is None:
+            id = super().process_gradient(gradient)
+            self._gradient_doms[id] = self.defs[-1]
+            return id
+
+        id = next(self._replay_gradients)
+        dom = self._gradient_doms[id]
+        self._update_gradient_points(dom, gradient)
+        stops = list(gradient.colors.stops_at(self.time))
+        if len(stops) == len(dom):
+            # Keeps the same elements when possible
+            for stop, (off, color) in zip(dom, stops):
+                stop.attrib.clear()
+                self._update_gradient_stop(stop, off, color)
+        else:
+            for stop in list(dom):
+                dom.remove(stop)
+            self._add_gradient_stops(dom, gradient)
+        return id
+
+    def _style_animated(self, group):
+        return self._animated(group.fill) or self._animated(group.stroke)
+
+    def _split_stroke(self, group, fill_layer, out_parent):
+        result = super()._split_stroke(group, fill_layer, out_parent)
+        stroke = group.stroke
+
+        if self._style_animated(group):
+            stroke_above = result is fill_layer
+
+            def fill_style():
+                style = self.group_to_style(group)
+                if stroke_above:
+                    style = (style + ";" if style else "") + self._style_to_css(self._get_group_stroke(group))
+                return style
+            self._patch_attrib(fill_layer, "style", fill_style)
+
+            if result is not None and not stroke_above:
+                self._patch_attrib(result[0], "style", lambda: self._style_to_css(self._get_group_stroke(group)))
+
+        if stroke and (self._animated(stroke.width) or self._animated(stroke.opacity)):
+            self._check(lambda: stroke.width.get_value(self.time) > 0 and stroke.opacity.get_value(self.time) > 0)
+
+        return result
+
+    def _on_merged_path(self, shape, shapegroup, out_parent):
+        path = super()._on_merged_path(shape, shapegroup, out_parent)
+        if self._style_animated(shapegroup):
+            self._patch_attrib(path, "style", lambda: self.group_to_style(shapegroup))
+        return path
+
+    def _on_shape(self, shape, shapegroup, out_parent):
+        svgshape = super()._on_shape(shape, shapegroup, out_parent)
+        if svgshape is not None and self._style_animated(shapegroup):
+            suffix = "display: none;" if shape.hidden else ""
+            self._patch_attrib(svgshape, "style", lambda: self.group_to_style(shapegroup) + suffix)
+        return svgshape
+
+    def _on_shape_modifier(self, shape, shapegroup, out_parent):
+        # Modifiers change the number of output elements, so they are rebuilt
+        if isinstance(shape.lottie, objects.Repeater):
+            if self._animated(shape.lottie):
+                self.patchable = False
+        elif isinstance(shape.lottie, (objects.RoundedCorners, objects.Trim)):
+            if self._animated(shape):
+                self.patchable = False
+        return super()._on_shape_modifier(shape, shapegroup, out_parent)
+
+    def build_rect(self, shape, parent):
+        rect = super().build_rect(shape, parent)
+        if self._animated(shape):
+            self._patch(lambda: self._update_rect(rect, shape))
+        return rect
+
+    def build_ellipse(self, shape, parent):
+        ellipse = super().build_ellipse(shape, parent)
+        if self._animated(shape):
+            self._patch(lambda: self._update_ellipse(ellipse, shape))
+        return ellipse
+
+    def build_path(self, shapes, parent):
+        path = super().build_path(shapes, parent)
+        if any(map(self._animated, shapes)):
+            self._patch(lambda: path.attrib.__setitem__("d", self._shapes_to_d(shapes)))
+        return path
+
+
+class IncrementalSvgBuilder:
+    """!
+    Builds SVG documents for several frames of the same animation
+
+    The document is built once, later frames only update the attributes
+    depending on animated properties.
+    It's rebuilt from scratch when its structure changes (eg: a layer becomes visible)
+    or when it contains animated modifiers.
+
+    The result is the same as to_svg() for each frame.
+    """
+    def __init__(self, animation: objects.Animation):
+        self.animation = animation
+        self._builder = None
+        self._restructured = None
+
+    def frame(self, time):
+        """!
+        Returns the document for @p time
+        @note The returned ElementTree is modified by following calls
+        """
+        if self._builder is None or not self._builder.update(time):
+            self._builder = _RecordingSvgBuilder(time)
+            if self._restructured is None:
+                self._restructured = self._builder.get_restructured(self.animation)
+            self._builder.process(self.animation, self._restructured)
+        return self._builder.dom
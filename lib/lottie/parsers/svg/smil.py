@@ -0,0 +1,484 @@
+r"""!
+Builds a single SVG document animated with SMIL
+
+Animated properties become @c \<animate\> and @c \<animateTransform\> elements.
+Where possible their values and timing come straight from the keyframes,
+with the easing curves converted to @c keySplines, otherwise the property
+is sampled at every frame.
+
+Layer visibility is animated on the @c display attribute.
+Shape modifiers (eg: trim path, repeaters) and text documents are exported
+as they appear on the first frame.
+"""
+import re
+import math
+from xml.etree import ElementTree
+
+from ... import objects
+from .builder import _RecordingSvgBuilder, color_to_css
+
+
+## Key spline for linear interpolation
+_linear = "0 0 1 1"
+## Marks keyframes holding their value
+_hold = object()
+
+
+class _Track:
+    """!
+    Values of an attribute over time
+
+    @p getter returns the value of the attribute for the current time of the builder,
+    when @p prop is given its keyframes (mapped by @p convert) are used instead of sampling.
+    """
+    def __init__(self, context, getter, prop=None, convert=None):
+        self.context = context
+        self.getter = getter
+        self.prop = prop
+        self.convert = convert
+
+
+class SmilSvgBuilder(_RecordingSvgBuilder):
+    """!
+    SvgBuilder that adds SMIL animations to the document
+    """
+    _number_re = re.compile(r"[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?")
+
+    def __init__(self):
+        super().__init__()
+        self._tracks = {}
+        self._transforms = []
+        self._layers = []
+
+    def process(self, animation: objects.Animation):
+        self.actual_time = animation.in_point
+        self.in_point = animation.in_point
+        self.out_point = animation.out_point
+        self.frame_rate = animation.frame_rate
+        super().process(animation)
+        if self.out_point > self.in_point:
+            self._animate()
+
+    def _track(self, element, name, prop, convert):
+        """!
+        Animates the attribute @p name from the values of @p prop
+        """
+        if self._animated(prop):
+            self._tracks[(element, name)] = _Track(
+                self._context(),
+                lambda: convert(prop.get_value(self.time)),
+                prop,
+                convert
+            )
+
+    # Builder overrides
+
+    def _layer_visible(self, lot):
+        # All the layers are in the document, their visibility is animated
+        return True
+
+    def _stroke_visible(self, group, style):
+        if self._animated(group.stroke.width) or self._animated(group.stroke.opacity):
+            return True
+        return super()._stroke_visible(group, style)
+
+    def _on_layer(self, layer_builder, dom_parent):
+        top_level = not self.precomp_times
+        g = super()._on_layer(layer_builder, dom_parent)
+        if g is not None and top_level:
+            self._layers.append((g, layer_builder.lottie))
+        return g
+
+    def set_transform(self, dom, transform, auto_orient=False):
+        super().set_transform(dom, transform, auto_orient)
+        if not self._animated(transform):
+            return
+
+        self._track(dom, "opacity", transform.opacity, lambda v: str(v / 100))
+
+        components = self._transform_components(transform, auto_orient)
+        if any(track.prop is None or self._animated(track.prop) for type, track in components):
+            self._transforms.append((dom, components))
+
+    def _transform_components(self, transform, auto_orient):
+        """!
+        Splits the transform into SVG transform functions, in the same order as Transform.to_matrix()
+        """
+        components = []
+        context = self._context()
+
+        def add(type, prop, convert):
+            if prop is not None:
+                track = _Track(context, lambda: convert(prop.get_value(self.time)), prop, convert)
+                components.append((type, track))
+
+        def pair(x, y):
+            return "%s %s" % (x, y)
+
+        add("translate", transform.position, lambda v: pair(v[0], v[1]))
+        if auto_orient and transform.position and transform.position.animated:
+            components.append(("rotate", _Track(
+                context, lambda: str(math.degrees(transform.position.get_tangent_angle(self.time)))
+            )))
+        add("rotate", transform.rotation, str)
+        if transform.skew and (transform.skew.animated or transform.skew.value):
+            axis = transform.skew_axis or objects.Value(0)
+            add("rotate", axis, str)
+            add("skewX", transform.skew, lambda v: str(-v))
+            add("rotate", axis, lambda v: str(-v))
+        add("scale", transform.scale, lambda v: pair(v[0] / 100, v[1] / 100))
+        add("translate", transform.anchor_point, lambda v: pair(-v[0], -v[1]))
+        return components
+
+    def _mask_to_def(self, mask):
+        mask_id = super()._mask_to_def(mask)
+        path = self.defs[-1][0]
+        self._track(path, "d", mask.shape, self._bezier_value_to_d)
+        self._track(path, "fill-opacity", mask.opacity, lambda v: str(v / 100))
+        return mask_id
+
+    def _style_tracks(self, element, group, stroke=False):
+        if stroke:
+            if group.stroke and not isinstance(group.stroke, objects.GradientStroke):
+                self._track(element, "stroke", group.stroke.color, color_to_css)
+            if group.stroke:
+                self._track(element, "stroke-opacity", group.stroke.opacity, lambda v: str(v / 100))
+                self._track(element, "stroke-width", group.stroke.width, str)
+        else:
+            if group.fill and not isinstance(group.fill, objects.GradientFill):
+                self._track(element, "fill", group.fill.color, color_to_css)
+            if group.fill:
+                self._track(element, "fill-opacity", group.fill.opacity, lambda v: str(v / 100))
+
+    def _split_stroke(self, group, fill_layer, out_parent):
+        result = super()._split_stroke(group, fill_layer, out_parent)
+        self._style_tracks(fill_layer, group)
+        if result is fill_layer:
+            self._style_tracks(fill_layer, group, True)
+        elif result is not None:
+            self._style_tracks(result[0], group, True)
+        return result
+
+    def _on_merged_path(self, shape, shapegroup, out_parent):
+        path = super()._on_merged_path(shape, shapegroup, out_parent)
+        self._style_tracks(path, shapegroup)
+        return path
+
+    def _on_shape(self, shape, shapegroup, out_parent):
+        svgshape = super()._on_shape(shape, shapegroup, out_parent)
+        if svgshape is not None:
+            self._style_tracks(svgshape, shapegroup)
+        return svgshape
+
+    def build_rect(self, shape, parent):
+        rect = super().build_rect(shape, parent)
+        self._track(rect, "width", shape.size, lambda v: str(v[0]))
+        self._track(rect, "height", shape.size, lambda v: str(v[1]))
+        self._track(rect, "rx", shape.rounded, str)
+        # x and y depend on both position and size, keyframes are used only if one of them is static
+        if not self._animated(shape.size):
+            size = shape.size.get_value(self.time)
+            self._track(rect, "x", shape.position, lambda v: str(v[0] - size[0] / 2))
+            self._track(rect, "y", shape.position, lambda v: str(v[1] - size[1] / 2))
+        elif not self._animated(shape.position):
+            pos = shape.position.get_value(self.time)
+            self._track(rect, "x", shape.size, lambda v: str(pos[0] - v[0] / 2))
+            self._track(rect, "y", shape.size, lambda v: str(pos[1] - v[1] / 2))
+        return rect
+
+    def build_ellipse(self, shape, parent):
+        ellipse = super().build_ellipse(shape, parent)
+        self._track(ellipse, "rx", shape.size, lambda v: str(v[0] / 2))
+        self._track(ellipse, "ry", shape.size, lambda v: str(v[1] / 2))
+        self._track(ellipse, "cx", shape.position, lambda v: str(v[0]))
+        self._track(ellipse, "cy", shape.position, lambda v: str(v[1]))
+        return ellipse
+
+    def build_path(self, shapes, parent):
+        path = super().build_path(shapes, parent)
+        if len(shapes) == 1 and isinstance(shapes[0], objects.Path):
+            self._track(path, "d", shapes[0].shape, self._bezier_value_to_d)
+        return path
+
+    def _bezier_value_to_d(self, bez):
+        if isinstance(bez, list):
+            bez = bez[0]
+        return self._bezier_to_d(bez) if bez.vertices else ""
+
+    # Animation output
+
+    def _sample_times(self):
+        times = [self.in_point + i for i in range(int(self.out_point - self.in_point))]
+        times.append(self.out_point)
+        return times
+
+    def _key_time(self, time):
+        return (time - self.in_point) / (self.out_point - self.in_point)
+
+    def _evaluate(self, track, time):
+        self._restore(time, track.context)
+        return track.getter()
+
+    def _animate(self):
+        """!
+        Adds the animation elements, based on the values of the patched attributes at every frame
+        """
+        times = self._sample_times()
+        elements = list(self.svg.iter())
+        base = [dict(element.attrib) for element in elements]
+
+        frames = []
+        for time in times:
+            for context, callback in self._patches:
+                self._restore(time, context)
+                callback()
+            frames.append([dict(element.attrib) for element in elements])
+
+        for element, attrib in zip(elements, base):
+            element.attrib.clear()
+            element.attrib.update(attrib)
+
+        for index, element in enumerate(elements):
+            sampled = self._sampled_attributes(element, [frame[index] for frame in frames])
+            for name, values in sampled.items():
+                self._add_sampled(element, name, times, values)
+
+        for (element, name), track in self._tracks.items():
+            self._add_track(element, name, track, times)
+
+        for element, components in self._transforms:
+            for i, (type, track) in enumerate(components):
+                anim = self._add_track(element, "transform", track, times, "animateTransform")
+                anim.attrib["type"] = type
+                anim.attrib["additive"] = "sum" if i else "replace"
+
+        for g, lot in self._layers:
+            self._add_visibility(g, lot, times)
+
+    def _sampled_attributes(self, element, frames):
+        """!
+        Returns the values of the changing attributes of @p element not covered by other tracks
+        """
+        if all(frame == frames[0] for frame in frames):
+            return {}
+
+        sampled = {}
+        names = set()
+        for frame in frames:
+            names |= frame.keys()
+
+        for name in names:
+            if (element, name) in self._tracks or name == "transform":
+                continue
+
+            if name == "style":
+                styles = [self._parse_style(frame.get(name, "")) for frame in frames]
+                properties = set()
+                for style in styles:
+                    properties |= style.keys()
+                for property in properties:
+                    if (element, property) not in self._tracks:
+                        values = [style.get(property, "") for style in styles]
+                        if any(value != values[0] for value in values):
+                            sampled[property] = values
+                continue
+
+            values = [frame.get(name, "1" if name == "opacity" else "") for frame in frames]
+            if any(value != values[0] for value in values):
+                sampled[name] = values
+
+        return sampled
+
+    def _parse_style(self, style):
+        properties = {}
+        for item in style.split(";"):
+            name, sep, value = item.partition(":")
+            if sep:
+                properties[name.strip()] = value.strip()
+        return properties
+
+    def _to_attribute(self, element, name):
+        """!
+        Moves @p name from the style to an attribute, so it can be animated
+        """
+        style = self._parse_style(element.attrib.get("style", ""))
+        if name in style:
+            element.attrib[name] = style.pop(name)
+            element.attrib["style"] = self._style_to_css(style)
+
+    def _interpolable(self, values):
+        templates = {self._number_re.sub("0", value) for value in values}
+        return len(templates) == 1 and "0" in templates.pop() and not any("url(" in v for v in values)
+
+    def _add_animation(self, element, name, values, key_times, tag="animate", calc_mode="linear", splines=None):
+        self._to_attribute(element, name)
+        anim = ElementTree.SubElement(element, tag)
+        anim.attrib["attributeName"] = name
+        anim.attrib["dur"] = "%ss" % ((self.out_point - self.in_point) / self.frame_rate)
+        anim.attrib["repeatCount"] = "indefinite"
+        anim.attrib["values"] = ";".join(values)
+        if len(values) > 1:
+            anim.attrib["keyTimes"] = ";".join(
+                ("%.6f" % self._key_time(time)).rstrip("0").rstrip(".")
+                for time in key_times
+            )
+            if calc_mode != "linear":
+                anim.attrib["calcMode"] = calc_mode
+            if splines:
+                anim.attrib["keySplines"] = ";".join(splines)
+        return anim
+
+    def _add_sampled(self, element, name, times, values, tag="animate"):
+        if self._interpolable(values):
+            # Removes points in the middle of constant stretches
+            keep = [
+                i for i in range(len(values))
+                if i == 0 or i == len(values) - 1 or not (values[i-1] == values[i] == values[i+1])
+            ]
+            calc_mode = "linear"
+        else:
+            keep = [i for i in range(len(values)) if i == 0 or values[i-1] != values[i]]
+            calc_mode = "discrete"
+
+        if len(keep) == 2 and values[keep[0]] == values[keep[1]]:
+            keep = keep[:1]
+
+        return self._add_animation(
+            element, name,
+            [values[i] for i in keep],
+            [times[i] for i in keep],
+            tag, calc_mode
+        )
+
+    def _add_track(self, element, name, track, times, tag="animate"):
+        points = self._keyframe_points(track)
+        if points is None:
+            values = [self._evaluate(track, time) for time in times]
+            return self._add_sampled(element, name, times, values, tag)
+
+        values = [value for time, value, spline in points]
+        splines = [spline for time, value, spline in points[1:]]
+        return self._add_animation(
+            element, name, values,
+            [time for time, value, spline in points],
+            tag,
+            "linear" if all(spline == _linear for spline in splines) else "spline",
+            splines if any(spline != _linear for spline in splines) else None
+        )
+
+    def _add_visibility(self, g, lot, times):
+        if "display" in self._parse_style(g.attrib.get("style", "")):
+            return
+
+        values = ["inline" if lot.in_point <= time <= lot.out_point else "none" for time in times]
+        if values[0] == "none":
+            g.attrib["display"] = "none"
+        if any(value != values[0] for value in values):
+            self._add_sampled(g, "display", times, values)
+
+    # Keyframe conversion
+
+    def _time_offset(self, context):
+        """!
+        Returns the offset from local times in @p context to global ones, or None if time is remapped
+        """
+        offset = 0
+        for pct in context[0]:
+            if pct.pcl.time_remapping:
+                return None
+            offset += pct.pcl.start_time
+        return offset
+
+    def _keyframe_spline(self, keyframe):
+        """!
+        Returns the key spline equivalent to the easing of @p keyframe, or None if it can't be represented
+        """
+        if not keyframe.in_value or not keyframe.out_value:
+            return _hold
+
+        in_tan = getattr(keyframe, "in_tan", None)
+        out_tan = getattr(keyframe, "out_tan", None)
+        if in_tan and out_tan:
+            # Spatial interpolation ignores the easing, straight lines are linear
+            if in_tan.length == 0 and out_tan.length == 0:
+                return _linear
+            return None
+
+        handles = []
+        for coord in (keyframe.out_value.x, keyframe.out_value.y, keyframe.in_value.x, keyframe.in_value.y):
+            if isinstance(coord, list):
+                if not coord or any(c != coord[0] for c in coord):
+                    return None
+                coord = coord[0]
+            # SMIL only supports control points within the unit square
+            if not 0 <= coord <= 1:
+                return None
+            handles.append(coord)
+        return "%s %s %s %s" % tuple(handles)
+
+    def _keyframe_value(self, track, value):
+        if value is None:
+            return None
+        if isinstance(track.prop, objects.Value):
+            value = value[0]
+        return track.convert(value)
+
+    def _keyframe_points(self, track):
+        """!
+        Returns a list of (time, value, spline) for the keyframes of @p track, or None if it needs to be sampled
+        """
+        if track.prop is None or not track.prop.animated or not track.prop.keyframes:
+            return None
+        offset = self._time_offset(track.context)
+        if offset is None:
+            return None
+
+        keyframes = track.prop.keyframes
+        times = [kf.time + offset for kf in keyframes]
+        if times[0] < self.in_point or times[-1] > self.out_point:
+            return None
+        if any(b < a for a, b in zip(times, times[1:])):
+            return None
+
+        value = self._keyframe_value(track, keyframes[0].start)
+        if value is None:
+            return None
+        points = [(self.in_point, value, None)]
+        if times[0] > self.in_point:
+            points.append((times[0], value, _linear))
+
+        for i in range(1, len(keyframes)):
+            prev = keyframes[i-1]
+            start = self._keyframe_value(track, prev.start)
+            end = self._keyframe_value(track, prev.end if prev.end is not None else keyframes[i].start)
+            spline = self._keyframe_spline(prev)
+            if start is None or end is None or spline is None:
+                return None
+
+            if points[-1][1] != start:
+                points.append((times[i-1], start, _linear))
+            if spline is _hold:
+                points.append((times[i], start, _linear))
+                if end != start:
+                    points.append((times[i], end, _linear))
+            else:
+                points.append((times[i], end, spline))
+
+        last = self._keyframe_value(track, track.prop._value_before(len(keyframes)))
+        if last != points[-1][1]:
+            points.append((times[-1], last, _linear))
+        if times[-1] < self.out_point:
+            points.append((self.out_point, last, _linear))
+
+        if len(points) > 1 and not self._interpolable([value for time, value, spline in points]):
+            return None
+        return points
+
+
+def to_animated_svg(animation):
+    """!
+    Returns an ElementTree with the SVG document for the whole animation
+    """
+    builder = SmilSvgBuilder()
+    builder.process(animation)
+    return builder.dom
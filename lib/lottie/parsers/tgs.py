@@ -1,14 +1,14 @@
 import io
-import json
 import gzip
 from ..objects import Animation
+from ..utils import json_backend
 
 
 def parse_tgs_json(file):
     """!
     Reads both tgs and lottie files, returns the json structure
     """
-    return open_maybe_gzipped(file, json.load)
+    return open_maybe_gzipped(file, json_backend.get_backend().load)
 
 
 def open_maybe_gzipped(file, on_open):
@@ -33,9 +33,10 @@ def open_maybe_gzipped(file, on_open):
     return on_open(final_file)
 
 
-def parse_tgs(filename):
+def parse_tgs(filename, lazy=False):
     """!
     Reads both tgs and lottie files
+    @param lazy Whether to convert child objects only when accessed, see LottieObject.load()
     """
     lottie = parse_tgs_json(filename)
-    return Animation.load(lottie)
+    return Animation.load(lottie, lazy)
@@ -1,7 +1,14 @@
+import importlib
+import importlib.util
+
 __all__ = ["animation", "ellipse", "ik", "linediff", "restructure", "script", "stripper"]
 
-try:
-    from . import font
+if importlib.util.find_spec("fontTools") is not None:
     __all__ += ["font"]
-except ImportError:
-    pass
+
+
+def __getattr__(name):
+    # Utilities are imported on first access, so using one doesn't load the dependencies of all of them
+    if name in __all__ or name == "font":
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
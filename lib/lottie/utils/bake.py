@@ -0,0 +1,177 @@
+"""!
+Precomputes the values of animated properties for every frame of an animation
+
+Once an animation is baked, AnimatableMixin.get_value() on whole frames within the baked range
+is a table lookup instead of a keyframe evaluation, so renderers exporting many frames
+don't need to be changed to take advantage of it.
+
+@note requires numpy
+"""
+import contextlib
+import numpy
+
+from ..nvector import NVector
+from ..objects.base import ObjectVisitor
+from ..objects.bezier import Bezier
+from ..objects.properties import AnimatableMixin, ShapeProperty
+from ..utils.color import Color
+from . import sampling
+
+
+class BakedProperty:
+    """!
+    Dense per-frame value table for a single animated property
+    """
+    def __init__(self, prop: AnimatableMixin, first_frame, last_frame, dtype=numpy.float64):
+        frames = numpy.arange(first_frame, last_frame + 1)
+        ## Frame corresponding to the first row in values
+        self.first_frame = first_frame
+        ## Array with the flattened value of the property for each frame
+        self.values = sampling.sample(prop, frames).reshape(len(frames), -1).astype(dtype)
+        self._closed = None
+
+        sample_value = next(kf.start for kf in prop.keyframes if kf.start is not None)
+        if isinstance(prop, ShapeProperty):
+            self._closed = [self._closed_at(prop, frame) for frame in frames]
+            self._convert = self._to_bezier
+        elif isinstance(sample_value, Color):
+            mode = sample_value.mode
+            self._convert = lambda row, index: Color(*row, mode=mode)
+        else:
+            self._convert = lambda row, index: NVector(*row)
+
+    def __len__(self):
+        return len(self.values)
+
+    def row(self, frame):
+        """!
+        Returns the flattened value at @p frame, as an array
+        @throws IndexError if @p frame isn't within the baked range
+        """
+        index = frame - self.first_frame
+        if index < 0:
+            raise IndexError(frame)
+        return self.values[index]
+
+    def get(self, time):
+        """!
+        Returns the value at @p time in the same format as AnimatableMixin._get_value_helper()
+        or @c None if @p time isn't a baked frame
+        """
+        index = time - self.first_frame
+        if index < 0 or index >= len(self.values) or index != int(index):
+            return None
+        index = int(index)
+        return self._convert(self.values[index].tolist(), index)
+
+    @staticmethod
+    def _closed_at(prop, frame):
+        keyframes = prop.keyframes
+        index = prop._keyframe_index(frame)
+        if index == 0:
+            value = keyframes[0].start
+        elif index == len(keyframes):
+            value = prop._value_before(index)
+        else:
+            value = keyframes[index-1].start
+        return bool(getattr(value, "closed", False))
+
+    def _to_bezier(self, row, index):
+        bez = Bezier()
+        bez.closed = self._closed[index]
+        count = len(row) // 6
+        points = [NVector(row[i], row[i+1]) for i in range(0, len(row), 2)]
+        bez.vertices = points[:count]
+        bez.in_tangents = points[count:2*count]
+        bez.out_tangents = points[2*count:]
+        return bez
+
+
+class BakedAnimation:
+    """!
+    Per-frame tables for all the animated properties in an animation
+    """
+    def __init__(self, animation, dtype=numpy.float64, first_frame=None, last_frame=None):
+        self.animation = animation
+        ## First baked frame
+        self.first_frame = int(animation.in_point if first_frame is None else first_frame)
+        ## Last baked frame (inclusive)
+        self.last_frame = int(animation.out_point if last_frame is None else last_frame)
+        ## Maps properties to their BakedProperty
+        self.properties = {}
+
+        baker = self
+
+        class Visitor(ObjectVisitor):
+            def visit(self, object):
+                if isinstance(object, AnimatableMixin) and object.animated and object.keyframes:
+                    try:
+                        baked = BakedProperty(object, baker.first_frame, baker.last_frame, dtype)
+                    except (ValueError, StopIteration):
+                        # Shapes with varying vertex counts or properties without values
+                        return
+                    baker.properties[id(object)] = (object, baked)
+
+        Visitor()(animation)
+
+    def apply(self):
+        """!
+        Makes get_value() on the baked properties use the tables
+        """
+        for prop, baked in self.properties.values():
+            prop._baked = baked
+
+    def remove(self):
+        """!
+        Restores keyframe evaluation for the baked properties
+        """
+        for prop, baked in self.properties.values():
+            if prop._baked is baked:
+                prop._baked = None
+
+    def __getitem__(self, prop):
+        """!
+        Returns the BakedProperty for @p prop
+        """
+        return self.properties[id(prop)][1]
+
+    def __contains__(self, prop):
+        return id(prop) in self.properties
+
+    @property
+    def nbytes(self):
+        """!
+        Memory used by the value tables
+        """
+        return sum(baked.values.nbytes for prop, baked in self.properties.values())
+
+
+def bake(animation, dtype=numpy.float64, first_frame=None, last_frame=None):
+    """!
+    Bakes all the animated properties of @p animation, and applies the tables
+    @param animation    Animation to bake
+    @param dtype        numpy data type for the tables, numpy.float32 halves their memory
+                        but reduces the precision of get_value() for any code using the animation
+    @param first_frame  First frame to bake, defaults to the animation in point
+    @param last_frame   Last frame to bake (inclusive), defaults to the animation out point
+    @returns BakedAnimation
+
+    Modifying keyframes with AnimatableMixin.add_keyframe() or clear_animation() discards the
+    table of that property, after other changes call BakedAnimation.remove()
+    """
+    baked = BakedAnimation(animation, dtype, first_frame, last_frame)
+    baked.apply()
+    return baked
+
+
+@contextlib.contextmanager
+def baked(animation, *args, **kwargs):
+    """!
+    Context manager that bakes @p animation for the duration of the block
+    @see bake()
+    """
+    baked_animation = bake(animation, *args, **kwargs)
+    try:
+        yield baked_animation
+    finally:
+        baked_animation.remove()
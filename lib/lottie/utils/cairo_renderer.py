@@ -0,0 +1,643 @@
+"""!
+Renders frames directly on cairo surfaces
+
+Unlike the cairosvg based exporters, this walks the restructured layer tree and draws
+on a pycairo context, without generating and parsing an intermediate SVG document.
+
+@note requires pycairo
+"""
+import io
+import sys
+import math
+
+import cairo
+
+from .. import objects
+from ..objects.helpers import MaskMode
+from . import restructure
+from .restructure import PrecompTime
+
+
+_line_caps = {
+    objects.LineCap.Butt: cairo.LINE_CAP_BUTT,
+    objects.LineCap.Round: cairo.LINE_CAP_ROUND,
+    objects.LineCap.Square: cairo.LINE_CAP_SQUARE,
+}
+
+_line_joins = {
+    objects.LineJoin.Miter: cairo.LINE_JOIN_MITER,
+    objects.LineJoin.Round: cairo.LINE_JOIN_ROUND,
+    objects.LineJoin.Bevel: cairo.LINE_JOIN_BEVEL,
+}
+
+
+class CairoPaint:
+    """!
+    Fill and stroke applying to the shapes in a restructured group
+    """
+    ## Draw only strokes in the current pass
+    StrokePass = "stroke"
+    ## Draw only fills in the current pass
+    FillPass = "fill"
+
+    def __init__(self, fill=None, stroke=None, stroke_above=False, paint_pass=None):
+        self.fill = fill
+        self.stroke = stroke
+        self.stroke_above = stroke_above
+        ## StrokePass or FillPass while drawing the shapes in two passes, None to draw both at once
+        self.paint_pass = paint_pass
+
+    def child(self, group):
+        """!
+        Returns the paint for the sub-group @p group, which inherits the fill and stroke it doesn't override
+        """
+        if not group.fill and not group.stroke:
+            return self
+        if group.stroke:
+            return CairoPaint(group.fill or self.fill, group.stroke, group.stroke_above)
+        return CairoPaint(group.fill, self.stroke, self.stroke_above, self.paint_pass)
+
+    def split_stroke(self):
+        """!
+        Whether the stroke goes below the fill of every shape, so it needs a pass of its own
+        """
+        return self.paint_pass is None and self.fill and self.stroke and not self.stroke_above
+
+
+class CairoLayer(CairoPaint):
+    """!
+    Drawing state for a layer being rendered
+    """
+    def __init__(self, layer_builder, out_parent, opacity, grouped):
+        shapegroup = layer_builder.shapegroup
+        if shapegroup:
+            super().__init__(shapegroup.fill, shapegroup.stroke, shapegroup.stroke_above)
+        else:
+            super().__init__()
+        self.layer_builder = layer_builder
+        self.out_parent = out_parent
+        self.opacity = opacity
+        self.grouped = grouped
+
+
+class CairoRenderer(restructure.FrameBuilder):
+    """!
+    Draws an animation frame on a cairo context
+
+    The context is expected to map animation coordinates to the surface,
+    everything is drawn on top of the current contents of the surface.
+    """
+    merge_paths = True
+    ## Tangents shorter than this are drawn as straight lines, matching the SVG builder
+    _tangent_threshold = 0.5
+
+    def __init__(self, context, time=0):
+        super().__init__(time)
+        self.context = context
+        self._precomps = {}
+        self._assets = {}
+        self._matte_layer = None
+
+    def _on_animation(self, animation: objects.Animation):
+        self._current_layer = [animation]
+        return CairoPaint()
+
+    def _on_precomp(self, id, out_parent, layers):
+        self._precomps[id] = layers
+
+    def _on_asset(self, asset):
+        if isinstance(asset, objects.assets.Image):
+            self._assets[asset.id] = asset
+
+    def _on_layer(self, layer_builder, out_parent):
+        lot = layer_builder.lottie
+        self._current_layer.append(lot)
+
+        if (
+            lot.hidden or
+            (layer_builder.matte_target and layer_builder is not self._matte_layer) or
+            (not self.precomp_times and (lot.in_point > self.time or lot.out_point < self.time))
+        ):
+            self._current_layer.pop()
+            return None
+
+        ctx = self.context
+        ctx.save()
+        opacity = lot.transform.opacity.get_value(self.time) / 100 if lot.transform.opacity else 1
+        grouped = opacity < 1 or bool(lot.masks) or layer_builder.matte_source is not None
+        if grouped:
+            ctx.push_group()
+
+        ctx.save()
+        self.apply_transform(lot.transform, getattr(lot, "auto_orient", False))
+        out_layer = CairoLayer(layer_builder, out_parent, opacity, grouped)
+
+        if isinstance(lot, objects.PreCompLayer):
+            if lot.width and lot.height:
+                ctx.rectangle(0, 0, lot.width, lot.height)
+                ctx.clip()
+            self.precomp_times.append(PrecompTime(lot))
+            for layer in self._precomps.get(lot.reference_id, []):
+                self.process_layer(layer, out_layer)
+            self.precomp_times.pop()
+        elif isinstance(lot, objects.ImageLayer):
+            self.draw_image(self._assets.get(lot.image_id))
+        elif isinstance(lot, objects.TextLayer):
+            self.draw_text_layer(lot)
+        elif isinstance(lot, objects.SolidColorLayer):
+            color = lot.color.lstrip("#")
+            ctx.set_source_rgb(*(int(color[i:i+2], 16) / 255 for i in (0, 2, 4)))
+            ctx.rectangle(0, 0, lot.width, lot.height)
+            ctx.fill()
+
+        return out_layer
+
+    def _on_layer_end(self, out_layer):
+        ctx = self.context
+        lot = out_layer.layer_builder.lottie
+
+        if lot.masks:
+            ctx.push_group()
+            self.draw_masks(lot.masks)
+            self._composite_pattern(ctx.pop_group(), cairo.OPERATOR_DEST_IN)
+        ctx.restore()
+
+        matte_source = out_layer.layer_builder.matte_source
+        if matte_source is not None:
+            ctx.push_group()
+            self._matte_layer = matte_source
+            self.process_layer(matte_source, out_layer.out_parent)
+            self._matte_layer = None
+            matte = ctx.pop_group()
+            if lot.matte_mode in {objects.MatteMode.Luma, objects.MatteMode.InvertedLuma}:
+                matte = self._luminance_pattern(matte)
+            inverted = lot.matte_mode in {objects.MatteMode.InvertedAlpha, objects.MatteMode.InvertedLuma}
+            self._composite_pattern(matte, cairo.OPERATOR_DEST_OUT if inverted else cairo.OPERATOR_DEST_IN)
+
+        if out_layer.grouped:
+            ctx.pop_group_to_source()
+            ctx.paint_with_alpha(out_layer.opacity)
+        ctx.restore()
+
+        self._current_layer.pop()
+
+    def _luminance_pattern(self, pattern):
+        """!
+        Returns an alpha-only pattern with the luminance of @p pattern, like an SVG luminance mask
+
+        The pattern is rasterized in device space, cairo masks only use the alpha channel
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            # Without pillow luma mattes are approximated with alpha
+            return pattern
+
+        ctx = self.context
+        ctx.save()
+        ctx.identity_matrix()
+        x1, y1, x2, y2 = ctx.clip_extents()
+        ctx.restore()
+        x1 = math.floor(x1)
+        y1 = math.floor(y1)
+        width = int(math.ceil(x2)) - x1
+        height = int(math.ceil(y2)) - y1
+        if width <= 0 or height <= 0:
+            return pattern
+
+        matrix = ctx.get_matrix().multiply(cairo.Matrix(x0=-x1, y0=-y1))
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        surface_ctx = cairo.Context(surface)
+        surface_ctx.set_matrix(matrix)
+        surface_ctx.set_source(pattern)
+        surface_ctx.paint()
+        surface.flush()
+
+        # Colors are premultiplied so the luminance already accounts for the alpha
+        rawmode = "BGRA" if sys.byteorder == "little" else "ARGB"
+        image = Image.frombuffer("RGBA", (width, height), bytes(surface.get_data()), "raw", rawmode, surface.get_stride(), 1)
+        luma = image.convert("RGB").convert("L", (0.2125, 0.7154, 0.0721, 0))
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_A8, width)
+        mask = cairo.ImageSurface.create_for_data(
+            bytearray(luma.tobytes("raw", "L", stride)), cairo.FORMAT_A8, width, height, stride
+        )
+        mask_pattern = cairo.SurfacePattern(mask)
+        mask_pattern.set_matrix(matrix)
+        return mask_pattern
+
+    def _composite_pattern(self, pattern, operator):
+        ctx = self.context
+        ctx.save()
+        ctx.set_source(pattern)
+        ctx.set_operator(operator)
+        ctx.paint()
+        ctx.restore()
+
+    def apply_transform(self, transform, auto_orient=False):
+        """!
+        Multiplies the context matrix by the lottie transform at the current time
+        """
+        if transform is None:
+            return
+        mat = transform.to_matrix(self.time, auto_orient)
+        self.context.transform(cairo.Matrix(mat.a, mat.b, mat.c, mat.d, mat.tx, mat.ty))
+
+    def draw_masks(self, masks):
+        ctx = self.context
+        for i, mask in enumerate(masks):
+            mode = mask.mode
+            if mode == MaskMode.No:
+                continue
+
+            if i == 0 and mode in {MaskMode.Subtract, MaskMode.Intersect}:
+                ctx.paint()
+
+            opacity = mask.opacity.get_value(self.time) / 100 if mask.opacity else 1
+            ctx.save()
+            ctx.new_path()
+            self.append_bezier(mask.shape.get_value(self.time))
+            if mode == MaskMode.Subtract:
+                ctx.set_operator(cairo.OPERATOR_DEST_OUT)
+            elif mode == MaskMode.Intersect:
+                ctx.set_operator(cairo.OPERATOR_DEST_IN)
+            if mask.inverted:
+                ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
+                ctx.rectangle(-1e6, -1e6, 2e6, 2e6)
+            ctx.set_source_rgba(1, 1, 1, opacity)
+            ctx.fill()
+            ctx.restore()
+
+    def draw_image(self, asset):
+        if asset is None:
+            return
+
+        surface = self._image_surface(asset)
+        if surface is None:
+            return
+
+        ctx = self.context
+        ctx.save()
+        if asset.width and asset.height:
+            ctx.scale(asset.width / surface.get_width(), asset.height / surface.get_height())
+        ctx.set_source_surface(surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
+
+    def _image_surface(self, asset):
+        format, data = asset.image_data()
+        if data is None:
+            return None
+
+        if format != "png":
+            try:
+                from PIL import Image
+            except ImportError:
+                return None
+            pngdata = io.BytesIO()
+            Image.open(io.BytesIO(data)).save(pngdata, "PNG")
+            data = pngdata.getvalue()
+
+        return cairo.ImageSurface.create_from_png(io.BytesIO(data))
+
+    def draw_text_layer(self, lot):
+        doc = lot.data.get_value(self.time)
+        if not doc or not doc.text:
+            return
+
+        ctx = self.context
+        ctx.save()
+        ctx.select_font_face(doc.font_family)
+        ctx.set_font_size(doc.font_size)
+        ctx.set_source_rgb(*doc.color[:3])
+        line_height = doc.line_height or doc.font_size * 1.2
+        y = 0
+        for line in doc.text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+            width = ctx.text_extents(line).x_advance
+            if doc.justify == objects.text.TextJustify.Center:
+                x = -width / 2
+            elif doc.justify == objects.text.TextJustify.Right:
+                x = -width
+            else:
+                x = 0
+            ctx.move_to(x, y)
+            ctx.show_text(line)
+            y += line_height
+        ctx.restore()
+
+    def _on_shapegroup(self, group, out_parent):
+        if group.empty() or group.lottie.hidden:
+            return
+
+        ctx = self.context
+        transform = getattr(group.lottie, "transform", None)
+        opacity = 1
+        if transform is not None and transform.opacity is not None:
+            opacity = transform.opacity.get_value(self.time) / 100
+        if opacity <= 0:
+            return
+
+        # Groups with their own stroke are drawn whole in the fill pass of the parent
+        if group.stroke and out_parent.paint_pass == CairoPaint.StrokePass:
+            return
+
+        paint = out_parent.child(group)
+        ctx.save()
+        self.apply_transform(transform)
+        if opacity < 1:
+            ctx.push_group()
+        self.shapegroup_process_children(group, paint)
+        if opacity < 1:
+            ctx.pop_group_to_source()
+            ctx.paint_with_alpha(opacity)
+        ctx.restore()
+        return paint
+
+    def shapegroup_process_children(self, shapegroup, out_parent):
+        if not out_parent.split_stroke():
+            return super().shapegroup_process_children(shapegroup, out_parent)
+
+        # Like in the SVG builder, the stroke of the whole group is below all of its fills
+        for paint_pass in (CairoPaint.StrokePass, CairoPaint.FillPass):
+            out_parent.paint_pass = paint_pass
+            super().shapegroup_process_children(shapegroup, out_parent)
+        out_parent.paint_pass = None
+
+    def _on_merged_path(self, shape, shapegroup, out_parent):
+        self.context.new_path()
+        for path in shape.paths:
+            if not path.hidden:
+                self.append_path(path)
+        self.paint_path(out_parent)
+        return shape
+
+    def _on_shape(self, shape, shapegroup, out_parent):
+        if not isinstance(shape, objects.Shape) or shape.hidden:
+            return
+
+        self.context.new_path()
+        if isinstance(shape, objects.Rect):
+            self.append_rect(shape)
+        elif isinstance(shape, objects.Ellipse):
+            self.append_ellipse(shape)
+        elif isinstance(shape, objects.Path):
+            self.append_path(shape)
+        elif isinstance(shape, objects.Star):
+            self.append_bezier(shape._bezier_t(self.time))
+        else:
+            self.append_path(shape.to_bezier())
+        self.paint_path(out_parent)
+        return shape
+
+    def _on_shape_modifier(self, shape, shapegroup, out_parent):
+        if isinstance(shape.lottie, objects.Repeater):
+            return self.build_repeater(shape.lottie, shape.child, shapegroup, out_parent)
+        elif isinstance(shape.lottie, objects.RoundedCorners):
+            return self.build_rouded_corners(shape.lottie, shape.child, shapegroup, out_parent)
+        elif isinstance(shape.lottie, objects.Trim):
+            return self.build_trim_path(shape.lottie, shape.child, shapegroup, out_parent)
+        return self.shapegroup_process_child(shape.child, shapegroup, out_parent)
+
+    def build_repeater(self, shape, child, shapegroup, out_parent):
+        ncopies = int(round(shape.copies.get_value(self.time)))
+        if ncopies == 1:
+            return self.shapegroup_process_child(child, shapegroup, out_parent)
+
+        transform = objects.Transform()
+        so = shape.transform.start_opacity.get_value(self.time)
+        eo = shape.transform.end_opacity.get_value(self.time)
+        position = shape.transform.position.get_value(self.time)
+        rotation = shape.transform.rotation.get_value(self.time)
+        anchor_point = shape.transform.anchor_point.get_value(self.time)
+        copies = []
+        for i in range(ncopies-1, -1, -1):
+            of = i / (ncopies-1)
+            copies.append((transform.to_matrix(self.time), (so * of + eo * (1 - of)) / 100))
+            transform.position.value += position
+            transform.rotation.value += rotation
+            transform.anchor_point.value += anchor_point
+
+        ctx = self.context
+        for mat, opacity in reversed(copies):
+            ctx.save()
+            ctx.transform(cairo.Matrix(mat.a, mat.b, mat.c, mat.d, mat.tx, mat.ty))
+            ctx.push_group()
+            self.shapegroup_process_child(child, shapegroup, out_parent)
+            ctx.pop_group_to_source()
+            ctx.paint_with_alpha(opacity)
+            ctx.restore()
+        return shape
+
+    def append_rect(self, shape):
+        size = shape.size.get_value(self.time)
+        pos = shape.position.get_value(self.time)
+        rounded = shape.rounded.get_value(self.time)
+        if not rounded:
+            self.context.rectangle(pos[0] - size[0] / 2, pos[1] - size[1] / 2, size[0], size[1])
+            return
+
+        # Corners are clamped on each axis like rx on an SVG <rect>
+        rx = min(rounded, abs(size[0]) / 2)
+        ry = min(rounded, abs(size[1]) / 2)
+        left = pos[0] - size[0] / 2
+        top = pos[1] - size[1] / 2
+        right = left + size[0]
+        bottom = top + size[1]
+        ctx = self.context
+        ctx.new_sub_path()
+        for cx, cy, angle in (
+            (right - rx, top + ry, -math.pi / 2),
+            (right - rx, bottom - ry, 0),
+            (left + rx, bottom - ry, math.pi / 2),
+            (left + rx, top + ry, math.pi),
+        ):
+            ctx.save()
+            ctx.translate(cx, cy)
+            ctx.scale(rx, ry)
+            ctx.arc(0, 0, 1, angle, angle + math.pi / 2)
+            ctx.restore()
+        ctx.close_path()
+
+    def append_ellipse(self, shape):
+        size = shape.size.get_value(self.time)
+        pos = shape.position.get_value(self.time)
+        if size[0] <= 0 or size[1] <= 0:
+            return
+        ctx = self.context
+        ctx.save()
+        ctx.translate(pos[0], pos[1])
+        ctx.scale(size[0] / 2, size[1] / 2)
+        ctx.arc(0, 0, 1, 0, 2 * math.pi)
+        ctx.close_path()
+        ctx.restore()
+
+    def append_path(self, shape):
+        bez = shape.shape.get_value(self.time)
+        if isinstance(bez, list):
+            bez = bez[0]
+        self.append_bezier(bez)
+
+    def append_bezier(self, bez):
+        """!
+        Adds a Bezier to the current path of the context
+        """
+        vertices = bez.vertices
+        if not vertices:
+            return
+
+        ctx = self.context
+        in_tangents = bez.in_tangents
+        out_tangents = bez.out_tangents
+        ctx.move_to(vertices[0][0], vertices[0][1])
+        for i in range(1, len(vertices)):
+            self._curve_to(vertices[i-1], out_tangents[i-1], vertices[i], in_tangents[i])
+        if bez.closed:
+            self._curve_to(vertices[-1], out_tangents[-1], vertices[0], in_tangents[0])
+            ctx.close_path()
+
+    def _curve_to(self, qfrom, out_tangent, qto, in_tangent):
+        # Short tangents are dropped as in SvgBuilder._bezier_tangent
+        ox, oy = out_tangent[0], out_tangent[1]
+        if math.hypot(ox, oy) < self._tangent_threshold:
+            ox = oy = 0
+        ix, iy = in_tangent[0], in_tangent[1]
+        if math.hypot(ix, iy) < self._tangent_threshold:
+            ix = iy = 0
+        self.context.curve_to(
+            qfrom[0] + ox, qfrom[1] + oy,
+            qto[0] + ix, qto[1] + iy,
+            qto[0], qto[1],
+        )
+
+    def paint_path(self, paint):
+        """!
+        Fills and strokes the current path of the context
+        """
+        stroke = paint.stroke if paint.paint_pass != CairoPaint.FillPass else None
+        fill = paint.fill if paint.paint_pass != CairoPaint.StrokePass else None
+        if stroke and not paint.stroke_above:
+            self.stroke_path(stroke)
+        if fill:
+            self.fill_path(fill)
+        if stroke and paint.stroke_above:
+            self.stroke_path(stroke)
+        self.context.new_path()
+
+    def fill_path(self, fill):
+        opacity = fill.opacity.get_value(self.time) / 100
+        if opacity <= 0:
+            return
+        ctx = self.context
+        if fill.fill_rule == objects.FillRule.EvenOdd:
+            ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
+        else:
+            ctx.set_fill_rule(cairo.FILL_RULE_WINDING)
+        self.set_source(fill, opacity)
+        ctx.fill_preserve()
+
+    def stroke_path(self, stroke):
+        opacity = stroke.opacity.get_value(self.time) / 100
+        width = stroke.width.get_value(self.time)
+        if opacity <= 0 or width <= 0:
+            return
+
+        ctx = self.context
+        ctx.save()
+        ctx.set_line_width(width)
+        ctx.set_line_cap(_line_caps.get(stroke.line_cap, cairo.LINE_CAP_BUTT))
+        ctx.set_line_join(_line_joins.get(stroke.line_join, cairo.LINE_JOIN_MITER))
+        if stroke.miter_limit is not None:
+            ctx.set_miter_limit(stroke.miter_limit)
+
+        if stroke.dashes:
+            dashes = []
+            offset = 0
+            for dash in stroke.dashes:
+                if dash.type == objects.StrokeDashType.Offset:
+                    offset = dash.length.get_value(self.time)
+                else:
+                    dashes.append(dash.length.get_value(self.time))
+            if any(d > 0 for d in dashes):
+                ctx.set_dash(dashes, offset)
+
+        self.set_source(stroke, opacity)
+        ctx.stroke_preserve()
+        ctx.restore()
+
+    def set_source(self, style, opacity):
+        """!
+        Sets the context source from a fill or stroke
+        """
+        if isinstance(style, objects.Gradient):
+            self.context.set_source(self.gradient_pattern(style, opacity))
+        else:
+            color = style.color.get_value(self.time)
+            self.context.set_source_rgba(color[0], color[1], color[2], opacity)
+
+    def gradient_pattern(self, gradient, opacity):
+        spos = gradient.start_point.get_value(self.time)
+        epos = gradient.end_point.get_value(self.time)
+
+        if gradient.gradient_type == objects.GradientType.Radial:
+            a = gradient.highlight_angle.get_value(self.time) * math.pi / 180
+            l = gradient.highlight_length.get_value(self.time)
+            pattern = cairo.RadialGradient(
+                spos[0] + math.cos(a) * l, spos[1] + math.sin(a) * l, 0,
+                spos[0], spos[1], (epos - spos).length
+            )
+        else:
+            pattern = cairo.LinearGradient(spos[0], spos[1], epos[0], epos[1])
+
+        for off, color in gradient.colors.stops_at(self.time):
+            alpha = color[3] if len(color) > 3 else 1
+            pattern.add_color_stop_rgba(off, color[0], color[1], color[2], alpha * opacity)
+
+        return pattern
+
+
+def restructure(animation):
+    """!
+    Returns the restructured @p animation, which can be passed to render()
+    to avoid restructuring it for every frame
+    """
+    return CairoRenderer(None).get_restructured(animation)
+
+
+def render(animation, context, time=0, restructured=None):
+    """!
+    Draws the frame at @p time on @p context
+    """
+    CairoRenderer(context, time).process(animation, restructured)
+
+
+def render_surface(animation, time=0, scale=1, restructured=None):
+    """!
+    Renders the frame at @p time on a new ARGB32 image surface
+    @param animation    Animation to render
+    @param time         Frame to render
+    @param scale        Scale factor for the output size
+    @param restructured Result of restructure() for @p animation
+    @returns cairo.ImageSurface
+    """
+    surface = cairo.ImageSurface(
+        cairo.FORMAT_ARGB32,
+        int(math.ceil(animation.width * scale)),
+        int(math.ceil(animation.height * scale))
+    )
+    context = cairo.Context(surface)
+    if scale != 1:
+        context.scale(scale, scale)
+    render(animation, context, time, restructured)
+    surface.flush()
+    return surface
+
+
+def render_vector(surface_type, animation, fp, time=0, dpi=96):
+    """!
+    Renders the frame at @p time to a vector surface (like cairo.PDFSurface), in points
+    """
+    scale = 72 / dpi
+    surface = surface_type(fp, animation.width * scale, animation.height * scale)
+    context = cairo.Context(surface)
+    context.scale(scale, scale)
+    render(animation, context, time)
+    surface.finish()
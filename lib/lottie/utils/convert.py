@@ -0,0 +1,210 @@
+"""!
+Conversions between file formats using the importer and exporter registries
+
+Used by lottie_convert.py, including its batch mode converting many files in a single process.
+"""
+import os
+import glob
+import time
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from ..importers import importers
+from ..exporters import exporters
+from . import json_backend
+from . import render_cache
+
+
+def optimize(animation, level):
+    """!
+    Applies the optimization level of lottie_convert.py
+    @param animation Animation to optimize
+    @param level     0 for no optimization, 1 to truncate floats, 2 to truncate floats and names
+    """
+    if level == 1:
+        from .stripper import float_strip
+        float_strip(animation)
+    elif level >= 2:
+        from .stripper import heavy_strip
+        heavy_strip(animation)
+
+
+def convert(infile, outfile, importer, exporter, import_options={}, export_options={}, optimize_level=1, fps=None):
+    """!
+    Reads @p infile with @p importer and writes it to @p outfile with @p exporter
+    @param infile           Input file name or file object
+    @param outfile          Output file name or file object
+    @param importer         Importer or its slug
+    @param exporter         Exporter or its slug
+    @param import_options   Keyword arguments for the importer
+    @param export_options   Keyword arguments for the exporter
+    @param optimize_level   Passed to optimize()
+    @param fps              If not None, changes the frame rate of the animation
+    @returns The converted animation
+    """
+    if isinstance(importer, str):
+        importer = importers[importer]
+    if isinstance(exporter, str):
+        exporter = exporters[exporter]
+
+    animation = importer.process(infile, **import_options)
+    if fps:
+        animation.frame_rate = fps
+    optimize(animation, optimize_level)
+    exporter.process(animation, outfile, **export_options)
+    return animation
+
+
+def expand_inputs(inputs, extensions=None):
+    """!
+    Finds the files to convert
+    @param inputs       File names, directories (searched recursively) and glob patterns
+    @param extensions   If not None, only files in directories with these extensions are used
+    @returns Generator of (file name, path relative to the directory or pattern it was found in)
+    """
+    for input in inputs:
+        if os.path.isdir(input):
+            for root, dirs, files in os.walk(input):
+                dirs.sort()
+                for name in sorted(files):
+                    if extensions is None or os.path.splitext(name)[1][1:] in extensions:
+                        path = os.path.join(root, name)
+                        yield path, os.path.relpath(path, input)
+        elif os.path.exists(input) or not glob.has_magic(input):
+            yield input, os.path.basename(input)
+        else:
+            base = input[:min(i for i in (input.find("*"), input.find("?"), input.find("[")) if i != -1)]
+            base = os.path.dirname(base)
+            for path in sorted(glob.glob(input, recursive=True)):
+                if os.path.isfile(path):
+                    yield path, os.path.relpath(path, base or ".")
+
+
+def output_path(pattern, infile, relpath, ext):
+    """!
+    Builds the output file name for @p infile from @p pattern
+
+    The pattern can use these fields:
+    - `{dir}`   Directory of the input file
+    - `{name}`  Input file name without extension
+    - `{path}`  Input path relative to the directory or pattern it was found in, without extension
+    - `{ext}`   Extension of the output format
+    """
+    return pattern.format(
+        dir=os.path.dirname(infile) or ".",
+        name=os.path.splitext(os.path.basename(infile))[0],
+        path=os.path.splitext(relpath)[0],
+        ext=ext,
+    )
+
+
+## Outcome of converting a single file in batch_convert()
+ConversionResult = collections.namedtuple("ConversionResult", ["infile", "outfile", "error", "seconds"])
+
+
+class ConversionJob:
+    """!
+    Single file conversion for batch_convert(), picklable so it can run in a worker process
+    """
+    def __init__(self, infile, outfile, importer, exporter, import_options={}, export_options={},
+                 optimize_level=1, fps=None):
+        self.infile = infile
+        self.outfile = outfile
+        ## Slug of the importer
+        self.importer = importer
+        ## Slug of the exporter
+        self.exporter = exporter
+        self.import_options = import_options
+        self.export_options = export_options
+        self.optimize_level = optimize_level
+        self.fps = fps
+
+    def __call__(self):
+        start = time.monotonic()
+        try:
+            outdir = os.path.dirname(self.outfile)
+            if outdir:
+                os.makedirs(outdir, exist_ok=True)
+            convert(
+                self.infile, self.outfile, self.importer, self.exporter,
+                self.import_options, self.export_options, self.optimize_level, self.fps
+            )
+            error = None
+        except Exception as e:
+            error = "%s: %s" % (type(e).__name__, e)
+        return ConversionResult(self.infile, self.outfile, error, time.monotonic() - start)
+
+
+def check_outputs(jobs, overwrite=False, inputs=()):
+    """!
+    Finds batch jobs that would write over files used by the batch
+    @param jobs         List of ConversionJob
+    @param overwrite    Whether a job can replace its own input file
+    @param inputs       Other input files of the batch, which aren't converted
+    @returns (list of jobs that can run, list of ConversionResult for the refused ones)
+
+    Jobs are refused when their output is the input of any other job,
+    or when it's the same as the output of another job (in which case all of them are refused).
+    """
+    input_paths = collections.Counter(os.path.realpath(file) for file in inputs)
+    input_paths.update(os.path.realpath(job.infile) for job in jobs)
+    outputs = collections.Counter(os.path.realpath(job.outfile) for job in jobs)
+
+    valid = []
+    refused = []
+    for job in jobs:
+        infile = os.path.realpath(job.infile)
+        outfile = os.path.realpath(job.outfile)
+        if outputs[outfile] > 1:
+            error = "Output is shared with other files of the batch"
+        elif outfile == infile and input_paths[infile] == 1:
+            error = None if overwrite else "Output is the input file, use --overwrite to replace it"
+        elif outfile in input_paths:
+            error = "Output is an input of the batch"
+        else:
+            error = None
+
+        if error:
+            refused.append(ConversionResult(job.infile, job.outfile, error, 0))
+        else:
+            valid.append(job)
+    return valid, refused
+
+
+def _run_job(job):
+    return job()
+
+
+def _worker_init(json_backend_name, cache):
+    json_backend.set_backend(json_backend_name)
+    render_cache.set_cache(cache)
+
+
+def batch_convert(jobs, workers=1, json_backend_name=None, cache=None):
+    """!
+    Runs conversions, errors are reported in the results rather than raised
+    @param jobs                 Iterable of ConversionJob
+    @param workers              Number of processes converting files in parallel, 0 for one per CPU
+    @param json_backend_name    JSON backend used by the worker processes
+    @param cache                RenderCache used by the worker processes
+    @returns Generator of ConversionResult, in the same order as @p jobs
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(jobs)
+
+    if workers <= 1:
+        for job in jobs:
+            yield job()
+        return
+
+    with ProcessPoolExecutor(
+        workers, initializer=_worker_init, initargs=(json_backend_name, cache)
+    ) as pool:
+        # Only a few jobs are queued at a time so huge batches don't use up memory
+        pending = collections.deque(pool.submit(_run_job, job) for job in itertools.islice(jobs, workers * 2))
+        while pending:
+            result = pending.popleft().result()
+            for job in itertools.islice(jobs, 1):
+                pending.append(pool.submit(_run_job, job))
+            yield result
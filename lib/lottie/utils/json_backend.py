@@ -0,0 +1,165 @@
+"""!
+Pluggable JSON implementation used to read and write lottie files
+
+The fastest available library is used by default (orjson, ujson, python-rapidjson),
+falling back to the standard json module.
+The choice can be overridden with set_backend() or the @c LOTTIE_JSON_BACKEND environment variable.
+"""
+import os
+import json
+
+
+class JsonBackend:
+    """!
+    JSON backend using the standard json module, base for the other backends
+    """
+    ## Name used to select the backend
+    name = "json"
+
+    def loads(self, data):
+        """!
+        Parses @p data, either str or bytes
+        @throws json.JSONDecodeError on invalid input, whatever the backend
+        """
+        return json.loads(data)
+
+    def load(self, fp):
+        """!
+        Parses the contents of a text or binary file
+        """
+        return self.loads(fp.read())
+
+    def dumps(self, obj, indent=None):
+        """!
+        Returns @p obj serialized as str
+        """
+        return json.dumps(obj, indent=indent)
+
+    def dumps_bytes(self, obj, indent=None):
+        """!
+        Returns @p obj serialized as UTF-8 bytes
+        """
+        return self.dumps(obj, indent).encode("utf-8")
+
+    def dump(self, obj, fp, indent=None):
+        """!
+        Writes @p obj to the text file @p fp
+        """
+        fp.write(self.dumps(obj, indent))
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+    def dumps(self, obj, indent=None):
+        return self.dumps_bytes(obj, indent).decode("utf-8")
+
+    def dumps_bytes(self, obj, indent=None):
+        # orjson only supports 2 space indentation
+        if indent is None:
+            try:
+                return self.orjson.dumps(obj)
+            except TypeError:
+                # Values orjson doesn't handle (eg: integers too large)
+                pass
+        return super().dumps(obj, indent).encode("utf-8")
+
+
+class UjsonBackend(JsonBackend):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def loads(self, data):
+        try:
+            return self.ujson.loads(data)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+
+    def dumps(self, obj, indent=None):
+        try:
+            return self.ujson.dumps(obj, indent=indent or 0, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return super().dumps(obj, indent)
+
+
+class RapidjsonBackend(JsonBackend):
+    name = "rapidjson"
+
+    def __init__(self):
+        import rapidjson
+        self.rapidjson = rapidjson
+
+    def loads(self, data):
+        try:
+            return self.rapidjson.loads(data)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+
+    def dumps(self, obj, indent=None):
+        try:
+            return self.rapidjson.dumps(obj, indent=indent)
+        except (TypeError, ValueError, OverflowError):
+            return super().dumps(obj, indent)
+
+
+## Backend classes by name, in order of preference
+backend_types = {
+    cls.name: cls
+    for cls in [OrjsonBackend, UjsonBackend, RapidjsonBackend, JsonBackend]
+}
+_backend = None
+
+
+def available_backends():
+    """!
+    Returns the names of the backends that can be used
+    """
+    names = []
+    for name, cls in backend_types.items():
+        try:
+            cls()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def set_backend(name=None):
+    """!
+    Selects the backend used by get_backend()
+    @param name Name of the backend, if None the fastest available one is used
+    @returns The selected backend
+    @throws ImportError if the library for the requested backend isn't installed
+    """
+    global _backend
+    if name is None:
+        for cls in backend_types.values():
+            try:
+                _backend = cls()
+                break
+            except ImportError:
+                pass
+    elif name not in backend_types:
+        raise KeyError("Unknown JSON backend %r, choose from %s" % (name, ", ".join(backend_types)))
+    else:
+        _backend = backend_types[name]()
+    return _backend
+
+
+def get_backend():
+    """!
+    Returns the current backend
+    """
+    if _backend is None:
+        set_backend(os.environ.get("LOTTIE_JSON_BACKEND") or None)
+    return _backend
@@ -0,0 +1,218 @@
+"""!
+Incremental JSON writer for lottie objects
+
+Instead of building the dict returned by to_dict() for the whole animation and
+serializing it afterwards, the object tree is walked and the JSON text is written
+to the file as it's produced, so only the current leaf values are ever converted.
+The output is the same as serializing to_dict() with the standard json module.
+"""
+import io
+import json
+import inspect
+import operator
+
+from ..objects.base import LottieObject, LottieProp, PseudoList, _value_to_dict
+from ..objects.properties import AnimatableMixin
+
+
+class JsonStreamWriter:
+    """!
+    Writes lottie objects as JSON to a text or binary file
+    """
+    ## Values are written to the file when the buffered text exceeds this size
+    buffer_size = 1 << 16
+
+    def __init__(self, fp, indent=None):
+        ## Destination file
+        self.fp = fp
+        ## Indentation width, None for compact output
+        self.indent = indent
+        self._binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+        if indent is None:
+            self._item_separator = ","
+            self._key_separator = ":"
+            self._encoder = json.JSONEncoder(separators=(",", ":"))
+        else:
+            self._item_separator = ","
+            self._key_separator = ": "
+            self._encoder = json.JSONEncoder(indent=indent)
+        self._buffer = []
+        self._buffered = 0
+        self._steps = {}
+
+    def write(self, obj, **extra):
+        """!
+        Writes @p obj (a LottieObject or a value to_dict() could return) and flushes the buffered text
+        @param extra Additional keys appended to the root object
+        """
+        if extra:
+            self._write_object(obj, 0, extra)
+        else:
+            self._write_value(obj, 0)
+        self.flush()
+
+    def flush(self):
+        """!
+        Writes the buffered text to the file
+        """
+        if self._buffer:
+            text = "".join(self._buffer)
+            self.fp.write(text.encode("utf-8") if self._binary else text)
+            self._buffer = []
+            self._buffered = 0
+
+    def _write(self, text):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered > self.buffer_size:
+            self.flush()
+
+    def _newline(self, depth):
+        if self.indent is not None:
+            self._write("\n" + " " * (self.indent * depth))
+
+    def _write_leaf(self, value, depth):
+        text = self._encoder.encode(value)
+        if self.indent is not None and depth:
+            # Newlines only appear between tokens, strings have them escaped
+            text = text.replace("\n", "\n" + " " * (self.indent * depth))
+        self._write(text)
+
+    def _write_value(self, value, depth):
+        if isinstance(value, LottieObject):
+            self._write_object(value, depth)
+        elif isinstance(value, list) and any(isinstance(item, LottieObject) for item in value):
+            self._write_list(value, depth)
+        else:
+            self._write_leaf(value, depth)
+
+    def _write_list(self, items, depth):
+        if not items:
+            self._write("[]")
+            return
+
+        self._write("[")
+        for index, item in enumerate(items):
+            if index:
+                self._write(self._item_separator)
+            self._newline(depth + 1)
+            if isinstance(item, LottieObject):
+                self._write_object(item, depth + 1)
+            else:
+                self._write_leaf(_value_to_dict(item), depth + 1)
+        self._newline(depth)
+        self._write("]")
+
+    def _write_keyframes(self, keyframes, depth):
+        """!
+        Writes the keyframes of an animated property, each one converted on its own
+        """
+        if not keyframes:
+            self._write("[]")
+            return
+
+        self._write("[")
+        for index, keyframe in enumerate(keyframes):
+            value = keyframe.to_dict()
+            if index == len(keyframes) - 1:
+                # AnimatableMixin.to_dict() drops the easing of the last keyframe
+                value.pop("i", None)
+                value.pop("o", None)
+            if index:
+                self._write(self._item_separator)
+            self._newline(depth + 1)
+            self._write_leaf(value, depth + 1)
+        self._newline(depth)
+        self._write("]")
+
+    def _class_steps(self, cls):
+        """!
+        Returns the serialization steps for @p cls, mirroring LottieObjectMeta._compile_prop_serializer()
+        """
+        steps = self._steps.get(cls)
+        if steps is not None:
+            return steps
+
+        steps = []
+        for prop in cls._props:
+            key = json.dumps(prop.lottie)
+            if type(prop) is not LottieProp:
+                def get(obj, prop=prop):
+                    return None if prop.get(obj) is None else obj
+                steps.append((get, key, None, prop.to_dict))
+                continue
+
+            if inspect.isclass(prop.type) and issubclass(prop.type, LottieObject):
+                mode = "pseudo" if prop.list is PseudoList else "list" if prop.list else "object"
+            else:
+                mode = None
+            steps.append((operator.attrgetter(prop.name), key, mode, prop.compile_to_dict()))
+
+        self._steps[cls] = steps
+        return steps
+
+    def _write_object(self, obj, depth, extra=None):
+        keyframes = isinstance(obj, AnimatableMixin) and obj.animated and isinstance(obj.keyframes, list)
+        if not keyframes and (type(obj).to_dict is not LottieObject.to_dict or isinstance(obj, AnimatableMixin)):
+            # Static properties are small enough to be converted in one go,
+            # and objects with custom serialization need their to_dict() anyway
+            value = obj.to_dict()
+            if extra:
+                value.update(extra)
+            self._write_leaf(value, depth)
+            return
+
+        # Keys are written in the same order as a dict would keep them, with the last value set
+        entries = {}
+        for get, key, mode, convert in self._class_steps(type(obj)):
+            value = get(obj)
+            if value is not None:
+                entries[key] = (mode, convert, value)
+
+        if not entries and not extra:
+            self._write("{}")
+            return
+
+        self._write("{")
+        first = True
+        for key, (mode, convert, value) in entries.items():
+            if not first:
+                self._write(self._item_separator)
+            first = False
+            self._newline(depth + 1)
+            self._write(key)
+            self._write(self._key_separator)
+
+            if keyframes and value is obj.keyframes:
+                self._write_keyframes(value, depth + 1)
+            elif mode == "list" and isinstance(value, list):
+                self._write_list(value, depth + 1)
+            elif mode == "pseudo" and isinstance(value, LottieObject):
+                self._write_list([value], depth + 1)
+            elif mode == "object" and isinstance(value, LottieObject):
+                self._write_object(value, depth + 1)
+            else:
+                self._write_leaf(convert(value), depth + 1)
+
+        for key, value in (extra or {}).items():
+            if not first:
+                self._write(self._item_separator)
+            first = False
+            self._newline(depth + 1)
+            self._write(json.dumps(key))
+            self._write(self._key_separator)
+            self._write_leaf(value, depth + 1)
+
+        self._newline(depth)
+        self._write("}")
+
+
+def dump(obj, fp, indent=None, **extra):
+    """!
+    Writes @p obj as JSON to @p fp without building the full dict first
+    @param obj  Lottie object to write
+    @param fp   Text or binary file
+    @param indent Indentation width, None for compact output
+    @param extra Additional keys appended to the root object (eg: `tgs=1`)
+    """
+    JsonStreamWriter(fp, indent).write(obj, **extra)
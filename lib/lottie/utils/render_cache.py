@@ -0,0 +1,222 @@
+"""!
+On-disk cache of rendered files
+
+Exporters decorated with cached() look up their output in the cache selected with set_cache(),
+keyed by a hash of the animation and the export options, and only render on a miss.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import tempfile
+import functools
+
+
+class RenderCache:
+    """!
+    Directory of rendered files, evicting the least recently used ones when it exceeds a size
+    """
+    def __init__(self, path, max_size=256 * 1024 * 1024):
+        """!
+        @param path     Directory to store the files in, created if missing
+        @param max_size Maximum total size of the files in bytes
+        """
+        self.path = path
+        self.max_size = max_size
+        ## Number of lookups that found a file
+        self.hits = 0
+        ## Number of lookups that didn't find a file
+        self.misses = 0
+        ## Number of files removed to keep the cache within max_size
+        self.evictions = 0
+        self._last_used = 0
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(animation, exporter, options):
+        """!
+        Returns the cache key for rendering @p animation
+        @param animation    Animation to render
+        @param exporter     Name identifying the export function
+        @param options      Dict of options affecting the output
+        """
+        from .. import __version__
+        data = json.dumps(
+            [__version__, exporter, options, animation.to_dict()],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def file_name(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, key):
+        """!
+        Looks up a rendered file
+        @returns The path to the file or @c None if it isn't in the cache
+        """
+        path = self.file_name(key)
+        try:
+            self._touch(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, filename):
+        """!
+        Moves the file @p filename into the cache
+        @returns The path to the cached file
+        """
+        path = self.file_name(key)
+        os.replace(filename, path)
+        self._touch(path)
+        self.evict(path)
+        return path
+
+    def _touch(self, path):
+        # The modification time tracks when a file was last used,
+        # set explicitly as file system timestamps can be too coarse to order quick accesses
+        self._last_used = max(time.time_ns(), self._last_used + 1)
+        os.utime(path, ns=(self._last_used, self._last_used))
+
+    def temp_file(self, suffix=""):
+        """!
+        Creates a temporary file in the cache directory, to be moved into the cache with put()
+        @returns The path to the file
+        """
+        handle, filename = tempfile.mkstemp(suffix, ".tmp-", self.path)
+        os.close(handle)
+        return filename
+
+    def size(self):
+        """!
+        Total size of the cached files in bytes
+        """
+        return sum(size for mtime, size, path in self._entries())
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.path) as files:
+            for entry in files:
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def evict(self, keep=None):
+        """!
+        Removes the least recently used files until the cache fits in max_size
+        @param keep Path of a file not to remove
+        """
+        entries = self._entries()
+        total = sum(size for mtime, size, path in entries)
+        if total <= self.max_size:
+            return
+
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for mtime, size, path in self._entries():
+            os.remove(path)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_cache = None
+
+
+def set_cache(cache):
+    """!
+    Selects the cache used by cached() exporters
+    @param cache RenderCache, or @c None to disable caching
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    """!
+    Returns the cache used by cached() exporters, or @c None
+    """
+    return _cache
+
+
+def cached(ignore=(), by_extension=False):
+    """!
+    Decorator for export functions taking an animation, a file and options,
+    which makes them use the cache selected with set_cache()
+
+    The function renders to a temporary file (with the extension of the output file name, if any),
+    which is then stored in the cache and copied to the output.
+    @param ignore       Names of the options that don't affect the output
+    @param by_extension Whether the extension of the output file name affects the output
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = func.__module__ + "." + func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(animation, fp, *args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return func(animation, fp, *args, **kwargs)
+
+            bound = signature.bind(animation, fp, *args, **kwargs)
+            bound.apply_defaults()
+            options = {
+                key: value
+                for key, value in list(bound.arguments.items())[2:]
+                if key not in ignore
+            }
+            filename = fp if isinstance(fp, str) else getattr(fp, "name", None)
+            suffix = os.path.splitext(filename)[1] if isinstance(filename, str) else ""
+            if by_extension:
+                options["extension"] = suffix
+            key = cache.key(animation, name, options)
+
+            path = cache.get(key)
+            if path is None:
+                temp = cache.temp_file(suffix)
+                try:
+                    func(animation, temp, *args, **kwargs)
+                    path = cache.put(key, temp)
+                except BaseException:
+                    if os.path.exists(temp):
+                        os.remove(temp)
+                    raise
+
+            try:
+                if isinstance(fp, str):
+                    shutil.copyfile(path, fp)
+                else:
+                    with open(path, "rb") as cached_file:
+                        shutil.copyfileobj(cached_file, fp)
+            except FileNotFoundError:
+                # Evicted by another process sharing the cache
+                func(animation, fp, *args, **kwargs)
+        return wrapper
+    return decorator
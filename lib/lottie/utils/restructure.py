@@ -1,3 +1,5 @@
+import copy
+
 from .. import objects
 
 
@@ -10,7 +12,6 @@ class RestructuredLayer:
         self.shapegroup = None
         self.matte_target = False
         self.matte_source = None
-        self.matte_id = None
 
     def add(self, child):
         c = self.children_pre if self.structured else self.children_post
@@ -88,10 +89,17 @@ class AbstractBuilder:
     def _on_shape_modifier(self, shape, shapegroup, out_parent):
         raise NotImplementedError()
 
-    def process(self, animation: objects.Animation):
+    def process(self, animation: objects.Animation, restructured=None):
+        """!
+        Builds the output for @p animation
+        @param animation    Animation to process
+        @param restructured Result of get_restructured() for @p animation,
+            to reuse it when building several frames of the same animation
+        """
         out_parent = self._on_animation(animation)
 
-        restructured = self.restructure_animation(animation, self.merge_paths)
+        if restructured is None:
+            restructured = self.get_restructured(animation)
         for id, layers in restructured.precomp.items():
             self._on_precomp(id, out_parent, layers)
 
@@ -145,6 +153,16 @@ class AbstractBuilder:
         for shape in shapegroup.children:
             self.shapegroup_process_child(shape, shapegroup, out_parent)
 
+    def get_restructured(self, animation):
+        """!
+        Returns the restructured @p animation
+
+        The result can be passed to process() for other builders of the same type,
+        as long as the animation structure isn't changed in the meantime.
+        Builders don't modify it.
+        """
+        return self.restructure_animation(animation, self.merge_paths)
+
     def restructure_animation(self, animation, merge_paths):
         restr = RestructuredAnimation()
         restr.layers = self.restructure_layer_list(animation.layers, merge_paths)
@@ -227,3 +245,153 @@ class AbstractBuilder:
 
     def _custom_object_supported(self, shape):
         return False
+
+
+class PrecompTime:
+    def __init__(self, pcl: objects.PreCompLayer):
+        self.pcl = pcl
+
+    def get_time_offset(self, time, lot):
+        remap = time
+        if self.pcl.time_remapping:
+            remapf = self.pcl.time_remapping.get_value(time)
+            remap = lot.in_point * (1-remapf) + lot.out_point * remapf
+
+        return remap - self.pcl.start_time
+
+
+class FrameBuilder(AbstractBuilder):
+    """!
+    Base for builders that output the animation at a single frame
+
+    Keeps track of the time within precompositions and applies shape modifiers
+    by transforming the restructured shapes before they are built
+    """
+    def __init__(self, time=0):
+        super().__init__()
+        self.actual_time = time
+        self.precomp_times = []
+        self._current_layer = []
+
+    @property
+    def time(self):
+        time = self.actual_time
+        if self.precomp_times:
+            for pct in self.precomp_times:
+                time = pct.get_time_offset(time, self._current_layer[-1])
+        return time
+
+    def build_rouded_corners(self, shape, child, shapegroup, out_parent):
+        round_amount = shape.radius.get_value(self.time)
+        return self._modifier_process(child, shapegroup, out_parent, self._build_rouded_corners_shape, round_amount)
+
+    def _build_rouded_corners_shape(self, shape, round_amount):
+        if not isinstance(shape, objects.Shape):
+            return [shape]
+        path = shape.to_bezier()
+        bezier = path.shape.get_value(self.time).rounded(round_amount)
+        path.shape.clear_animation(bezier)
+        return [path]
+
+    def build_trim_path(self, shape, child, shapegroup, out_parent):
+        start = max(0, min(1, shape.start.get_value(self.time) / 100))
+        end = max(0, min(1, shape.end.get_value(self.time) / 100))
+        offset = shape.offset.get_value(self.time) / 360 % 1
+
+        multidata = {}
+        length = 0
+
+        if shape.multiple == objects.TrimMultipleShapes.Individually:
+            for visishape in reversed(list(self._modifier_foreach_shape(child))):
+                bez = visishape.to_bezier().shape.get_value(self.time)
+                local_length = bez.rough_length()
+                multidata[visishape] = (bez, length, local_length)
+                length += local_length
+
+        return self._modifier_process(
+            child, shapegroup, out_parent, self._build_trim_path_shape,
+            start+offset, end+offset, multidata, length
+        )
+
+    def _modifier_foreach_shape(self, shape):
+        if isinstance(shape, RestructuredShapeGroup):
+            for child in shape.children:
+                for chsh in self._modifier_foreach_shape(child):
+                    yield chsh
+        elif isinstance(shape, RestructuredPathMerger):
+            for p in shape.paths:
+                yield p
+        elif isinstance(shape, objects.Shape):
+            yield shape
+
+    def _modifier_process(self, child, shapegroup, out_parent, callback, *args):
+        children = self._modifier_process_child(child, shapegroup, out_parent, callback, *args)
+        return [self.shapegroup_process_child(ch, shapegroup, out_parent) for ch in children]
+
+    def _trim_offlocal(self, t, local_start, local_length, total_length):
+        gt = (t * total_length - local_start) / local_length
+        return max(0, min(1, gt))
+
+    def _build_trim_path_shape(self, shape, start, end, multidata, total_length):
+        if not isinstance(shape, objects.Shape):
+            return [shape]
+
+        if multidata:
+            bezier, local_start, local_length = multidata[shape]
+            if end > 1:
+                lstart = self._trim_offlocal(start, local_start, local_length, total_length)
+                lend = self._trim_offlocal(end-1, local_start, local_length, total_length)
+                out = []
+                if lstart < 1:
+                    out.append(objects.Path(bezier.segment(lstart, 1)))
+                if lend > 0:
+                    out.append(objects.Path(bezier.segment(0, lend)))
+                return out
+
+            lstart = self._trim_offlocal(start, local_start, local_length, total_length)
+            lend = self._trim_offlocal(end, local_start, local_length, total_length)
+            if lend <= 0 or lstart >= 1:
+                return []
+            if lstart <= 0 and lend >= 1:
+                return [objects.Path(bezier)]
+            seg = bezier.segment(lstart, lend)
+            return [objects.Path(seg)]
+
+        path = shape.to_bezier()
+        bezier = path.shape.get_value(self.time)
+        if end > 1:
+            bez1 = bezier.segment(start, 1)
+            bez2 = bezier.segment(0, end-1)
+            return [objects.Path(bez1), objects.Path(bez2)]
+        else:
+            seg = bezier.segment(start, end)
+            return [objects.Path(seg)]
+
+    def _modifier_process_children(self, shapegroup, out_parent, callback, *args):
+        # Modified copies, the restructured animation is shared between frames
+        modified = copy.copy(shapegroup)
+        modified.children = []
+        for shape in shapegroup.children:
+            children = self._modifier_process_child(shape, shapegroup, out_parent, callback, *args)
+            if shape is shapegroup.paths:
+                modified.paths = children[0] if children else self._modified_paths(shape, [])
+            modified.children.extend(children)
+        return modified
+
+    def _modified_paths(self, path_merger, paths):
+        modified = copy.copy(path_merger)
+        modified.paths = paths
+        return modified
+
+    def _modifier_process_child(self, shape, shapegroup, out_parent, callback, *args):
+        if isinstance(shape, RestructuredShapeGroup):
+            return [self._modifier_process_children(shape, out_parent, callback, *args)]
+        elif isinstance(shape, RestructuredPathMerger):
+            paths = []
+            for p in shape.paths:
+                paths.extend(callback(p, *args))
+            if paths:
+                return [self._modified_paths(shape, paths)]
+            return []
+        else:
+            return callback(shape, *args)
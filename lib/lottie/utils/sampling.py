@@ -0,0 +1,247 @@
+"""!
+Vectorized evaluation of animated properties over many frames at once
+
+@note requires numpy
+"""
+import math
+import numpy
+
+from ..nvector import NVector
+from ..objects.bezier import Bezier
+from ..objects.properties import (
+    AnimatableMixin, KeyframeBezier, OffsetKeyframe, ShapeProperty, Value
+)
+
+
+def flatten_value(value):
+    """!
+    Converts a property value into a flat list of floats
+    """
+    if isinstance(value, Bezier):
+        return [
+            c
+            for points in (value.vertices, value.in_tangents, value.out_tangents)
+            for point in points
+            for c in point.components
+        ]
+    elif isinstance(value, NVector):
+        return value.components
+    return [value]
+
+
+def easing_factors(x, h1x, h1y, h2x, h2y):
+    """!
+    Vectorized version of KeyframeBezier.y_at_x()
+
+    All the arguments are arrays of the same shape, with an element for each value to evaluate
+    """
+    step = KeyframeBezier.SAMPLE_STEP_SIZE
+    size = KeyframeBezier.SPLINE_TABLE_SIZE
+
+    ax = 1 - 3 * h2x + 3 * h1x
+    bx = 3 * h2x - 6 * h1x
+    cx = 3 * h1x
+
+    def bezier_x(t):
+        return ((ax * t + bx) * t + cx) * t
+
+    def slope_x(t):
+        return 3 * ax * t * t + 2 * bx * t + cx
+
+    # Initial guess from the spline sample table
+    sample_t = numpy.arange(size) * step
+    samples = ((ax[:, None] * sample_t + bx[:, None]) * sample_t + cx[:, None]) * sample_t
+    steps = numpy.cumprod(samples[:, 1:size-1] <= x[:, None], axis=1).sum(axis=1)
+    interval_starts = [0]
+    for i in range(size - 1):
+        interval_starts.append(interval_starts[-1] + step)
+    interval_start = numpy.array(interval_starts)[steps]
+
+    rows = numpy.arange(len(x))
+    sample_cur = samples[rows, steps]
+    sample_next = samples[rows, steps + 1]
+    t_guess = interval_start + (x - sample_cur) / (sample_next - sample_cur) * step
+    initial_slope = slope_x(t_guess)
+    t = t_guess
+
+    # Newton-Raphson
+    active = initial_slope >= KeyframeBezier.NEWTON_MIN_SLOPE
+    for i in range(KeyframeBezier.NEWTON_ITERATIONS):
+        slope = slope_x(t)
+        active &= slope != 0
+        t = numpy.where(active, t - (bezier_x(t) - x) / numpy.where(active, slope, 1), t)
+
+    # Binary subdivision for flat curves
+    subdivide = (initial_slope < KeyframeBezier.NEWTON_MIN_SLOPE) & (initial_slope != 0)
+    if subdivide.any():
+        start = interval_start
+        end = interval_start + step
+        for i in range(KeyframeBezier.SUBDIVISION_MAX_ITERATIONS):
+            mid = start + (end - start) / 2.0
+            t = numpy.where(subdivide, mid, t)
+            current_x = bezier_x(mid) - x
+            subdivide &= numpy.abs(current_x) >= KeyframeBezier.SUBDIVISION_PRECISION
+            end = numpy.where(current_x > 0, mid, end)
+            start = numpy.where(current_x > 0, start, mid)
+
+    ay = 1 - 3 * h2y + 3 * h1y
+    by = 3 * h2y - 6 * h1y
+    cy = 3 * h1y
+    return ((ay * t + by) * t + cy) * t
+
+
+class KeyframeTable:
+    """!
+    Keyframe data of an animated property laid out in arrays for vectorized evaluation
+
+    Segments are the intervals between consecutive keyframes
+    """
+    ## Segment keeps its start value
+    HOLD = 0
+    ## Segment interpolated with the keyframe easing curve
+    EASED = 1
+    ## Segment following a spatial bezier (position with tangents)
+    SPATIAL = 2
+
+    def __init__(self, prop: AnimatableMixin):
+        keyframes = prop.keyframes
+        count = len(keyframes)
+
+        resolved = [
+            kf.start if kf.start is not None else prop._value_before(i)
+            for i, kf in enumerate(keyframes)
+        ]
+        starts = [kf.start for kf in keyframes[:-1]]
+        ends = [
+            kf.end if kf.end is not None else resolved[i+1]
+            for i, kf in enumerate(keyframes[:-1])
+        ]
+
+        values = resolved + [prop._value_before(count)] + starts + ends
+        flat = [flatten_value(v) if v is not None else None for v in values]
+        self.size = max((len(v) for v in flat if v is not None), default=0)
+        if any(v is not None and len(v) != self.size for v in flat):
+            raise ValueError("Keyframe values have inconsistent sizes, they cannot be sampled as arrays")
+        nan = [math.nan] * self.size
+        flat = numpy.array([v if v is not None else nan for v in flat], dtype=float).reshape(-1, self.size)
+
+        ## Keyframe times
+        self.times = numpy.array([kf.time for kf in keyframes], dtype=float)
+        ## Value for times before or at the first keyframe
+        self.first = flat[0]
+        ## Value for times after the last keyframe
+        self.last = flat[count]
+        ## Segment start values
+        self.starts = flat[count+1:2*count]
+        ## Segment end values
+        self.ends = flat[2*count:]
+
+        self.modes = numpy.zeros(count - 1, dtype=numpy.int8)
+        self.handles = numpy.zeros((count - 1, 4))
+        self.spatial_tangents = numpy.zeros((count - 1, 2, self.size))
+        self.spatial_cubic = numpy.zeros(count - 1, dtype=bool)
+        for i, kf in enumerate(keyframes[:-1]):
+            if starts[i] is None or ends[i] is None or not kf.in_value or not kf.out_value:
+                continue
+            if isinstance(prop, ShapeProperty) and len(starts[i].vertices) != len(ends[i].vertices):
+                continue
+            if isinstance(kf, OffsetKeyframe) and kf.in_tan and kf.out_tan:
+                self.modes[i] = self.SPATIAL
+                self.spatial_tangents[i, 0, :len(kf.out_tan)] = kf.out_tan.components[:self.size]
+                self.spatial_tangents[i, 1, :len(kf.in_tan)] = kf.in_tan.components[:self.size]
+                self.spatial_cubic[i] = kf.out_tan.length != 0
+            else:
+                self.modes[i] = self.EASED
+                self.handles[i] = (kf.out_value.x, kf.out_value.y, kf.in_value.x, kf.in_value.y)
+
+    def evaluate(self, times):
+        """!
+        @param times 1D array of times
+        @returns 2D array with the flattened value for each time
+        """
+        index = numpy.searchsorted(self.times, times, side="left")
+        result = numpy.empty((len(times), self.size))
+        result[index == 0] = self.first
+        result[index == len(self.times)] = self.last
+
+        inner = (index > 0) & (index < len(self.times))
+        if not inner.any():
+            return result
+
+        seg = index[inner] - 1
+        seg_start = self.times[seg]
+        ratio = (times[inner] - seg_start) / (self.times[seg + 1] - seg_start)
+        start = self.starts[seg]
+        end = self.ends[seg]
+        modes = self.modes[seg]
+        values = start.copy()
+
+        eased = modes == self.EASED
+        if eased.any():
+            h = self.handles[seg[eased]]
+            factor = easing_factors(ratio[eased], h[:, 0], h[:, 1], h[:, 2], h[:, 3])[:, None]
+            values[eased] = start[eased] * (1 - factor) + end[eased] * factor
+
+        spatial = modes == self.SPATIAL
+        if spatial.any():
+            t = ratio[spatial][:, None]
+            u = 1 - t
+            p0 = start[spatial]
+            p3 = end[spatial]
+            cubic = self.spatial_cubic[seg[spatial]]
+            tangents = self.spatial_tangents[seg[spatial]]
+            p1 = p0 + tangents[:, 0]
+            p2 = p3 + tangents[:, 1]
+            # Same as Bezier.point_at(), which skips the handles if the out tangent is null
+            values[spatial] = numpy.where(
+                cubic[:, None],
+                p0 * u ** 3 + p1 * (3.0 * t * u ** 2) + p2 * (3.0 * t ** 2 * u) + p3 * t ** 3,
+                p0 * u + p3 * t
+            )
+
+        at_end = (modes != self.HOLD) & (ratio == 1)
+        values[at_end] = end[at_end]
+
+        result[inner] = values
+        return result
+
+
+def _sample_loop(prop, times):
+    flat = [flatten_value(prop.get_value(t)) for t in times]
+    if any(len(v) != len(flat[0]) for v in flat):
+        raise ValueError("Property values have inconsistent sizes, they cannot be sampled as arrays")
+    return numpy.array(flat, dtype=float).reshape(len(times), -1)
+
+
+def sample(prop: AnimatableMixin, times):
+    """!
+    Evaluates @p prop at all of @p times
+
+    @param prop  Animatable property
+    @param times Array-like of frame times
+    @returns A numpy array, with shape
+        - `times.shape` for Value
+        - `times.shape + (3, n_vertices, dimensions)` for ShapeProperty,
+          where the 3 items are vertices, in tangents, out tangents
+        - `times.shape + (dimensions,)` for other properties
+    """
+    times = numpy.asarray(times, dtype=float)
+    flat_times = times.reshape(-1)
+
+    if not prop.animated:
+        if prop.value is None:
+            data = numpy.full((len(flat_times), 1), math.nan)
+        else:
+            data = numpy.tile(numpy.array(flatten_value(prop.value), dtype=float), (len(flat_times), 1))
+    elif not prop.keyframes:
+        data = numpy.full((len(flat_times), 1), math.nan)
+    elif len(prop.keyframes) == 1 or numpy.all(numpy.diff([kf.time for kf in prop.keyframes]) >= 0):
+        data = KeyframeTable(prop).evaluate(flat_times)
+    else:
+        data = _sample_loop(prop, flat_times)
+
+    if isinstance(prop, Value):
+        return data[:, 0].reshape(times.shape)
+    elif isinstance(prop, ShapeProperty):
+        return data.reshape(times.shape + (3, -1, 2))
+    return data.reshape(times.shape + (-1,))
@@ -0,0 +1,104 @@
+"""!
+Detects frames that render identically to the previous one
+
+The state of a frame is made of the values of all the animated properties
+and the visibility of the layers, evaluated the same way renderers based on
+restructure.FrameBuilder do.
+Exporters can compare the states of consecutive frames to skip rendering
+long static stretches of an animation.
+"""
+from .. import objects
+from ..nvector import NVector
+from ..objects.base import ObjectVisitor
+from ..objects.bezier import Bezier
+from ..objects.properties import AnimatableMixin
+from ..objects.text import TextData
+from .restructure import PrecompTime
+
+
+def _freeze(value):
+    if isinstance(value, NVector):
+        return tuple(value.components)
+    if isinstance(value, Bezier):
+        return (
+            value.closed,
+            tuple(tuple(p.components) for p in value.vertices),
+            tuple(tuple(p.components) for p in value.in_tangents),
+            tuple(tuple(p.components) for p in value.out_tangents),
+        )
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    # Values taken as-is from keyframes (eg: text documents)
+    return id(value)
+
+
+class _LayerState:
+    def __init__(self, layer, precomp_times, properties):
+        self.layer = layer
+        self.precomp_times = precomp_times
+        self.properties = properties
+
+    def time(self, time):
+        for pct in self.precomp_times:
+            time = pct.get_time_offset(time, self.layer)
+        return time
+
+    def state(self, time):
+        local_time = self.time(time)
+        state = [_freeze(prop.get_value(local_time)) for prop in self.properties]
+        if not self.precomp_times:
+            state.append(self.layer.in_point <= time <= self.layer.out_point)
+        return state
+
+
+class SceneState:
+    """!
+    Computes a value that compares equal for frames rendering the same image
+    """
+    ## Maximum nesting level of precompositions
+    max_depth = 32
+
+    def __init__(self, animation: objects.Animation):
+        self._layers = []
+        self._precomps = {
+            asset.id: asset.layers
+            for asset in animation.assets or []
+            if isinstance(asset, objects.assets.Precomp)
+        }
+        self._collect(animation.layers or [], [])
+
+    def _collect(self, layers, precomp_times):
+        for layer in layers:
+            properties = self._animated_properties(layer)
+            if properties or not precomp_times:
+                self._layers.append(_LayerState(layer, precomp_times, properties))
+
+            if isinstance(layer, objects.PreCompLayer):
+                if len(precomp_times) >= self.max_depth:
+                    raise RecursionError("Precomposition nesting too deep")
+                self._collect(self._precomps.get(layer.reference_id, []), precomp_times + [PrecompTime(layer)])
+
+    @staticmethod
+    def _animated_properties(layer):
+        properties = []
+
+        class Visitor(ObjectVisitor):
+            def visit(self, object):
+                if isinstance(object, AnimatableMixin):
+                    if object.animated:
+                        properties.append(object)
+                elif isinstance(object, TextData):
+                    if len(object.keyframes) > 1:
+                        properties.append(object)
+
+        Visitor()(layer)
+        return properties
+
+    def __call__(self, time):
+        """!
+        Returns the state at @p time, a value which can be compared to the state of other frames
+        """
+        state = []
+        for layer in self._layers:
+            state += layer.state(time)
+        return tuple(state)
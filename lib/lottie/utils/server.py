@@ -0,0 +1,509 @@
+"""!
+Conversion server, exposing the importer and exporter registries over HTTP
+
+It listens on a local TCP port or a Unix socket, and runs conversions on a pool of worker
+processes that keep the importer and exporter modules loaded between requests.
+
+Endpoints:
+- `POST /convert/<exporter>?from=<importer>&<options>` converts the request body,
+  the input format can also be implied by a `filename` parameter.
+  Options are named like the lottie_convert.py command line options without the leading dashes
+  (eg: `frame=10`, `gif-workers=2`, `optimize=2`)
+- `GET /formats` lists the importers and exporters
+- `GET /metrics` returns request and conversion counters
+
+Uploads aren't trusted: only the importers in an allow-list are used (never the Python script one),
+options and image assets referring to local files are refused.
+Requests from web pages are refused too, as browsers send an Origin header and conversion requests
+need a Content-Type that can't be sent from a page without the server allowing it.
+"""
+import os
+import time
+import json
+import asyncio
+import argparse
+import tempfile
+import mimetypes
+import collections
+import urllib.parse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..importers import importers
+from ..exporters import exporters
+from ..objects.assets import Image
+from . import convert
+from . import json_backend
+from . import render_cache
+
+
+class RequestError(Exception):
+    """!
+    Error resulting in an HTTP error response
+    """
+    def __init__(self, status, message, headers={}):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+## Importers used by default
+default_importers = ["lottie", "sif", "svg", "dotlottie", "kra", "bmp"]
+
+## Importers running code from the input, never allowed
+unsafe_importers = {"py"}
+
+## Options reading local files
+unsafe_options = {"--bmp-frame-files"}
+
+## Content types a web page can send without a CORS preflight
+_simple_content_types = {"application/x-www-form-urlencoded", "multipart/form-data", "text/plain"}
+
+
+class UnsafeInputError(Exception):
+    """!
+    Raised by the workers when the uploaded file refers to local files
+    """
+
+
+class InputError(Exception):
+    """!
+    Raised by the workers when the uploaded file can't be imported
+    """
+
+
+class _OptionParser(argparse.ArgumentParser):
+    def error(self, message):
+        raise RequestError(400, message)
+
+
+def option_parser():
+    """!
+    Parser for the conversion options, the same as the ones of lottie_convert.py
+    """
+    parser = _OptionParser(add_help=False, conflict_handler="resolve")
+    importers.set_options(parser)
+    group = exporters.set_options(parser)
+    group.add_argument("--optimize", "-O", default=1, type=int, choices=[0, 1, 2])
+    group.add_argument("--fps", default=None, type=int)
+    return parser
+
+
+def _worker_init(json_backend_name, cache):
+    json_backend.set_backend(json_backend_name)
+    render_cache.set_cache(cache)
+    # Import the implementations in advance so requests don't wait for them
+    for loader in (importers, exporters):
+        for porter in loader:
+            try:
+                porter.callback
+            except ImportError:
+                pass
+
+
+def _worker_ready():
+    pass
+
+
+def _cache_stats():
+    cache = render_cache.get_cache()
+    return (cache.hits, cache.misses, cache.evictions) if cache else (0, 0, 0)
+
+
+def _check_local_files(animation):
+    # Images that aren't data URLs would be read from the server file system by the exporters
+    for asset in animation.assets or []:
+        if isinstance(asset, Image) and not asset.image.startswith("data:"):
+            raise UnsafeInputError("Image %r isn't embedded" % asset.id)
+
+
+def _run_conversion(data, importer, exporter, import_options, export_options, optimize_level, fps):
+    """!
+    Converts @p data in a worker process
+    @returns The output data and the changes to the render cache counters
+    """
+    before = _cache_stats()
+    # Files are used rather than memory buffers as some importers and exporters only work with file names
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infile = os.path.join(tmpdir, "input." + importers[importer].extensions[0])
+        outfile = os.path.join(tmpdir, "output." + exporters[exporter].extensions[0])
+        with open(infile, "wb") as f:
+            f.write(data)
+        try:
+            animation = importers[importer].process(infile, **import_options)
+        except Exception as e:
+            raise InputError("%s: %s" % (type(e).__name__, e))
+        if fps:
+            animation.frame_rate = fps
+        _check_local_files(animation)
+        convert.optimize(animation, optimize_level)
+        exporters[exporter].process(animation, outfile, **export_options)
+        with open(outfile, "rb") as f:
+            data = f.read()
+    return data, [after - before for before, after in zip(before, _cache_stats())]
+
+
+class ServerMetrics:
+    """!
+    Counters for the requests handled by a ConversionServer
+    """
+    def __init__(self):
+        self.start_time = time.time()
+        ## Number of requests received
+        self.requests = 0
+        ## Number of responses by HTTP status
+        self.responses = collections.Counter()
+        ## Number of successful conversions by exporter
+        self.conversions = collections.Counter()
+        ## Number of failed conversions by exporter
+        self.conversion_errors = collections.Counter()
+        ## Requests refused because too many conversions were pending
+        self.rejected = 0
+        ## Number of times the worker pool was restarted after a worker died
+        self.pool_restarts = 0
+        ## Conversions submitted to the workers and not yet finished
+        self.in_flight = 0
+        ## Total time spent waiting for conversions, in seconds
+        self.conversion_seconds = 0
+        ## Longest conversion, in seconds
+        self.max_conversion_seconds = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        ## Render cache hits, misses and evictions in the workers
+        self.render_cache = collections.Counter()
+
+    def to_dict(self):
+        conversions = sum(self.conversions.values())
+        return {
+            "uptime": time.time() - self.start_time,
+            "requests": self.requests,
+            "responses": {str(k): v for k, v in sorted(self.responses.items())},
+            "conversions": dict(self.conversions),
+            "conversion_errors": dict(self.conversion_errors),
+            "rejected": self.rejected,
+            "pool_restarts": self.pool_restarts,
+            "in_flight": self.in_flight,
+            "conversion_seconds": self.conversion_seconds,
+            "average_conversion_seconds": self.conversion_seconds / conversions if conversions else 0,
+            "max_conversion_seconds": self.max_conversion_seconds,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "render_cache": {key: self.render_cache[key] for key in ("hits", "misses", "evictions")},
+        }
+
+
+class ConversionServer:
+    """!
+    Asyncio HTTP server converting files with a pool of worker processes
+    """
+    ## Seconds to wait for a client to send a request before closing the connection
+    read_timeout = 30
+
+    def __init__(self, workers=0, queue_size=16, max_body_size=64 * 1024 * 1024, json_backend_name=None,
+                 cache=None, allowed_importers=default_importers):
+        """!
+        @param workers              Number of worker processes, 0 for one per CPU
+        @param queue_size           Conversions waiting for a worker before new requests get a 503 response
+        @param max_body_size        Maximum size of uploaded files in bytes
+        @param json_backend_name    JSON backend used by the workers
+        @param cache                RenderCache used by the workers
+        @param allowed_importers    Slugs of the importers that can be used, those in unsafe_importers are ignored
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers + queue_size
+        self.max_body_size = max_body_size
+        self.json_backend_name = json_backend_name
+        self.cache = cache
+        self.allowed_importers = set(allowed_importers) - unsafe_importers
+        self.metrics = ServerMetrics()
+        self.parser = option_parser()
+        self.pool = None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080, socket=None):
+        """!
+        Starts the worker pool and listens for connections
+        @param host     Address to listen on
+        @param port     TCP port to listen on
+        @param socket   If not None, path of a Unix socket to listen on instead of @p host and @p port
+        @returns The asyncio server
+        """
+        await self._start_pool()
+
+        if socket:
+            self.server = await asyncio.start_unix_server(self._handle_connection, socket)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def _start_pool(self):
+        # Workers forked from the server would inherit the sockets of the open connections,
+        # which then wouldn't be closed when the server is done with them
+        try:
+            context = multiprocessing.get_context("forkserver")
+        except ValueError:
+            context = None
+        self.pool = ProcessPoolExecutor(
+            self.workers, context, _worker_init, (self.json_backend_name, self.cache)
+        )
+        # Make the workers start (and load modules) before the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _worker_ready) for i in range(self.workers)))
+
+    async def _restart_pool(self, broken):
+        """!
+        Replaces the pool after a worker died, which makes ProcessPoolExecutor unusable
+        @param broken The pool that failed, if it has already been replaced nothing happens
+        """
+        if self.pool is not broken:
+            return
+        self.metrics.pool_restarts += 1
+        broken.shutdown(wait=False)
+        try:
+            await self._start_pool()
+        except BrokenProcessPool:
+            # Leave it to the next request to try again
+            pass
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+
+    async def serve_forever(self, *args, **kwargs):
+        await self.start(*args, **kwargs)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+                except RequestError as e:
+                    await self._send_error(writer, e, False)
+                    break
+
+                if request is None:
+                    break
+
+                method, path, query, headers, keep_alive, body = request
+                self.metrics.requests += 1
+                self.metrics.bytes_in += len(body)
+
+                try:
+                    self._check_headers(method, headers)
+                    status, content_type, data, extra_headers = await self._dispatch(method, path, query, body)
+                except RequestError as e:
+                    await self._send_error(writer, e, keep_alive)
+                else:
+                    await self._send(writer, status, content_type, data, extra_headers, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise RequestError(400, "Malformed header")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", ""):
+            raise RequestError(411, "Content-Length is required")
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length")
+        if length > self.max_body_size:
+            raise RequestError(413, "Request body larger than %s bytes" % self.max_body_size)
+
+        body = await reader.readexactly(length) if length else b""
+        url = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+        return method, urllib.parse.unquote(url.path), query, headers, keep_alive, body
+
+    def _check_headers(self, method, headers):
+        # Clients other than browsers don't send Origin, so this only blocks web pages
+        if "origin" in headers:
+            raise RequestError(403, "Cross-origin requests aren't allowed")
+
+        if method == "POST":
+            content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if not content_type or content_type in _simple_content_types:
+                raise RequestError(415, "Use a Content-Type like application/octet-stream")
+
+    async def _dispatch(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+
+        if parts == ["formats"] and method == "GET":
+            return 200, "application/json", self._json(self.formats()), {}
+
+        if parts == ["metrics"] and method == "GET":
+            return 200, "application/json", self._json(self.metrics.to_dict()), {}
+
+        if len(parts) == 2 and parts[0] == "convert":
+            if method != "POST":
+                raise RequestError(405, "Use POST to convert files", {"Allow": "POST"})
+            return await self.convert(parts[1], query, body)
+
+        raise RequestError(404, "Not found")
+
+    def formats(self):
+        """!
+        Lists the available importers and exporters
+        """
+        def porters(loader):
+            return [
+                {
+                    "slug": porter.slug,
+                    "name": porter.name,
+                    "extensions": porter.extensions,
+                    "options": [opt.name for opt in porter.extra_options] + sorted(porter.generic_options),
+                }
+                for porter in loader
+                if loader is exporters or porter.slug in self.allowed_importers
+            ]
+        return {"importers": porters(importers), "exporters": porters(exporters)}
+
+    def _parse_options(self, query):
+        importer = None
+        argv = []
+        for name, value in query:
+            if name == "from":
+                importer = importers.get(value)
+                if not importer or importer.slug not in self.allowed_importers:
+                    raise RequestError(400, "Unknown importer %r" % value)
+            elif name == "filename":
+                importer = importer or importers.get_from_filename(value)
+                if not importer or importer.slug not in self.allowed_importers:
+                    raise RequestError(400, "Unsupported input file %r" % value)
+            else:
+                option = "--" + name.replace("_", "-")
+                action = self.parser._option_string_actions.get(option)
+                if action is None:
+                    raise RequestError(400, "Unknown option %r" % name)
+                if option in unsafe_options:
+                    raise RequestError(400, "Option %r isn't allowed" % name)
+                if action.nargs == 0:
+                    if value.lower() not in ("0", "false", "no"):
+                        argv.append(option)
+                else:
+                    argv += [option, value]
+
+        if not importer:
+            raise RequestError(400, "Specify the input format with the from or filename parameters")
+
+        return importer, self.parser.parse_args(argv)
+
+    async def convert(self, exporter_slug, query, body):
+        """!
+        Handles a conversion request
+        @returns (status, content type, data, headers)
+        """
+        exporter = exporters.get(exporter_slug)
+        if not exporter:
+            raise RequestError(404, "Unknown exporter %r" % exporter_slug)
+
+        importer, ns = self._parse_options(query)
+        import_options = {opt.name: getattr(ns, opt.nsvar(importer.slug)) for opt in importer.extra_options}
+        export_options = exporter.argparse_options(ns)
+
+        if self.metrics.in_flight >= self.max_pending:
+            self.metrics.rejected += 1
+            raise RequestError(503, "Too many pending conversions", {"Retry-After": "1"})
+
+        self.metrics.in_flight += 1
+        start = time.monotonic()
+        pool = self.pool
+        try:
+            data, cache_stats = await asyncio.get_running_loop().run_in_executor(
+                pool, _run_conversion, body, importer.slug, exporter.slug,
+                import_options, export_options, ns.optimize, ns.fps
+            )
+        except UnsafeInputError as e:
+            self.metrics.conversion_errors[exporter.slug] += 1
+            raise RequestError(400, str(e))
+        except InputError as e:
+            self.metrics.conversion_errors[exporter.slug] += 1
+            raise RequestError(422, str(e))
+        except BrokenProcessPool:
+            self.metrics.conversion_errors[exporter.slug] += 1
+            await self._restart_pool(pool)
+            raise RequestError(503, "Conversion worker died", {"Retry-After": "1"})
+        except Exception as e:
+            self.metrics.conversion_errors[exporter.slug] += 1
+            raise RequestError(500, "%s: %s" % (type(e).__name__, e))
+        finally:
+            self.metrics.in_flight -= 1
+            elapsed = time.monotonic() - start
+            self.metrics.conversion_seconds += elapsed
+            self.metrics.max_conversion_seconds = max(self.metrics.max_conversion_seconds, elapsed)
+
+        self.metrics.conversions[exporter.slug] += 1
+        self.metrics.render_cache.update(dict(zip(("hits", "misses", "evictions"), cache_stats)))
+        filename = "output." + exporter.extensions[0]
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        return 200, content_type, data, {"Content-Disposition": "attachment; filename=\"%s\"" % filename}
+
+    def _json(self, value):
+        return json.dumps(value).encode("utf-8")
+
+    async def _send_error(self, writer, error, keep_alive):
+        data = self._json({"error": str(error)})
+        await self._send(writer, error.status, "application/json", data, error.headers, keep_alive)
+
+    async def _send(self, writer, status, content_type, data, headers, keep_alive):
+        self.metrics.responses[status] += 1
+        self.metrics.bytes_out += len(data)
+        head = [
+            "HTTP/1.1 %s %s" % (status, _reasons.get(status, "")),
+            "Content-Type: %s" % content_type,
+            "Content-Length: %s" % len(data),
+            "Connection: %s" % ("keep-alive" if keep_alive else "close"),
+        ]
+        head += ["%s: %s" % item for item in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+
+_reasons = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
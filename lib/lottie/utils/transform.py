@@ -147,10 +147,14 @@ class TransformMatrix:
         return m
 
     def __mul__(self, other):
+        a = self._mat
+        b = other._mat
         m = TransformMatrix()
-        for row in range(4):
-            for col in range(4):
-                m[row, col] = self.row(row).dot(other.column(col))
+        m._mat = [
+            a[row] * b[col] + a[row+1] * b[col+4] + a[row+2] * b[col+8] + a[row+3] * b[col+12]
+            for row in (0, 4, 8, 12)
+            for col in (0, 1, 2, 3)
+        ]
         return m
 
     def __imul__(self, other):
@@ -37,10 +37,13 @@ extras_require = {
     "trace": ["pillow", "pypotrace>=0.2", "numpy", "scipy"],
     "images": ["pillow"],
     "PNG": ["cairosvg"],
-    "GIF": ["cairosvg", "pillow"],
+    "cairo": ["pycairo"],
+    "GIF": ["cairosvg", "pillow", "numpy"],
     "text": ["fonttools"],
     "video": ["opencv-python", "pillow", "numpy"],
     "emoji": ["grapheme"],
+    "sampling": ["numpy"],
+    "json": ["orjson"],
     "GUI": ["QScintilla"],
 }
 extras_require["all"] = list(reduce(lambda a, b: a | b, map(set, extras_require.values())))
@@ -66,6 +69,7 @@ setuptools.setup(
         os.path.join("bin", "lottie_fonts.py"),
         os.path.join("bin", "lottie_printcolor.py"),
         os.path.join("bin", "lottie_diagnostic.py"),
+        os.path.join("bin", "lottie_server.py"),
     ],
     keywords="telegram stickers tgs lottie svg animation",
     # https://pypi.org/classifiers/
@@ -0,0 +1,112 @@
+import io
+import unittest
+from .. import base
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from PIL import Image, ImageDraw, ImageSequence, features
+    from lottie.exporters import gif
+except ImportError:
+    gif = None
+
+
+@unittest.skipIf(gif is None, "requires pillow and a renderer")
+class TestStreamWriters(base.TestCase):
+    def frames(self):
+        frames = []
+        for i in range(6):
+            image = Image.new("RGBA", (32, 24), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            draw.rectangle((i * 2, 2, i * 2 + 10, 20), fill=(255, 0, 0, 255))
+            draw.ellipse((16, 4, 30, 20), fill=(0, 0, 255, 255))
+            frames.append(image)
+        return frames
+
+    @unittest.skipIf(gif is not None and not features.check("webp"), "requires WebP support")
+    def test_webp(self):
+        frames = self.frames()
+        out = io.BytesIO()
+        writer = gif.WebPStreamWriter(out, 32, 24, 40, lossless=True)
+        for frame in frames:
+            writer.write(frame)
+        writer.close()
+
+        out.seek(0)
+        image = Image.open(out)
+        self.assertEqual(image.format, "WEBP")
+        self.assertEqual(image.size, (32, 24))
+        self.assertEqual(image.n_frames, len(frames))
+        for decoded, frame in zip(ImageSequence.Iterator(image), frames):
+            self.assertEqual(decoded.convert("RGBA").tobytes(), frame.tobytes())
+
+    def encode_gif(self, frames):
+        arrays = [
+            (numpy.asarray(frame)[..., :3], numpy.asarray(frame)[..., 3])
+            for frame in frames
+        ]
+        palette = gif.GifPalette.from_frames(arrays)
+
+        out = io.BytesIO()
+        writer = gif.GifStreamWriter(out, 32, 24, palette.palette, 40)
+        encoder = gif.GifDeltaEncoder(writer, 32, 24)
+        for rgb, alpha in arrays:
+            encoder.add(palette.quantize(rgb, alpha), 4)
+        encoder.close()
+        out.seek(0)
+        return out
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_gif(self):
+        frames = self.frames()
+        image = Image.open(self.encode_gif(frames))
+        self.assertEqual(image.format, "GIF")
+        self.assertEqual(image.n_frames, len(frames))
+        self.assertEqual(image.info["loop"], 0)
+        self.assertEqual(image.info["duration"], 40)
+        for decoded, frame in zip(ImageSequence.Iterator(image), frames):
+            decoded = numpy.asarray(decoded.convert("RGBA"))
+            frame = numpy.asarray(frame)
+            self.assertTrue(numpy.array_equal(decoded[..., 3], frame[..., 3]))
+            opaque = frame[..., 3] > 0
+            self.assertTrue(numpy.array_equal(decoded[opaque], frame[opaque]))
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_gif_delta(self):
+        frames = self.frames()
+        frames.insert(2, frames[1])
+        image = Image.open(self.encode_gif(frames))
+        # The duplicated frame extends the previous one
+        self.assertEqual(image.n_frames, len(frames) - 1)
+        image.seek(1)
+        self.assertEqual(image.info["duration"], 80)
+        # Only the moving rectangle is encoded after the first frame
+        image.seek(3)
+        self.assertLess(image.tile[0][1][2] - image.tile[0][1][0], 32)
+
+
+@unittest.skipIf(gif is None, "requires pillow and a renderer")
+class TestRenderFrames(base.TestCase):
+    def animation(self):
+        from lottie import objects
+        from lottie.nvector import NVector
+        anim = objects.Animation(5)
+        anim.width = anim.height = 16
+        layer = anim.add_layer(objects.ShapeLayer())
+        layer.add_shape(objects.Rect(NVector(8, 8), NVector(8, 8)))
+        layer.add_shape(objects.Fill())
+        return anim
+
+    def test_dedupe(self):
+        anim = self.animation()
+        frames = list(gif._render_frames("test", anim, range(6)))
+        self.assertEqual(len(frames), 6)
+        self.assertTrue(all(frame is frames[0] for frame in frames))
+
+        frames = list(gif._render_frames("test", anim, range(6), dedupe=False))
+        self.assertEqual(len(frames), 6)
+        self.assertEqual(len(set(map(id, frames))), 6)
+        self.assertTrue(all(frame == frames[0] for frame in frames))
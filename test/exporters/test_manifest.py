@@ -0,0 +1,43 @@
+import sys
+import inspect
+from .. import base
+from lottie.parsers.baseporter import LazyBaseporter, Loader
+from lottie.exporters import exporters
+from lottie.importers import importers
+
+
+class TestManifest(base.TestCase):
+    def test_lazy_import(self):
+        porter = LazyBaseporter("etree", "ElementTree", "XML", ["xml"])
+        porter.package = "xml"
+        self.assertIsNone(porter._callback)
+        self.assertIs(porter.callback, sys.modules["xml.etree"].ElementTree)
+
+    def test_requires(self):
+        porter = LazyBaseporter("foo", "foo", "Foo", ["foo"], requires=["json", ("not_a_module", "xml")])
+        self.assertIsNone(porter.missing_requirement())
+        porter.requires.append(("not_a_module", "not_a_module_either"))
+        self.assertEqual(porter.missing_requirement(), "not_a_module")
+
+    def test_failed(self):
+        loader = Loader(exporters._module_path + "/base.py", "lottie.exporters.base", "export")
+        self.assertIsInstance(loader.get("lottie"), LazyBaseporter)
+        for porter in loader:
+            self.assertNotIn(porter.module, loader.failed_modules)
+
+    def test_callbacks(self):
+        for loader in (exporters, importers):
+            for porter in loader:
+                if not isinstance(porter, LazyBaseporter):
+                    continue
+                with self.subTest(slug=porter.slug):
+                    try:
+                        callback = porter.callback
+                    except ImportError:
+                        continue
+                    params = inspect.signature(callback).parameters
+                    has_kwargs = any(p.kind == p.VAR_KEYWORD for p in params.values())
+                    for option in porter.extra_options:
+                        self.assertTrue(has_kwargs or option.dest in params, option.dest)
+                    for option in porter.generic_options:
+                        self.assertIn(option, params)
@@ -0,0 +1,51 @@
+import io
+from xml.etree import ElementTree
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+from lottie.parsers.svg.builder import to_svg
+from lottie.exporters.svg import export_svg, _print_pretty_xml
+
+
+class TestPrettyXml(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(10)
+        anim.name = "A & B"
+        layer = anim.add_layer(objects.ShapeLayer())
+        layer.add_shape(objects.Rect(NVector(50, 50), NVector(20, 20)))
+        layer.add_shape(objects.Fill(Color(1, 0, 0)))
+        return anim
+
+    def pretty(self, dom):
+        out = io.StringIO()
+        _print_pretty_xml(dom, out)
+        return out.getvalue()
+
+    def test_same_tree(self):
+        anim = self.animation()
+        dom = to_svg(anim, 0)
+        pretty = self.pretty(dom)
+        self.assertTrue(pretty.startswith("<?xml version=\"1.0\" ?>\n<svg "))
+        self.assertIn("\n   <defs/>\n", pretty)
+        self.assertIn("sodipodi:docname=\"A &amp; B\"", pretty)
+
+        parsed = ElementTree.fromstring(pretty.encode("utf-8"))
+        for expected, actual in zip(dom.getroot().iter(), parsed.iter()):
+            self.assertEqual(actual.tag.split("}")[-1], expected.tag.split("}")[-1])
+            expected_attrib = {k: v for k, v in expected.attrib.items() if k != "xmlns"}
+            self.assertEqual(actual.attrib, expected_attrib)
+
+    def test_text(self):
+        root = ElementTree.Element("svg")
+        text = ElementTree.SubElement(root, "text")
+        text.text = "1 < 2"
+        self.assertEqual(
+            self.pretty(ElementTree.ElementTree(root)),
+            "<?xml version=\"1.0\" ?>\n<svg>\n   <text>1 &lt; 2</text>\n</svg>\n"
+        )
+
+    def test_export(self):
+        out = io.StringIO()
+        export_svg(self.animation(), out)
+        self.assertEqual(len(ElementTree.fromstring(out.getvalue().encode("utf-8")).findall(".//{*}rect")), 1)
@@ -453,3 +453,18 @@ class TestAnimation(base.TestCase):
         self.assertNotIn(l1, an.layers)
         self.assertNotIn(l2, an.layers)
         self.assertIn(l3, an.layers)
+
+    def test_load_lazy(self):
+        an = objects.Animation()
+        layer = an.add_layer(objects.ShapeLayer())
+        layer.add_shape(objects.Rect(NVector(10, 10), NVector(20, 20)))
+        dic = an.to_dict()
+
+        lazy = objects.Animation.load(dic, True)
+        self.assertEqual(lazy.width, 512)
+        # Layers are needed to set up the composition, but their contents are still lazy
+        self.assertIs(lazy.layers[0].composition, lazy)
+        self.assertIn("shapes", lazy.layers[0]._lazy_props)
+        self.assertIsInstance(lazy.layers[0].shapes[0], objects.Rect)
+        self.assertEqual(lazy.layers[0].shapes[0].size.value, NVector(20, 20))
+        self.assertDictEqual(lazy.to_dict(), dic)
@@ -111,6 +111,31 @@ class TestLottieProp(TestCase):
         self.assertIsInstance(v, list)
         self.assertEqual(v, sv)
 
+    def test_compile_loader_scalar(self):
+        prop = base.LottieProp("foo", "f", float)
+        load = prop.compile_loader()
+        self.assertIsInstance(load(1), float)
+        self.assertEqual(load(1), 1.0)
+        self.assertEqual(load([2]), 2.0)
+        self.assertIsNone(load(None))
+
+    def test_compile_loader_lottie(self):
+        prop = base.LottieProp("foo", "f", TestEnum, True)
+        self.assertEqual(prop.compile_loader()([1, 2]), [TestEnum.Foo, TestEnum.Bar])
+
+    def test_compile_loader_converter(self):
+        prop = base.LottieProp("foo", "f", base.PseudoBool)
+        v = prop.compile_loader()(1)
+        self.assertIsInstance(v, bool)
+        self.assertEqual(v, True)
+
+    def test_compile_loader_nvector(self):
+        prop = base.LottieProp("foo", "f", NVector, base.PseudoList)
+        load = prop.compile_loader()
+        self.assertEqual(load([[1, 2, 3]]), NVector(1, 2, 3))
+        sv = NVector(4, 5)
+        self.assertIs(load(sv), sv)
+
     def test_basic_to_dict_enum(self):
         prop = base.LottieProp("foo", "f", TestEnum)
         v = prop._basic_to_dict(TestEnum.Foo)
@@ -141,6 +166,28 @@ class TestLottieProp(TestCase):
         self.assertIsInstance(v, int)
         self.assertEqual(v, 2)
 
+    def test_basic_to_dict_subclass(self):
+        class MyFloat(float):
+            pass
+        prop = base.LottieProp("foo", "f", float)
+        v = prop._basic_to_dict([MyFloat(2.0), MyFloat(2.5)])
+        self.assertEqual(v, [2, 2.5])
+        self.assertIsInstance(v[0], int)
+
+    def test_compile_to_dict(self):
+        prop = base.LottieProp("foo", "f", NVector)
+        self.assertEqual(prop.compile_to_dict()(NVector(1.0, 2.5)), [1, 2.5])
+
+    def test_compile_to_dict_pseudolist(self):
+        prop = base.LottieProp("foo", "f", NVector, base.PseudoList)
+        self.assertEqual(prop.compile_to_dict()(NVector(1, 2)), [[1, 2]])
+
+    def test_compile_to_dict_converter(self):
+        prop = base.LottieProp("foo", "f", base.PseudoBool)
+        v = prop.compile_to_dict()(True)
+        self.assertIsInstance(v, int)
+        self.assertEqual(v, 1)
+
     # TODO test stripper
     #def test_basic_to_dict_float_round(self):
         #prop = base.LottieProp("foo", "f", float)
@@ -192,6 +239,40 @@ class TestLottieObject(TestCase):
         self.assertEqual(obj.foo[0].bar, 456)
         self.assertEqual(obj.foo[0].foo, [])
 
+    def test_load_missing(self):
+        obj = Derived.load({"ft": 621, "nm": "foo"})
+        self.assertEqual(obj.awoo, 621)
+        self.assertEqual(obj.name, "foo")
+        self.assertIsNone(obj.bar)
+        self.assertIsNone(obj.foo)
+
+    def test_load_lazy(self):
+        dic = {"f": [{"f": [], "b": 456}], "b": 123}
+        obj = MockObject.load(dic, True)
+        self.assertEqual(obj.bar, 123)
+        self.assertNotIn("foo", vars(obj))
+        self.assertIs(obj._lazy_props["foo"][1], dic["f"])
+
+        self.assertEqual(obj.foo[0].bar, 456)
+        self.assertIn("foo", vars(obj))
+        self.assertNotIn("foo", obj._lazy_props)
+        self.assertNotIn("foo", vars(obj.foo[0]))
+        self.assertDictEqual(obj.to_dict(), dic)
+
+        with self.assertRaises(AttributeError):
+            obj.awoo
+
+    def test_load_lazy_missing(self):
+        obj = Derived.load({"ft": 621}, True)
+        self.assertIsNone(obj.foo)
+        self.assertFalse(getattr(obj, "_lazy_props", None))
+
+    def test_prop_loader_cached(self):
+        self.assertIs(MockObject._prop_loader(), MockObject._prop_loader())
+        self.assertIsNot(MockObject._prop_loader(), Derived._prop_loader())
+        self.assertIs(MockObject._prop_loader(True), MockObject._prop_loader(True))
+        self.assertIsNot(MockObject._prop_loader(True), MockObject._prop_loader())
+
     def test_find_list(self):
         obj = MockObject([MockObject([], 456), MockObject([], 789, "foo")], 123)
         self.assertEqual(obj.find("foo").bar, 789)
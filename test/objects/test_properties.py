@@ -89,6 +89,50 @@ class TestMultiDimensional(base.TestCase):
         self.assertEqual(md.get_value(3), NVector(4, 5))
         self.assertEqual(md.get_value(4), NVector(4, 5))
 
+    def test_get_value_many_keyframes(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        for i in range(0, 100, 10):
+            md.add_keyframe(i, NVector(i, i * 2))
+        self.assertEqual(md.get_value(-5), NVector(0, 0))
+        self.assertEqual(md.get_value(40), NVector(40, 80))
+        self.assert_nvector_equal(md.get_value(45), NVector(45, 90))
+        self.assertEqual(md.get_value(90), NVector(90, 180))
+        self.assertEqual(md.get_value(200), NVector(90, 180))
+
+    def test_get_value_add_keyframe_after_get(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        md.add_keyframe(0, NVector(0, 0))
+        md.add_keyframe(10, NVector(10, 10))
+        self.assertEqual(md.get_value(20), NVector(10, 10))
+        md.add_keyframe(30, NVector(30, 30))
+        self.assert_nvector_equal(md.get_value(20), NVector(20, 20))
+
+    def test_get_value_moved_keyframe(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        md.add_keyframe(0, NVector(0, 0))
+        md.add_keyframe(10, NVector(10, 10))
+        self.assert_nvector_equal(md.get_value(5), NVector(5, 5))
+        md.keyframes[-1].time = 20
+        md.invalidate_keyframe_cache()
+        self.assert_nvector_equal(md.get_value(5), NVector(2.5, 2.5))
+
+    def test_get_value_replaced_end(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        md.add_keyframe(0, NVector(0, 0))
+        md.add_keyframe(10, NVector(10, 10))
+        self.assertEqual(md.get_value(20), NVector(10, 10))
+        md.keyframes[0].end = NVector(3, 3)
+        self.assertEqual(md.get_value(10), NVector(3, 3))
+        self.assertEqual(md.get_value(20), NVector(3, 3))
+
+    def test_get_value_unsorted(self):
+        md = objects.MultiDimensional(NVector(0, 0))
+        md.add_keyframe(0, NVector(0, 0))
+        md.add_keyframe(10, NVector(10, 10))
+        md.add_keyframe(5, NVector(5, 5))
+        self.assertEqual(md.get_value(0), NVector(0, 0))
+        self.assert_nvector_equal(md.get_value(2), NVector(2, 2))
+
     def test_get_value_inconsistent(self):
         md = objects.MultiDimensional(NVector(0, 0))
         md.value = NVector(1, 2)
@@ -176,3 +220,31 @@ class TestMultiDimensional(base.TestCase):
         self.assertEqual(md.keyframes[1].end, None)
         self.assertEqual(md.keyframes[1].in_value, None)
         self.assertEqual(md.keyframes[1].out_value, None)
+
+
+class TestKeyframeEasing(base.TestCase):
+    def test_lerp_factor(self):
+        kf = objects.properties.OffsetKeyframe(0, NVector(0), NVector(1), objects.easing.Linear())
+        self.assertAlmostEqual(kf.lerp_factor(0.25), 0.25)
+        self.assertAlmostEqual(kf.lerp_factor(0.5), 0.5)
+
+    def test_solver_cached(self):
+        kf = objects.properties.OffsetKeyframe(0, NVector(0), NVector(1), objects.easing.Sigmoid())
+        self.assertIs(kf.easing_bezier(), kf.easing_bezier())
+
+    def test_solver_shared(self):
+        kf1 = objects.properties.OffsetKeyframe(0, NVector(0), NVector(1), objects.easing.Sigmoid())
+        kf2 = objects.properties.OffsetKeyframe(5, NVector(3), NVector(4), objects.easing.Sigmoid())
+        self.assertIs(kf1.easing_bezier(), kf2.easing_bezier())
+
+    def test_solver_handle_changed(self):
+        kf = objects.properties.OffsetKeyframe(0, NVector(0), NVector(1), objects.easing.Linear())
+        linear = kf.lerp_factor(0.25)
+        solver = kf.easing_bezier()
+
+        kf.out_value.x = 0.5
+        self.assertIsNot(kf.easing_bezier(), solver)
+        self.assertNotAlmostEqual(kf.lerp_factor(0.25), linear)
+
+        objects.easing.Linear()(kf)
+        self.assertAlmostEqual(kf.lerp_factor(0.25), linear)
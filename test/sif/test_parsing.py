@@ -12,10 +12,11 @@ class TestParseFile(base.TestCase):
     def assert_strong_equal(self, a, b):
         ta = type(a)
         tb = type(b)
-        if ta == tb or issubclass(tb, ta):
+        # Vectors referenced by guid are parsed as a NVector subclass
+        if ta == tb or issubclass(tb, ta) or issubclass(ta, tb):
             if ta is float:
                 self.assertAlmostEqual(a, b)
-            elif ta is NVector:
+            elif issubclass(ta, NVector):
                 self.assertEqual(len(a), len(b))
                 for ia, ib in zip(a, b):
                     self.assertAlmostEqual(ia, ib)
@@ -132,6 +133,7 @@ class TestParseFile(base.TestCase):
         guid = "735D9D04C276A32CAE9D9F045DFF318B"
         self.assert_strong_equal(layer.origin.value, self.canvas.get_object(guid))
         self.assertIs(layer.origin.value, self.canvas.get_object(guid))
+        self.assertEqual(layer.origin.value.guid, guid)
 
     def _check_layer_rectangle(self, layer):
         self.assertIsInstance(layer, api.RectangleLayer)
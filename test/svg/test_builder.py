@@ -0,0 +1,103 @@
+from xml.etree import ElementTree
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+from lottie.parsers.svg.builder import to_svg, SvgBuilder, IncrementalSvgBuilder
+
+
+class TestIncrementalSvgBuilder(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(30)
+        layer = anim.add_layer(objects.ShapeLayer())
+        group = layer.add_shape(objects.Group())
+        ellipse = group.add_shape(objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        ellipse.position.add_keyframe(0, NVector(0, 0))
+        ellipse.position.add_keyframe(30, NVector(100, 50))
+        group.add_shape(objects.Rect(NVector(50, 50), NVector(20, 20)))
+        fill = group.add_shape(objects.Fill(Color(1, 0, 0)))
+        fill.color.add_keyframe(0, Color(1, 0, 0))
+        fill.color.add_keyframe(30, Color(0, 0, 1))
+        stroke = group.add_shape(objects.Stroke(Color(0, 0, 0), 1))
+        stroke.width.add_keyframe(0, 0)
+        stroke.width.add_keyframe(30, 10)
+        layer.transform.opacity.add_keyframe(0, 100)
+        layer.transform.opacity.add_keyframe(30, 0)
+
+        static = anim.add_layer(objects.ShapeLayer())
+        static.add_shape(objects.Rect(NVector(50, 50), NVector(20, 20)))
+        static.add_shape(objects.Fill(Color(0, 1, 0)))
+        static.out_point = 15
+
+        self.group = group
+        return anim
+
+    def assert_frames(self, anim, frames):
+        builder = IncrementalSvgBuilder(anim)
+        for frame in frames:
+            self.assertEqual(
+                ElementTree.tostring(builder.frame(frame).getroot()),
+                ElementTree.tostring(to_svg(anim, frame).getroot()),
+            )
+        return builder
+
+    def test_same_output(self):
+        self.assert_frames(self.animation(), [0, 1, 2, 10, 15, 16, 30, 5, 0])
+
+    def test_updates(self):
+        builder = self.assert_frames(self.animation(), [1])
+        dom = builder.frame(1)
+        self.assertIs(builder.frame(2), dom)
+        self.assertIs(builder.frame(10), dom)
+        # The static layer disappears
+        self.assertIsNot(builder.frame(16), dom)
+
+    def test_modifier(self):
+        anim = self.animation()
+        trim = self.group.insert_shape(2, objects.Trim())
+        trim.end.add_keyframe(0, 0)
+        trim.end.add_keyframe(30, 100)
+        self.assert_frames(anim, range(0, 31, 3))
+
+
+class TestRestructuredReuse(base.TestCase):
+    """!
+    Checks that process(animation, restructured=...) reuses the given result,
+    and that without it every build restructures the animation as it is
+    """
+    def animation(self):
+        anim = objects.Animation(30)
+        layer = anim.add_layer(objects.ShapeLayer())
+        layer.add_shape(objects.Rect(NVector(50, 50), NVector(20, 20)))
+        trim = layer.add_shape(objects.Trim())
+        trim.end.add_keyframe(0, 0)
+        trim.end.add_keyframe(30, 100)
+        layer.add_shape(objects.Fill(Color(1, 0, 0)))
+        return anim
+
+    def svg(self, anim, frame):
+        return ElementTree.tostring(to_svg(anim, frame).getroot())
+
+    def test_reuse(self):
+        anim = self.animation()
+        restructured = SvgBuilder().get_restructured(anim)
+        for frame in (10, 20):
+            self.assertEqual(
+                ElementTree.tostring(to_svg(anim, frame, restructured).getroot()),
+                self.svg(anim, frame)
+            )
+
+    def test_modifiers_not_kept(self):
+        anim = self.animation()
+        expected = self.svg(objects.Animation.load(anim.to_dict()), 20)
+        self.svg(anim, 10)
+        self.assertEqual(self.svg(anim, 20), expected)
+
+    def test_edit_without_restructured(self):
+        anim = self.animation()
+        self.assertEqual(self.svg(anim, 10).count(b"<path"), 1)
+        anim.layers[0].insert_shape(0, objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        self.assertEqual(self.svg(anim, 10).count(b"<ellipse"), 1)
+
+        anim.add_layer(objects.ShapeLayer()).add_shape(objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        self.assertEqual(self.svg(anim, 10).count(b"<ellipse"), 2)
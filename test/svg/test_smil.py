@@ -0,0 +1,87 @@
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+from lottie.objects import easing
+from lottie.parsers.svg.smil import to_animated_svg
+
+
+class TestSmilSvgBuilder(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(30)
+        anim.frame_rate = 30
+        layer = anim.add_layer(objects.ShapeLayer())
+        self.ellipse = layer.add_shape(objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        self.fill = layer.add_shape(objects.Fill(Color(1, 0, 0)))
+        self.layer = layer
+        return anim
+
+    def animations(self, anim, name):
+        svg = to_animated_svg(anim).getroot()
+        return [
+            element
+            for element in svg.iter()
+            if element.tag in ("animate", "animateTransform") and element.attrib["attributeName"] == name
+        ]
+
+    def test_static(self):
+        anim = self.animation()
+        self.assertEqual(self.animations(anim, "cx"), [])
+        self.assertEqual(len(to_animated_svg(anim).getroot().findall(".//ellipse")), 1)
+
+    def test_easing(self):
+        anim = self.animation()
+        self.ellipse.position.add_keyframe(0, NVector(0, 0), easing.EaseIn(0.25))
+        self.ellipse.position.add_keyframe(15, NVector(100, 50), easing.Linear())
+        self.ellipse.position.add_keyframe(30, NVector(0, 0))
+
+        cx = self.animations(anim, "cx")
+        self.assertEqual(len(cx), 1)
+        self.assertEqual(cx[0].attrib["values"], "0;100;0")
+        self.assertEqual(cx[0].attrib["keyTimes"], "0;0.5;1")
+        self.assertEqual(cx[0].attrib["calcMode"], "spline")
+        self.assertEqual(cx[0].attrib["keySplines"], "0.25 0 1 1;0 0 1 1")
+        self.assertEqual(cx[0].attrib["dur"], "1.0s")
+        self.assertEqual(cx[0].attrib["repeatCount"], "indefinite")
+
+    def test_hold(self):
+        anim = self.animation()
+        self.fill.color.add_keyframe(0, Color(1, 0, 0), easing.Jump())
+        self.fill.color.add_keyframe(15, Color(0, 0, 1))
+
+        # Both the layer and the ellipse have the fill style
+        fill = self.animations(anim, "fill")
+        self.assertEqual(len(fill), 2)
+        self.assertEqual(fill[0].attrib["values"], "rgb(255, 0, 0);rgb(255, 0, 0);rgb(0, 0, 255);rgb(0, 0, 255)")
+        self.assertEqual(fill[0].attrib["keyTimes"], "0;0.5;0.5;1")
+
+        # Animated properties are moved out of the style so the animation applies
+        ellipse = to_animated_svg(anim).getroot().find(".//ellipse")
+        self.assertEqual(ellipse.attrib["fill"], "rgb(255, 0, 0)")
+        self.assertNotIn("fill:", ellipse.attrib["style"])
+
+    def test_sampled(self):
+        anim = self.animation()
+        self.layer.transform.position.add_keyframe(0, NVector(0, 0), in_tan=NVector(0, 10), out_tan=NVector(10, 0))
+        self.layer.transform.position.add_keyframe(30, NVector(100, 100))
+
+        translate = [
+            element
+            for element in self.animations(anim, "transform")
+            if element.attrib["type"] == "translate"
+        ]
+        self.assertEqual(len(translate), 2)
+        self.assertEqual(translate[0].attrib["additive"], "replace")
+        self.assertEqual(len(translate[0].attrib["values"].split(";")), 31)
+        self.assertNotIn("keySplines", translate[0].attrib)
+        self.assertEqual(translate[1].attrib["values"], "0 0")
+
+    def test_visibility(self):
+        anim = self.animation()
+        self.layer.in_point = 10
+        layer = to_animated_svg(anim).getroot().find(".//g")
+        self.assertEqual(layer.attrib["display"], "none")
+        display = self.animations(anim, "display")
+        self.assertEqual(len(display), 1)
+        self.assertEqual(display[0].attrib["values"], "none;inline")
+        self.assertEqual(display[0].attrib["calcMode"], "discrete")
@@ -0,0 +1,60 @@
+import os
+import sys
+import subprocess
+from . import base
+
+
+lib = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+
+## Modules that are slow to import and shouldn't be loaded unless needed
+heavy_modules = ["numpy", "PIL", "cv2", "fontTools", "cairosvg", "cairo", "distutils", "subprocess"]
+
+
+class TestImportTime(base.TestCase):
+    ## Upper bound for the cumulative import time of `lottie` in microseconds, way above the expected value
+    budget = 200000
+
+    def import_times(self, code):
+        """!
+        Runs @p code with `python -X importtime` and returns the cumulative time for each imported module
+        """
+        env = dict(os.environ, PYTHONPATH=lib)
+        env.pop("LOTTIE_JSON_BACKEND", None)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True, universal_newlines=True
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, name = line[len("import time:"):].split("|")
+                if cumulative.strip().isdigit():
+                    times[name.strip()] = int(cumulative)
+        return times
+
+    def assert_not_imported(self, times, modules):
+        for module in modules:
+            self.assertNotIn(module, times)
+
+    def test_lottie(self):
+        times = self.import_times("import lottie; lottie.__version__")
+        self.assert_not_imported(times, heavy_modules + [
+            "lottie.objects", "lottie.parsers", "lottie.utils", "lottie.exporters", "lottie.importers"
+        ])
+        self.assertLess(times["lottie"], self.budget)
+
+    def test_lazy_attributes(self):
+        times = self.import_times("import lottie; lottie.objects.Animation; lottie.Color")
+        self.assertIn("lottie.objects.animation", times)
+        self.assertIn("lottie.utils.color", times)
+        self.assert_not_imported(times, heavy_modules + ["lottie.parsers", "lottie.exporters"])
+
+    def test_convert(self):
+        # What lottie_convert.py needs to convert between lottie and tgs
+        times = self.import_times(
+            "from lottie.exporters import exporters; from lottie.importers import importers; "
+            "list(exporters); list(importers); exporters['tgs'].callback; importers['lottie'].callback"
+        )
+        self.assert_not_imported(times, heavy_modules + [
+            "lottie.parsers.svg", "lottie.parsers.sif", "lottie.exporters.gif", "lottie.importers.raster"
+        ])
@@ -0,0 +1,53 @@
+from .base import TestCase
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+
+
+class TestNVector(TestCase):
+    def test_add(self):
+        self.assert_nvector_equal(NVector(1, 2) + NVector(3, 4), NVector(4, 6))
+        self.assert_nvector_equal(NVector(1, 2, 3) + NVector(3, 4, 5), NVector(4, 6, 8))
+        self.assert_nvector_equal(NVector(1, 2, 3, 4) + NVector(1, 1, 1, 1), NVector(2, 3, 4, 5))
+
+    def test_sub(self):
+        self.assert_nvector_equal(NVector(1, 2) - NVector(3, 5), NVector(-2, -3))
+        self.assert_nvector_equal(NVector(1, 2, 3) - NVector(1, 1, 1), NVector(0, 1, 2))
+
+    def test_mul(self):
+        self.assert_nvector_equal(NVector(1, 2) * 2, NVector(2, 4))
+        self.assert_nvector_equal(NVector(1, 2, 3) * 2, NVector(2, 4, 6))
+        self.assert_nvector_equal(NVector(1, 2) * NVector(3, 4), NVector(3, 8))
+
+    def test_div(self):
+        self.assert_nvector_equal(NVector(2, 4) / 2, NVector(1, 2))
+        self.assert_nvector_equal(NVector(2, 4, 6) / 2, NVector(1, 2, 3))
+
+    def test_lerp(self):
+        self.assert_nvector_equal(NVector(0, 10).lerp(NVector(10, 20), 0.25), NVector(2.5, 12.5))
+        self.assert_nvector_equal(NVector(0, 0, 0).lerp(NVector(4, 8, 12), 0.5), NVector(2, 4, 6))
+        self.assert_nvector_equal(NVector(0, 0, 0, 0).lerp(NVector(4, 8, 12, 16), 0.5), NVector(2, 4, 6, 8))
+
+    def test_length(self):
+        self.assertAlmostEqual(NVector(3, 4).length, 5)
+        self.assertAlmostEqual(NVector(2, 3, 6).length, 7)
+
+    def test_result_type(self):
+        c = Color(0, 0.5, 1) + Color(0.5, 0.5, 0)
+        self.assertIsInstance(c, Color)
+        self.assertEqual(c.components, [0.5, 1, 1, 2])
+        self.assertIsInstance(Color(0, 0, 0).lerp(Color(1, 1, 1), 0.5), Color)
+
+    def test_result_independent(self):
+        a = NVector(1, 2)
+        b = -a
+        b.x = 5
+        self.assertEqual(a.components, [1, 2])
+
+    def test_iter(self):
+        self.assertEqual(list(NVector(1, 2, 3)), [1, 2, 3])
+
+    def test_slots(self):
+        a = NVector(1, 2)
+        self.assertFalse(hasattr(a, "__dict__"))
+        with self.assertRaises(AttributeError):
+            a.guid = "foo"
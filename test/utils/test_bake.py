@@ -0,0 +1,99 @@
+import unittest
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.objects import easing
+from lottie.utils.color import Color
+
+try:
+    import numpy
+    from lottie.utils import bake
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestBake(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(10)
+        layer = anim.add_layer(objects.ShapeLayer())
+        self.ellipse = layer.add_shape(objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        self.ellipse.position.add_keyframe(0, NVector(0, 0))
+        self.ellipse.position.add_keyframe(10, NVector(100, 50), easing.Sigmoid())
+        self.fill = layer.add_shape(objects.Fill(Color(1, 0, 0)))
+        self.fill.color.add_keyframe(0, Color(1, 0, 0))
+        self.fill.color.add_keyframe(10, Color(0, 0, 1))
+        layer.transform.rotation.add_keyframe(0, 0)
+        layer.transform.rotation.add_keyframe(10, 90)
+        self.layer = layer
+        return anim
+
+    def test_bake(self):
+        anim = self.animation()
+        expected = [self.ellipse.position.get_value(i) for i in range(11)]
+        baked = bake.bake(anim, numpy.float64)
+        self.assertIn(self.ellipse.position, baked)
+        self.assertIn(self.fill.color, baked)
+        self.assertNotIn(self.ellipse.size, baked)
+        self.assertEqual(len(baked[self.ellipse.position]), 11)
+
+        for i in range(11):
+            self.assert_nvector_equal(self.ellipse.position.get_value(i), expected[i], places=9)
+            self.assertEqual(
+                baked[self.ellipse.position].row(i).tolist(),
+                self.ellipse.position.get_value(i).components
+            )
+
+        self.assertIsInstance(self.fill.color.get_value(5), Color)
+        self.assertAlmostEqual(self.layer.transform.rotation.get_value(5), 45)
+        self.assertIsInstance(self.layer.transform.rotation.get_value(5), float)
+
+    def test_dtype(self):
+        anim = self.animation()
+        baked = bake.bake(anim)
+        self.assertEqual(baked[self.ellipse.position].values.dtype, numpy.float64)
+        self.assertEqual(baked.nbytes, 11 * 8 * (2 + 4 + 1))
+        baked.remove()
+
+        baked = bake.bake(anim, numpy.float32)
+        self.assertEqual(baked[self.ellipse.position].values.dtype, numpy.float32)
+        self.assertEqual(baked.nbytes, 11 * 4 * (2 + 4 + 1))
+
+    def test_non_frame_time(self):
+        anim = self.animation()
+        expected = self.ellipse.position.get_value(2.5)
+        bake.bake(anim)
+        self.assertEqual(self.ellipse.position.get_value(2.5), expected)
+        self.assertEqual(self.ellipse.position.get_value(20), NVector(100, 50))
+
+    def test_remove(self):
+        anim = self.animation()
+        with bake.baked(anim):
+            self.assertIsNotNone(self.ellipse.position._baked)
+        self.assertIsNone(self.ellipse.position._baked)
+
+    def test_add_keyframe_discards(self):
+        anim = self.animation()
+        bake.bake(anim)
+        self.ellipse.position.add_keyframe(20, NVector(0, 0))
+        self.assertIsNone(self.ellipse.position._baked)
+        self.assertIsNotNone(self.fill.color._baked)
+
+    def test_shape(self):
+        anim = objects.Animation(10)
+        layer = anim.add_layer(objects.ShapeLayer())
+        path = layer.add_shape(objects.Path())
+        bez1 = objects.Bezier().add_point(NVector(0, 0), NVector(1, 1)).add_point(NVector(10, 0)).close()
+        bez2 = objects.Bezier().add_point(NVector(0, 10), NVector(2, 2)).add_point(NVector(10, 10)).close()
+        path.shape.add_keyframe(0, bez1)
+        path.shape.add_keyframe(10, bez2)
+        expected = path.shape.get_value(4)
+
+        bake.bake(anim, numpy.float64)
+        value = path.shape.get_value(4)
+        self.assertIsInstance(value, objects.Bezier)
+        self.assertTrue(value.closed)
+        self.assertEqual(len(value.vertices), 2)
+        for attr in ("vertices", "in_tangents", "out_tangents"):
+            for a, b in zip(getattr(value, attr), getattr(expected, attr)):
+                self.assert_nvector_equal(a, b, places=9)
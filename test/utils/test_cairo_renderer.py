@@ -0,0 +1,184 @@
+import io
+import os
+import glob
+import runpy
+import unittest
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+
+try:
+    from lottie.utils import cairo_renderer
+except ImportError:
+    cairo_renderer = None
+
+try:
+    import cairosvg
+except (ImportError, OSError):
+    cairosvg = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(cairo_renderer is None, "requires pycairo")
+class TestCairoRenderer(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(10)
+        anim.width = anim.height = 64
+        return anim
+
+    def square_layer(self, anim, color, pos=NVector(32, 32), size=NVector(32, 32)):
+        layer = anim.add_layer(objects.ShapeLayer())
+        layer.add_shape(objects.Rect(pos, size))
+        layer.add_shape(objects.Fill(color))
+        return layer
+
+    def pixel(self, surface, x, y):
+        data = surface.get_data()
+        offset = y * surface.get_stride() + x * 4
+        b, g, r, a = data[offset:offset+4]
+        return (r, g, b, a)
+
+    def test_fill(self):
+        anim = self.animation()
+        self.square_layer(anim, Color(1, 0, 0))
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(surface.get_width(), 64)
+        self.assertEqual(self.pixel(surface, 32, 32), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(surface, 2, 2), (0, 0, 0, 0))
+
+    def test_order(self):
+        anim = self.animation()
+        self.square_layer(anim, Color(0, 0, 1), NVector(20, 32))
+        self.square_layer(anim, Color(1, 0, 0), NVector(44, 32))
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(self.pixel(surface, 32, 32), (0, 0, 255, 255))
+
+    def test_opacity(self):
+        anim = self.animation()
+        layer = self.square_layer(anim, Color(1, 1, 1))
+        layer.transform.opacity.value = 50
+        surface = cairo_renderer.render_surface(anim)
+        self.assertAlmostEqual(self.pixel(surface, 32, 32)[3], 128, delta=1)
+
+    def test_transform(self):
+        anim = self.animation()
+        layer = self.square_layer(anim, Color(1, 0, 0), NVector(0, 0), NVector(10, 10))
+        layer.transform.position.value = NVector(50, 50)
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(self.pixel(surface, 50, 50)[3], 255)
+        self.assertEqual(self.pixel(surface, 32, 32)[3], 0)
+
+    def test_time(self):
+        anim = self.animation()
+        layer = self.square_layer(anim, Color(1, 0, 0))
+        layer.in_point = 5
+        self.assertEqual(self.pixel(cairo_renderer.render_surface(anim, 0), 32, 32)[3], 0)
+        self.assertEqual(self.pixel(cairo_renderer.render_surface(anim, 6), 32, 32)[3], 255)
+
+    def test_mask(self):
+        anim = self.animation()
+        layer = self.square_layer(anim, Color(1, 0, 0), size=NVector(64, 64))
+        mask = objects.Mask(objects.Rect(NVector(16, 32), NVector(32, 64)).to_bezier().shape.value)
+        layer.masks = [mask]
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(self.pixel(surface, 8, 32)[3], 255)
+        self.assertEqual(self.pixel(surface, 48, 32)[3], 0)
+
+    def test_matte(self):
+        anim = self.animation()
+        self.square_layer(anim, Color(1, 1, 1), NVector(16, 32), NVector(32, 64))
+        target = self.square_layer(anim, Color(1, 0, 0), size=NVector(64, 64))
+        target.matte_mode = objects.MatteMode.Alpha
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(self.pixel(surface, 8, 32), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(surface, 48, 32)[3], 0)
+
+    def test_matte_luma(self):
+        anim = self.animation()
+        source = anim.add_layer(objects.ShapeLayer())
+        for x, color in [(16, Color(1, 1, 1)), (48, Color(0, 0, 0))]:
+            group = source.add_shape(objects.Group())
+            group.add_shape(objects.Rect(NVector(x, 32), NVector(32, 64)))
+            group.add_shape(objects.Fill(color))
+        target = self.square_layer(anim, Color(1, 0, 0), size=NVector(64, 64))
+
+        target.matte_mode = objects.MatteMode.Luma
+        surface = cairo_renderer.render_surface(anim)
+        self.assertEqual(self.pixel(surface, 8, 32), (255, 0, 0, 255))
+        self.assertEqual(self.pixel(surface, 48, 32)[3], 0)
+
+        target.matte_mode = objects.MatteMode.InvertedLuma
+        surface = cairo_renderer.render_surface(anim, scale=2)
+        self.assertEqual(self.pixel(surface, 16, 64)[3], 0)
+        self.assertEqual(self.pixel(surface, 96, 64), (255, 0, 0, 255))
+
+    def test_png_dpi(self):
+        from PIL import Image
+        from lottie.exporters.cairo import export_png
+        anim = self.animation()
+        self.square_layer(anim, Color(1, 0, 0))
+        file = io.BytesIO()
+        export_png(anim, file, dpi=192, renderer="cairo")
+        file.seek(0)
+        self.assertEqual(Image.open(file).size, (128, 128))
+
+
+@unittest.skipIf(cairo_renderer is None or cairosvg is None or numpy is None, "requires pycairo, cairosvg and numpy")
+class TestCairoSvgParity(base.TestCase):
+    """!
+    Compares frames of the examples drawn by the direct renderer with the ones rendered by cairosvg
+    """
+    examples = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "examples")
+    ## Examples where the cairosvg output is known to differ
+    known_differences = {
+        # cairosvg ignores opacity on <use> elements
+        "repeater",
+        # The SVG builder strokes child layers along with the shapes of their parent
+        "layers",
+        # cairosvg ignores mask-type, so luma mattes are drawn as alpha mattes
+        "matte",
+    }
+    ## Pixel channels differing by more than this count as different
+    threshold = 64
+    ## Fraction of pixels allowed to differ, for antialiasing and cairosvg approximating rounded corners
+    tolerance = 0.002
+
+    def load_example(self, name):
+        cwd = os.getcwd()
+        try:
+            os.chdir(self.examples)
+            return runpy.run_path(name + ".py", run_name="example")["an"]
+        finally:
+            os.chdir(cwd)
+
+    def frames(self, animation, count=4):
+        start = int(animation.in_point)
+        end = int(animation.out_point)
+        return sorted(set(start + (end - start) * i // count for i in range(count)))
+
+    def pixels(self, render, animation, frame):
+        data = numpy.frombuffer(render(frame), numpy.uint8)
+        return data.reshape(animation.height, animation.width, 4).astype(int)
+
+    def test_examples(self):
+        from lottie.exporters.cairo import bgra_renderer
+        for path in sorted(glob.glob(os.path.join(self.examples, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name in self.known_differences:
+                continue
+            with self.subTest(example=name):
+                try:
+                    animation = self.load_example(name)
+                except Exception as e:
+                    self.skipTest("%s can't be loaded: %s" % (name, e))
+                svg = bgra_renderer(animation, renderer="svg")
+                direct = bgra_renderer(animation, renderer="cairo")
+                for frame in self.frames(animation):
+                    diff = abs(self.pixels(svg, animation, frame) - self.pixels(direct, animation, frame))
+                    different = (diff.max(axis=2) > self.threshold).mean()
+                    self.assertLessEqual(different, self.tolerance, "frame %s" % frame)
@@ -0,0 +1,94 @@
+import os
+import json
+import tempfile
+from .. import base
+from lottie import objects
+from lottie.utils import convert
+from lottie.parsers.tgs import parse_tgs
+
+
+class TestBatchConvert(base.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.dir = self.tempdir.name
+        os.makedirs(os.path.join(self.dir, "sub"))
+        animation = objects.Animation(30)
+        animation.add_layer(objects.ShapeLayer())
+        self.expected = animation.to_dict()
+        for name in ("a.json", os.path.join("sub", "b.json")):
+            with open(os.path.join(self.dir, name), "w") as f:
+                json.dump(self.expected, f)
+        with open(os.path.join(self.dir, "broken.json"), "w") as f:
+            f.write("{")
+        with open(os.path.join(self.dir, "notes.txt"), "w") as f:
+            f.write("")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.dir, *parts)
+
+    def test_expand_inputs(self):
+        self.assertEqual(
+            list(convert.expand_inputs([self.dir], {"json"})),
+            [
+                (self.path("a.json"), "a.json"),
+                (self.path("broken.json"), "broken.json"),
+                (self.path("sub", "b.json"), os.path.join("sub", "b.json")),
+            ]
+        )
+        self.assertEqual(
+            list(convert.expand_inputs([self.path("**", "b.json"), self.path("a.json")])),
+            [
+                (self.path("sub", "b.json"), os.path.join("sub", "b.json")),
+                (self.path("a.json"), "a.json"),
+            ]
+        )
+
+    def test_output_path(self):
+        self.assertEqual(
+            convert.output_path("out/{path}-{name}.{ext}", self.path("sub", "b.json"), "sub/b.json", "tgs"),
+            "out/sub/b-b.tgs"
+        )
+        self.assertEqual(convert.output_path("{dir}/{name}.{ext}", "a.json", "a.json", "tgs"), "./a.tgs")
+
+    def batch(self, workers):
+        jobs = [
+            convert.ConversionJob(infile, self.path("out", relpath[:-4] + "tgs"), "lottie", "tgs")
+            for infile, relpath in convert.expand_inputs([self.dir], {"json"})
+        ]
+        results = list(convert.batch_convert(jobs, workers))
+        self.assertEqual([r.infile for r in results], [job.infile for job in jobs])
+        self.assertEqual([bool(r.error) for r in results], [False, True, False])
+        self.assertEqual(parse_tgs(self.path("out", "sub", "b.tgs")).to_dict()["layers"], self.expected["layers"])
+
+    def test_batch_convert(self):
+        self.batch(1)
+
+    def test_batch_convert_workers(self):
+        self.batch(2)
+
+    def test_check_outputs(self):
+        def job(infile, outfile):
+            return convert.ConversionJob(self.path(infile), self.path(outfile), "lottie", "lottie")
+
+        # a.tgs would replace a.json, which is converted by another job
+        jobs = [job("a.json", "a.json"), job("a.tgs", "a.json"), job("c.json", "c.tgs")]
+        valid, refused = convert.check_outputs(jobs)
+        self.assertEqual(valid, [jobs[2]])
+        self.assertEqual([r.infile for r in refused], [self.path("a.json"), self.path("a.tgs")])
+
+        # Same output for different inputs
+        jobs = [job("a.json", "out.json"), job(os.path.join("sub", "a.json"), "out.json"), job("c.json", "c.tgs")]
+        valid, refused = convert.check_outputs(jobs, True)
+        self.assertEqual(valid, [jobs[2]])
+        self.assertEqual(len(refused), 2)
+        self.assertTrue(all("shared" in r.error for r in refused))
+
+        # Replacing its own input only with overwrite
+        jobs = [job("a.json", "a.json")]
+        self.assertEqual(convert.check_outputs(jobs, False)[0], [])
+        self.assertEqual(convert.check_outputs(jobs, True)[0], jobs)
+        # Inputs which aren't converted are protected too
+        self.assertEqual(convert.check_outputs([job("a.json", "notes.txt")], True, [self.path("notes.txt")])[0], [])
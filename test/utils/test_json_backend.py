@@ -0,0 +1,53 @@
+import io
+import json
+from .. import base
+from lottie import objects
+from lottie.utils import json_backend
+from lottie.parsers.tgs import parse_tgs
+from lottie.exporters.core import export_lottie, export_tgs
+
+
+class TestJsonBackend(base.TestCase):
+    def setUp(self):
+        self.previous = json_backend._backend
+
+    def tearDown(self):
+        json_backend._backend = self.previous
+
+    def backends(self):
+        for name in json_backend.available_backends():
+            with self.subTest(backend=name):
+                yield json_backend.set_backend(name)
+
+    def test_available(self):
+        self.assertIn("json", json_backend.available_backends())
+        self.assertEqual(json_backend.set_backend().name, json_backend.available_backends()[0])
+        with self.assertRaises(KeyError):
+            json_backend.set_backend("foo")
+
+    def test_round_trip(self):
+        data = {"v": "5.5.2", "fr": 60.5, "layers": [{"nm": "café / \"x\"", "ind": 1}], "h": None}
+        for backend in self.backends():
+            self.assertEqual(backend.loads(backend.dumps(data)), data)
+            self.assertEqual(backend.loads(backend.dumps_bytes(data)), data)
+            self.assertEqual(json.loads(backend.dumps(data, 4)), data)
+            self.assertIn("\n    ", backend.dumps(data, 4))
+            self.assertEqual(backend.load(io.BytesIO(backend.dumps_bytes(data))), data)
+
+    def test_invalid(self):
+        for backend in self.backends():
+            with self.assertRaises(json.JSONDecodeError):
+                backend.loads("{\"v\": ")
+
+    def test_files(self):
+        animation = objects.Animation(30)
+        animation.add_layer(objects.ShapeLayer()).add_shape(objects.Rect())
+        for backend in self.backends():
+            out = io.StringIO()
+            export_lottie(animation, out)
+            self.assertEqual(json.loads(out.getvalue()), animation.to_dict())
+
+            out = io.BytesIO()
+            export_tgs(animation, out)
+            out.seek(0)
+            self.assertEqual(parse_tgs(out).to_dict(), animation.to_dict())
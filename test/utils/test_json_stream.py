@@ -0,0 +1,64 @@
+import io
+import json
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+from lottie.objects import easing
+from lottie.utils import json_stream
+from lottie.parsers.tgs import parse_tgs
+from lottie.exporters.core import export_lottie, export_tgs
+
+
+class TestJsonStream(base.TestCase):
+    def animation(self):
+        animation = objects.Animation(30)
+        animation.name = "café \"stream\""
+        layer = animation.add_layer(objects.ShapeLayer())
+        group = layer.add_shape(objects.Group())
+        rect = group.add_shape(objects.Rect(NVector(10, 20), NVector(30, 40)))
+        rect.position.add_keyframe(0, NVector(0, 0), easing.EaseOut())
+        rect.position.add_keyframe(30, NVector(10.5, 20))
+        group.add_shape(objects.Fill(Color(1, 0.5, 0)))
+        path = layer.add_shape(objects.Path())
+        path.shape.value.add_point(NVector(0, 0))
+        path.shape.value.add_point(NVector(1, 2))
+        return animation
+
+    def dumps(self, value, indent=None):
+        out = io.StringIO()
+        json_stream.dump(value, out, indent)
+        return out.getvalue()
+
+    def test_same_output(self):
+        animation = self.animation()
+        self.assertEqual(self.dumps(animation), json.dumps(animation.to_dict(), separators=(",", ":")))
+        self.assertEqual(self.dumps(animation, 4), json.dumps(animation.to_dict(), indent=4))
+
+    def test_last_keyframe(self):
+        animation = self.animation()
+        keyframes = json.loads(self.dumps(animation))["layers"][0]["shapes"][0]["it"][0]["p"]["k"]
+        self.assertIn("i", keyframes[0])
+        self.assertNotIn("i", keyframes[-1])
+        self.assertNotIn("o", keyframes[-1])
+
+    def test_plain_values(self):
+        self.assertEqual(self.dumps({"a": [1, 2.5]}), "{\"a\":[1,2.5]}")
+        self.assertEqual(self.dumps(objects.ShapeLayer().shapes), "[]")
+
+    def test_extra(self):
+        out = io.BytesIO()
+        json_stream.dump(self.animation(), out, tgs=1)
+        self.assertEqual(json.loads(out.getvalue())["tgs"], 1)
+
+    def test_exporters(self):
+        animation = self.animation()
+        for pretty in (False, True):
+            out = io.StringIO()
+            export_lottie(animation, out, pretty, stream=True)
+            self.assertEqual(json.loads(out.getvalue()), animation.to_dict())
+
+        out = io.BytesIO()
+        export_tgs(animation, out, stream=True)
+        out.seek(0)
+        self.assertEqual(parse_tgs(out).to_dict(), animation.to_dict())
@@ -0,0 +1,77 @@
+import io
+import os
+import tempfile
+from .. import base
+from lottie import objects
+from lottie.utils import render_cache
+from lottie.utils.file import open_file
+
+
+calls = []
+
+
+@render_cache.cached(ignore={"workers"})
+def export_fake(animation, fp, frame=0, workers=1):
+    calls.append(frame)
+    with open_file(fp, "wb") as file:
+        file.write(("%s:%s" % (animation.name, frame)).encode())
+
+
+class TestRenderCache(base.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache = render_cache.RenderCache(os.path.join(self.tempdir.name, "cache"))
+        render_cache.set_cache(self.cache)
+        calls.clear()
+        self.animation = objects.Animation(30)
+        self.animation.name = "foo"
+
+    def tearDown(self):
+        render_cache.set_cache(None)
+        self.tempdir.cleanup()
+
+    def export(self, *args, **kwargs):
+        out = io.BytesIO()
+        export_fake(self.animation, out, *args, **kwargs)
+        return out.getvalue()
+
+    def test_hit(self):
+        self.assertEqual(self.export(), b"foo:0")
+        self.assertEqual(self.export(0, workers=4), b"foo:0")
+        self.assertEqual(calls, [0])
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "evictions": 0})
+
+        filename = os.path.join(self.tempdir.name, "out.bin")
+        export_fake(self.animation, filename, frame=0)
+        with open(filename, "rb") as file:
+            self.assertEqual(file.read(), b"foo:0")
+        self.assertEqual(calls, [0])
+
+    def test_key(self):
+        self.export()
+        self.assertEqual(self.export(frame=1), b"foo:1")
+        self.animation.name = "bar"
+        self.assertEqual(self.export(frame=1), b"bar:1")
+        self.assertEqual(calls, [0, 1, 1])
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_eviction(self):
+        self.cache.max_size = 10
+        self.export(0)
+        self.export(1)
+        self.assertEqual(self.cache.size(), 10)
+        self.export(0)
+        self.export(2)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertEqual(self.cache.size(), 10)
+        # Frame 1 was the least recently used
+        self.export(0)
+        self.export(1)
+        self.assertEqual(calls, [0, 1, 2, 1])
+
+    def test_disabled(self):
+        render_cache.set_cache(None)
+        self.export()
+        self.export()
+        self.assertEqual(calls, [0, 0])
+        self.assertEqual(self.cache.misses, 0)
@@ -0,0 +1,89 @@
+import unittest
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.objects import easing
+from lottie.utils.color import Color
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestSample(base.TestCase):
+    times = [-2, 0, 1.5, 3, 4.25, 7, 10, 12.5, 20]
+
+    def assert_samples(self, prop, times=None):
+        times = self.times if times is None else times
+        values = prop.sample(times)
+        self.assertEqual(len(values), len(times))
+        for time, value in zip(times, values):
+            expected = prop.get_value(time)
+            if isinstance(expected, objects.Bezier):
+                expected = [expected.vertices, expected.in_tangents, expected.out_tangents]
+                for exp_points, points in zip(expected, value):
+                    for exp_point, point in zip(exp_points, points):
+                        self.assert_nvector_equal(exp_point, NVector(*point), places=9)
+            elif isinstance(expected, NVector):
+                self.assert_nvector_equal(expected, NVector(*value), places=9)
+            else:
+                self.assertAlmostEqual(expected, value, places=9)
+        return values
+
+    def test_static(self):
+        values = self.assert_samples(objects.MultiDimensional(NVector(1, 2)))
+        self.assertEqual(values.shape, (len(self.times), 2))
+
+    def test_value(self):
+        prop = objects.Value()
+        prop.add_keyframe(0, 10)
+        prop.add_keyframe(5, 20, easing.Sigmoid())
+        prop.add_keyframe(10, 0, easing.EaseIn())
+        prop.add_keyframe(12, 0, easing.Jump())
+        values = self.assert_samples(prop)
+        self.assertEqual(values.shape, (len(self.times),))
+
+    def test_multi_dimensional(self):
+        prop = objects.MultiDimensional()
+        prop.add_keyframe(0, NVector(0, 10), easing.EaseOut())
+        prop.add_keyframe(5, NVector(20, 5), easing.Sigmoid())
+        prop.add_keyframe(10, NVector(3, 6))
+        self.assert_samples(prop)
+
+    def test_spatial(self):
+        prop = objects.MultiDimensional()
+        prop.add_keyframe(0, NVector(0, 10), out_tan=NVector(5, 5), in_tan=NVector(-5, 0))
+        prop.add_keyframe(5, NVector(20, 5), out_tan=NVector(0, 0), in_tan=NVector(0, 0))
+        prop.add_keyframe(10, NVector(3, 6))
+        self.assert_samples(prop)
+
+    def test_color(self):
+        prop = objects.ColorValue()
+        prop.add_keyframe(0, Color(1, 0, 0))
+        prop.add_keyframe(10, Color(0, 1, 0.5))
+        values = self.assert_samples(prop)
+        self.assertEqual(values.shape, (len(self.times), 4))
+
+    def test_shape(self):
+        bez1 = objects.Bezier().add_point(NVector(0, 0), NVector(1, 1)).add_point(NVector(10, 0))
+        bez2 = objects.Bezier().add_point(NVector(0, 10), NVector(2, 2)).add_point(NVector(10, 10))
+        prop = objects.ShapeProperty()
+        prop.add_keyframe(0, bez1)
+        prop.add_keyframe(10, bez2, easing.Sigmoid())
+        values = self.assert_samples(prop)
+        self.assertEqual(values.shape, (len(self.times), 3, 2, 2))
+
+    def test_none_start(self):
+        prop = objects.MultiDimensional()
+        prop.add_keyframe(0, NVector(1, 2))
+        prop.add_keyframe(3, NVector(4, 5))
+        prop.keyframes[-1].start = None
+        self.assert_samples(prop, [-1, 0, 1, 3, 4])
+
+    def test_array_shape(self):
+        prop = objects.MultiDimensional()
+        prop.add_keyframe(0, NVector(1, 2))
+        prop.add_keyframe(3, NVector(4, 5))
+        self.assertEqual(prop.sample(numpy.zeros((4, 5))).shape, (4, 5, 2))
@@ -0,0 +1,49 @@
+from .. import base
+from lottie import objects
+from lottie.nvector import NVector
+from lottie.utils.color import Color
+from lottie.utils.scene_state import SceneState
+
+
+class TestSceneState(base.TestCase):
+    def animation(self):
+        anim = objects.Animation(30)
+        layer = anim.add_layer(objects.ShapeLayer())
+        self.ellipse = layer.add_shape(objects.Ellipse(NVector(10, 10), NVector(10, 10)))
+        self.ellipse.position.add_keyframe(0, NVector(0, 0))
+        self.ellipse.position.add_keyframe(10, NVector(100, 50))
+        self.ellipse.position.add_keyframe(20, NVector(100, 50))
+        layer.add_shape(objects.Fill(Color(1, 0, 0)))
+        self.layer = layer
+        return anim
+
+    def test_static_stretch(self):
+        state = SceneState(self.animation())
+        self.assertNotEqual(state(0), state(1))
+        self.assertNotEqual(state(9), state(10))
+        self.assertEqual(state(10), state(11))
+        self.assertEqual(state(12), state(20))
+
+    def test_visibility(self):
+        anim = self.animation()
+        self.layer.out_point = 15
+        state = SceneState(anim)
+        self.assertEqual(state(10), state(15))
+        self.assertNotEqual(state(15), state(16))
+        self.assertEqual(state(16), state(17))
+
+    def test_precomp(self):
+        anim = objects.Animation(30)
+        precomp = objects.Precomp("inner", anim)
+        layer = precomp.add_layer(objects.ShapeLayer())
+        rect = layer.add_shape(objects.Rect(NVector(10, 10), NVector(10, 10)))
+        rect.size.add_keyframe(0, NVector(10, 10))
+        rect.size.add_keyframe(10, NVector(20, 20))
+        layer.add_shape(objects.Fill(Color(1, 0, 0)))
+
+        precomp_layer = anim.add_layer(objects.PreCompLayer("inner"))
+        precomp_layer.start_time = 5
+        state = SceneState(anim)
+        self.assertEqual(state(0), state(5))
+        self.assertNotEqual(state(5), state(6))
+        self.assertEqual(state(15), state(16))
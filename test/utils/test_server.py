@@ -0,0 +1,140 @@
+import os
+import io
+import json
+import asyncio
+import tempfile
+from .. import base
+from lottie import objects
+from lottie.parsers.tgs import parse_tgs
+from lottie.utils.server import ConversionServer
+
+
+class TestConversionServer(base.TestCase):
+    def setUp(self):
+        animation = objects.Animation(30)
+        animation.add_layer(objects.ShapeLayer())
+        self.expected = animation.to_dict()
+        self.data = json.dumps(self.expected).encode("utf-8")
+
+    async def request(self, method, path, body=b"", headers={"Content-Type": "application/octet-stream"}):
+        reader, writer = await asyncio.open_unix_connection(self.socket)
+        head = "".join("%s: %s\r\n" % item for item in headers.items()).encode()
+        writer.write(
+            b"%s %s HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n%s\r\n" %
+            (method.encode(), path.encode(), len(body), head) + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, data = response.split(b"\r\n\r\n", 1)
+        return int(head.split(b" ")[1]), data
+
+    def run_server(self, test, **kwargs):
+        async def run():
+            with tempfile.TemporaryDirectory() as tmpdir:
+                self.socket = os.path.join(tmpdir, "socket")
+                server = ConversionServer(workers=1, **kwargs)
+                await server.start(socket=self.socket)
+                try:
+                    await test(server)
+                finally:
+                    await server.close()
+        asyncio.run(run())
+
+    def test_convert(self):
+        async def test(server):
+            status, data = await self.request("POST", "/convert/tgs?from=lottie", self.data)
+            self.assertEqual(status, 200)
+            self.assertEqual(parse_tgs(io.BytesIO(data)).to_dict()["layers"], self.expected["layers"])
+
+            status, data = await self.request("POST", "/convert/lottie?filename=foo.json&pretty=1", self.data)
+            self.assertEqual(status, 200)
+            self.assertIn(b"\n", data)
+            self.assertEqual(json.loads(data), self.expected)
+
+            metrics = server.metrics.to_dict()
+            self.assertEqual(metrics["requests"], 2)
+            self.assertEqual(metrics["conversions"], {"tgs": 1, "lottie": 1})
+            self.assertEqual(metrics["in_flight"], 0)
+        self.run_server(test)
+
+    def test_errors(self):
+        async def test(server):
+            self.assertEqual((await self.request("POST", "/convert/nope?from=lottie", self.data))[0], 404)
+            self.assertEqual((await self.request("POST", "/convert/tgs", self.data))[0], 400)
+            self.assertEqual((await self.request("POST", "/convert/tgs?from=lottie&nope=1", self.data))[0], 400)
+            self.assertEqual((await self.request("POST", "/convert/tgs?from=lottie&frame=x", self.data))[0], 400)
+            self.assertEqual((await self.request("GET", "/convert/tgs?from=lottie"))[0], 405)
+
+            status, data = await self.request("POST", "/convert/tgs?from=lottie", b"{")
+            self.assertEqual(status, 422)
+            self.assertIn("error", json.loads(data))
+            self.assertEqual(server.metrics.conversion_errors, {"tgs": 1})
+
+            self.assertEqual((await self.request("POST", "/convert/tgs?from=lottie", b" " * (len(self.data) + 1)))[0], 413)
+        self.run_server(test, max_body_size=len(self.data))
+
+    def test_unsafe(self):
+        async def test(server):
+            script = b"open('marker', 'w')"
+            self.assertEqual((await self.request("POST", "/convert/lottie?from=py", script))[0], 400)
+            self.assertEqual((await self.request("POST", "/convert/lottie?filename=foo.py", script))[0], 400)
+            self.assertEqual(server.metrics.conversions, {})
+
+            option = "/convert/lottie?from=bmp&bmp-frame-files=/etc/passwd"
+            self.assertEqual((await self.request("POST", option, self.data))[0], 400)
+
+            animation = objects.Animation(30)
+            animation.assets.append(objects.assets.Image("image"))
+            animation.assets[0].image = "/etc/passwd"
+            data = json.dumps(animation.to_dict()).encode("utf-8")
+            status, data = await self.request("POST", "/convert/lottie?from=lottie", data)
+            self.assertEqual(status, 400)
+            self.assertIn("embedded", json.loads(data)["error"])
+
+            status, data = await self.request("GET", "/formats")
+            self.assertNotIn("py", [importer["slug"] for importer in json.loads(data)["importers"]])
+        self.run_server(test, allowed_importers=["lottie", "bmp", "py"])
+
+    def test_browser_requests(self):
+        async def test(server):
+            path = "/convert/tgs?from=lottie"
+            headers = {"Content-Type": "application/octet-stream", "Origin": "http://example.com"}
+            self.assertEqual((await self.request("POST", path, self.data, headers))[0], 403)
+            self.assertEqual((await self.request("POST", path, self.data, {"Content-Type": "text/plain"}))[0], 415)
+            self.assertEqual((await self.request("POST", path, self.data, {}))[0], 415)
+        self.run_server(test)
+
+    def test_backpressure(self):
+        async def test(server):
+            statuses = await asyncio.gather(*(
+                self.request("POST", "/convert/tgs?from=lottie", self.data)
+                for i in range(4)
+            ))
+            statuses = sorted(status for status, data in statuses)
+            self.assertEqual(statuses[0], 200)
+            self.assertEqual(statuses.count(503), server.metrics.rejected)
+        self.run_server(test, queue_size=0)
+
+    def test_worker_died(self):
+        async def test(server):
+            for process in list(server.pool._processes.values()):
+                process.kill()
+                process.join()
+            self.assertEqual((await self.request("POST", "/convert/tgs?from=lottie", self.data))[0], 503)
+            self.assertEqual((await self.request("POST", "/convert/tgs?from=lottie", self.data))[0], 200)
+            self.assertEqual(server.metrics.pool_restarts, 1)
+        self.run_server(test)
+
+    def test_info(self):
+        async def test(server):
+            status, data = await self.request("GET", "/formats")
+            self.assertEqual(status, 200)
+            formats = json.loads(data)
+            self.assertIn("tgs", [exporter["slug"] for exporter in formats["exporters"]])
+            self.assertIn("lottie", [importer["slug"] for importer in formats["importers"]])
+
+            status, data = await self.request("GET", "/metrics")
+            self.assertEqual(status, 200)
+            self.assertEqual(json.loads(data)["responses"], {"200": 1})
+        self.run_server(test)